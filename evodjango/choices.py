@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango choices module
+===============================================
+
+.. module:: evodjango.choices
+    :platform: Django
+    :synopsis: EVODjango choice lookup tables module
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Python imports
+import unicodedata
+
+# Django imports
+from django.db.models.fields import BLANK_CHOICE_DASH
+from django.utils import translation
+from django.utils.encoding import force_text
+
+def label_sort_key(choice):
+    """
+    Returns a sort key for a choice ignoring case and accents in its label
+    """
+    return unicodedata.normalize('NFKD',choice[1]).encode('ascii','ignore').lower()
+
+class ChoiceIndex(object):
+    """
+    Precomputed lookup tables for a choices sequence
+
+    Labels are indexed by value and option lists are built once for each language
+    """
+    def __init__(self,choices):
+        """
+        Class initialization method
+        """
+        self.choices=tuple(choices)
+        self.labels=dict(self.choices)
+        self.values=frozenset(force_text(value) for value in self.labels)
+        self.options={}
+
+    def __contains__(self,value):
+        """
+        Checks if a value is a valid choice
+        """
+        return value in self.labels or force_text(value) in self.values
+
+    def get_label(self,value,default=None):
+        """
+        Returns label for a value
+        """
+        return self.labels.get(value,default)
+
+    def get_options(self,include_blank=False,sort=False,lang=None):
+        """
+        Returns option list with labels translated to given or current language
+        """
+        if lang is None:
+            lang=translation.get_language()
+        key=(include_blank,sort,lang)
+        if key not in self.options:
+            with translation.override(lang):
+                options=[(value,force_text(label)) for value,label in self.choices]
+                if sort:
+                    options.sort(key=label_sort_key)
+                if include_blank:
+                    options=[(value,force_text(label)) for value,label in BLANK_CHOICE_DASH] + options
+            self.options[key]=tuple(options)
+        return self.options[key]
+
+# Choice indexes by choices sequence identifier
+choice_indexes={}
+
+def get_choice_index(choices):
+    """
+    Returns the choice index for a choices sequence building it if needed
+    """
+    key=id(choices)
+    if key not in choice_indexes:
+        choice_indexes[key]=(choices,ChoiceIndex(choices))
+    return choice_indexes[key][1]
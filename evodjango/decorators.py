@@ -11,14 +11,18 @@ EVODjango decorators
 
 # Python imports
 from functools import wraps
-import os,time,hotshot
+import os,time,hotshot,hashlib
 
 # Django imports
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
 from django.http import HttpResponse,HttpResponseRedirect,Http404
 from django.utils.decorators import available_attrs
+from django.utils.translation import get_language
 
 # EVODjango imports
 from evodjango.utils import get_public_ip
+from evodjango.models.managers import get_model_cache_version
 
 def ajax_or_redirect(redirect_url='/'):
     """
@@ -97,4 +101,53 @@ def performance_profile(log_dir):
                 prof.close()
             return ret
         return _inner
-    return _outer
\ No newline at end of file
+    return _outer
+
+def cache_filtered_list(filterprocessor,model,timeout=300):
+    """
+    Decorator for list views that caches responses by canonical filter signature.
+    Cached responses are invalidated when any item of the model is saved or deleted.
+
+    Responses are shared by all users, so do not use it for views with user dependent content.
+    Requests with invalid filters are never cached nor served from cache.
+
+    :param filterprocessor: Filter processor used for view filters
+    :type filterprocessor: FilterProcessor
+    :param model: Model listed by the view
+    :type model: Model class
+    :param timeout: Cache timeout in seconds
+    :type timeout: int
+    """
+    label='%s.%s' % (model._meta.app_label,model._meta.model_name)
+
+    def invalidate(sender,**kwargs):
+        get_model_cache_version(sender,'filtered_list',renew=True)
+
+    post_save.connect(invalidate,sender=model,weak=False,dispatch_uid='evodjango.filtered_list.save.%s' % label)
+    post_delete.connect(invalidate,sender=model,weak=False,dispatch_uid='evodjango.filtered_list.delete.%s' % label)
+
+    def decorator(view_func):
+        @wraps(view_func, assigned=available_attrs(view_func))
+        def _wrapped_view(req, *args, **kwargs):
+            if req.method not in ('GET','HEAD'):
+                return view_func(req, *args, **kwargs)
+            # Invalid filters are not cached so the view can report them
+            parts,cleanfilters,errors=filterprocessor.process_parts(req.GET)
+            if errors:
+                return view_func(req, *args, **kwargs)
+            # Generate key using filter signature and remaining parameters
+            extra=sorted((name,tuple(req.GET.getlist(name))) for name in req.GET if name not in filterprocessor.compiled)
+            signature=repr((req.path,filterprocessor.get_signature(req.GET,parts,cleanfilters),extra,args,sorted(kwargs.items()),
+                get_language(),get_model_cache_version(model,'filtered_list')))
+            key='evodjango.filtered_list.%s.%s' % (label,hashlib.md5(signature.encode('utf-8')).hexdigest())
+            response=cache.get(key)
+            if response is None:
+                response=view_func(req, *args, **kwargs)
+                if response.status_code==200 and not response.streaming:
+                    if hasattr(response,'add_post_render_callback') and not response.is_rendered:
+                        response.add_post_render_callback(lambda r: cache.set(key,r,timeout))
+                    else:
+                        cache.set(key,response,timeout)
+            return response
+        return _wrapped_view
+    return decorator
@@ -115,6 +115,25 @@ class CreditCardField(forms.CharField):
         if not mod10(value):
             raise forms.ValidationError(_('Invalid credit card number'))
 
+class IndexedChoiceField(forms.TypedChoiceField):
+    """
+    Choice field validating values using a precomputed choice index
+    """
+    def __init__(self,choice_index=None,*args,**kwargs):
+        """
+        Class initialization
+        """
+        self.choice_index=choice_index
+        super(IndexedChoiceField,self).__init__(*args,**kwargs)
+
+    def valid_value(self,value):
+        """
+        Check if value is a valid choice
+        """
+        if self.choice_index is None:
+            return super(IndexedChoiceField,self).valid_value(value)
+        return value in self.choice_index
+
 class LocationField(forms.MultiValueField):
     """
     Location field
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango geographic utilities
+===============================================
+
+.. module:: evodjango.geo
+    :platform: Django
+    :synopsis: EVODjango geographic utility functions module
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Python imports
+import math
+try:
+    import numpy
+except ImportError:
+    numpy=None
+
+# Django imports
+from django.core.exceptions import FieldDoesNotExist
+
+# Mean earth radius in kilometers
+EARTH_RADIUS=6371.0088
+
+# Geohash base 32 alphabet
+GEOHASH_ALPHABET='0123456789bcdefghjkmnpqrstuvwxyz'
+
+def haversine(lat1,lon1,lat2,lon2):
+    """
+    Returns great circle distance in kilometers between two points
+    """
+    lat1,lon1,lat2,lon2=map(math.radians,(lat1,lon1,lat2,lon2))
+    a=math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(min(1.0,math.sqrt(a)))
+
+def geohash_encode(lat,lon,precision=12):
+    """
+    Returns geohash for given coordinates
+    """
+    latrange=[-90.0,90.0]
+    lonrange=[-180.0,180.0]
+    geohash=[]
+    bits=0
+    char=0
+    even=True
+    while len(geohash) < precision:
+        # Even bits refine longitude and odd bits refine latitude
+        value,interval=(lon,lonrange) if even else (lat,latrange)
+        middle=(interval[0] + interval[1]) / 2
+        char<<=1
+        if value >= middle:
+            char|=1
+            interval[0]=middle
+        else:
+            interval[1]=middle
+        even=not even
+        bits+=1
+        if bits==5:
+            geohash.append(GEOHASH_ALPHABET[char])
+            bits=0
+            char=0
+    return ''.join(geohash)
+
+def geohash_bbox(geohash):
+    """
+    Returns (south,west,north,east) bounding box for a geohash
+    """
+    latrange=[-90.0,90.0]
+    lonrange=[-180.0,180.0]
+    even=True
+    for char in geohash:
+        value=GEOHASH_ALPHABET.index(char)
+        for shift in range(4,-1,-1):
+            interval=lonrange if even else latrange
+            middle=(interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0]=middle
+            else:
+                interval[1]=middle
+            even=not even
+    return latrange[0],lonrange[0],latrange[1],lonrange[1]
+
+def geohash_cell_size(precision):
+    """
+    Returns latitude and longitude degrees covered by geohash cells of given precision
+    """
+    lonbits=(5 * precision + 1) // 2
+    latbits=5 * precision // 2
+    return 180.0 / 2 ** latbits,360.0 / 2 ** lonbits
+
+def geohash_neighbours(geohash):
+    """
+    Returns a list with given geohash and its existing surrounding cells
+    """
+    south,west,north,east=geohash_bbox(geohash)
+    height,width=north - south,east - west
+    lat,lon=(south + north) / 2,(west + east) / 2
+    cells=[]
+    for dlat in (-height,0,height):
+        for dlon in (-width,0,width):
+            nlat=lat + dlat
+            if nlat < -90 or nlat > 90:
+                continue
+            # Wrap longitude around antimeridian
+            nlon=(lon + dlon + 180) % 360 - 180
+            cell=geohash_encode(nlat,nlon,len(geohash))
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+def haversine_many(lat,lon,lats,lons):
+    """
+    Returns great circle distances in kilometers from a point to a sequence of points
+
+    Distances are computed in a single vectorized operation and returned as an array when
+    NumPy is available. A list is returned otherwise.
+    """
+    if numpy is None:
+        return [haversine(lat,lon,plat,plon) for plat,plon in zip(lats,lons)]
+    lats=numpy.radians(numpy.asarray(lats,dtype=numpy.float64))
+    lons=numpy.radians(numpy.asarray(lons,dtype=numpy.float64))
+    lat,lon=math.radians(lat),math.radians(lon)
+    a=numpy.sin((lats - lat) / 2) ** 2 + math.cos(lat) * numpy.cos(lats) * numpy.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS * numpy.arcsin(numpy.sqrt(numpy.minimum(a,1.0)))
+
+def nearest_indexes(distances,k=None):
+    """
+    Returns indexes of given distances in ascending distance order limited to k indexes
+    """
+    if numpy is None:
+        order=sorted(range(len(distances)),key=distances.__getitem__)
+        return order if k is None else order[:k]
+    if k is not None and k < len(distances):
+        if k <= 0:
+            return []
+        # Partial selection of k nearest before sorting them
+        indexes=numpy.argpartition(distances,k - 1)[:k]
+        return indexes[numpy.argsort(distances[indexes])].tolist()
+    return numpy.argsort(distances).tolist()
+
+def get_coordinates(items,field='location'):
+    """
+    Returns identifiers, latitudes and longitudes lists for items with a location field
+
+    items can be a queryset or a list of model objects. Querysets are read using values_list
+    without creating model objects, using indexed location columns if available. Items without
+    location are skipped.
+    """
+    keys,lats,lons=[],[],[]
+    if hasattr(items,'values_list'):
+        opts=items.model._meta
+        try:
+            opts.get_field('%s_lat' % field)
+            rows=[(pk,lat,lon) for pk,lat,lon in items.values_list('pk','%s_lat' % field,'%s_lon' % field)
+                if lat is not None and lon is not None]
+        except FieldDoesNotExist:
+            locationfield=opts.get_field(field)
+            rows=[]
+            for pk,value in items.values_list('pk',field):
+                value=locationfield.to_python(value)
+                if value and value.get('lat') is not None and value.get('lon') is not None:
+                    rows.append((pk,value['lat'],value['lon']))
+    else:
+        rows=[]
+        for index,item in enumerate(items):
+            if hasattr(item,'%s_lat' % field):
+                location={'lat': getattr(item,'%s_lat' % field),'lon': getattr(item,'%s_lon' % field)}
+            else:
+                location=getattr(item,field) or {}
+            if location.get('lat') is not None and location.get('lon') is not None:
+                rows.append((index,location['lat'],location['lon']))
+    for key,lat,lon in rows:
+        keys.append(key)
+        lats.append(float(lat))
+        lons.append(float(lon))
+    return keys,lats,lons
+
+def order_by_distance(items,lat,lon,k=None,field='location'):
+    """
+    Returns a list of items ordered by distance to given point, limited to the k nearest ones
+
+    Distances for all items are computed at once. For querysets only selected items are
+    retrieved as model objects. Distance in kilometers is set in distance attribute of each item.
+    """
+    if not hasattr(items,'values_list'):
+        items=list(items)
+    keys,lats,lons=get_coordinates(items,field)
+    distances=haversine_many(lat,lon,lats,lons)
+    order=nearest_indexes(distances,k)
+    if hasattr(items,'values_list'):
+        # Sliced querysets can not be filtered
+        qs=items.all()
+        qs.query.clear_limits()
+        objs=qs.in_bulk([keys[index] for index in order])
+    else:
+        objs=items
+    result=[]
+    for index in order:
+        try:
+            obj=objs[keys[index]]
+        except KeyError:
+            continue
+        obj.distance=float(distances[index])
+        result.append(obj)
+    return result
@@ -11,11 +11,129 @@ EVODjango http utilities module has useful HTTP utilities
 """
 
 # Python imports
-import mimetypes, os, json
+import mimetypes, os, json, uuid
 
 # Django imports
-from django.http import HttpResponse,StreamingHttpResponse
-from django.core.servers.basehttp import FileWrapper
+from django.conf import settings
+from django.http import HttpResponse,FileResponse
+from django.utils.http import http_date, parse_http_date_safe, parse_etags, quote_etag
+
+# Default chunk size for served files
+STATIC_SERVE_CHUNK_SIZE=getattr(settings,'STATIC_SERVE_CHUNK_SIZE',64 * 1024)
+
+# Maximum number of ranges accepted in a request. Requests with more ranges get the whole file
+STATIC_SERVE_MAX_RANGES=getattr(settings,'STATIC_SERVE_MAX_RANGES',16)
+
+def parse_range_header(header,size):
+    """
+    Returns a list of (first, last) byte positions for a Range header value and a file size
+
+    Returns None if header is not a valid bytes range header and an empty list if no range
+    can be satisfied
+    """
+    if not header or not header.startswith('bytes='):
+        return None
+    ranges=[]
+    for spec in header[6:].split(','):
+        first,sep,last=spec.strip().partition('-')
+        if not sep:
+            return None
+        try:
+            if first=='':
+                # Suffix range with the last bytes of the file
+                length=int(last)
+                if length > 0 and size > 0:
+                    ranges.append((max(size - length,0),size - 1))
+            else:
+                first=int(first)
+                last=int(last) if last else None
+                if first < 0 or (last is not None and last < first):
+                    return None
+                if first < size:
+                    ranges.append((first,size - 1 if last is None else min(last,size - 1)))
+        except ValueError:
+            return None
+    return ranges
+
+def read_file_ranges(fileobj,ranges,chunk_size,parts=None):
+    """
+    Generator reading given byte ranges from a file in chunks
+
+    Parts are (header, footer) strings sent around each range for multipart responses
+    """
+    try:
+        for index,(first,last) in enumerate(ranges):
+            if parts:
+                yield parts[index]
+            fileobj.seek(first)
+            remaining=last - first + 1
+            while remaining > 0:
+                data=fileobj.read(min(chunk_size,remaining))
+                if not data:
+                    break
+                remaining-=len(data)
+                yield data
+        if parts:
+            yield parts[-1]
+    finally:
+        fileobj.close()
+
+def get_file_serve_content(filepath,request=None,content_type=None,chunk_size=None):
+    """
+    Returns status, headers and content for serving a file answering a request
+
+    Content is the open file for whole file responses, a generator for byte range responses and
+    an empty tuple for not modified or not satisfiable range responses. Conditional and range
+    requests are only evaluated for GET and HEAD requests.
+    """
+    chunk_size=chunk_size or STATIC_SERVE_CHUNK_SIZE
+    stat=os.stat(filepath)
+    size=stat.st_size
+    etag='%x-%x' % (int(stat.st_mtime),size)
+    last_modified=http_date(stat.st_mtime)
+    headers={
+        'ETag': quote_etag(etag),
+        'Last-Modified': last_modified,
+        'Accept-Ranges': 'bytes',
+    }
+    if request is None or request.method not in ('GET','HEAD'):
+        headers['Content-Length']=size
+        return 200,headers,open(filepath,'rb')
+
+    # Conditional requests
+    if_none_match=request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        if if_none_match.strip()=='*' or etag in parse_etags(if_none_match):
+            return 304,headers,()
+    else:
+        if_modified_since=parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE',''))
+        if if_modified_since is not None and int(stat.st_mtime) <= if_modified_since:
+            return 304,headers,()
+
+    # Range requests. Ranges are ignored if If-Range validator does not match current file
+    ranges=parse_range_header(request.META.get('HTTP_RANGE'),size)
+    if_range=request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range!=last_modified and parse_etags(if_range)!=[etag]:
+        ranges=None
+    if ranges is None or len(ranges) > STATIC_SERVE_MAX_RANGES:
+        headers['Content-Length']=size
+        return 200,headers,open(filepath,'rb')
+    if not ranges:
+        headers['Content-Range']='bytes */%d' % size
+        return 416,headers,()
+    if len(ranges)==1:
+        first,last=ranges[0]
+        headers['Content-Range']='bytes %d-%d/%d' % (first,last,size)
+        headers['Content-Length']=last - first + 1
+        return 206,headers,read_file_ranges(open(filepath,'rb'),ranges,chunk_size)
+    # Multiple ranges are sent as a multipart response
+    boundary=uuid.uuid4().hex
+    parts=[('\r\n--%s\r\nContent-Type: %s\r\nContent-Range: bytes %d-%d/%d\r\n\r\n' % (
+        boundary,content_type or 'application/octet-stream',first,last,size)).encode('ascii') for first,last in ranges]
+    parts.append(('\r\n--%s--\r\n' % boundary).encode('ascii'))
+    headers['Content-Type']='multipart/byteranges; boundary=%s' % boundary
+    headers['Content-Length']=sum(len(part) for part in parts) + sum(last - first + 1 for first,last in ranges)
+    return 206,headers,read_file_ranges(open(filepath,'rb'),ranges,chunk_size,parts)
 
 class JSONResponse(HttpResponse):
     """
@@ -79,21 +197,29 @@ class StaticServeResponse(HttpResponse):
         :type download_as: String
         :param extra_headers: Extra headers that will be used in the response
         :type extra_headers: Dictionary
+        :param request: Request used for conditional and range requests with django backend
+        :type request: HttpRequest
+        :param chunk_size: Size of chunks read from file. Defaults to STATIC_SERVE_CHUNK_SIZE setting
+        :type chunk_size: Integer
         :raises: ValueError if an invalid backend is specified
         
         .. note:: Valid options for backend parameter are:
         
-            * **django**: Use django HTTResponse for sending the file. This backend uses a file wrapper to send file in 8Kb chunks
+            * **django**: Use django HTTResponse for sending the file. This backend loads the file or requested ranges in memory
             * **mod_xsendfile**: Use Apache mod_xsendfile for serving the static file.
             * **nginx_xaccel**: Use nginx X-Accel-Redirect for serving the static file. You can pass extra parameters using extra_headers. Some useful parms are X-Accel-Limit-Rate, X-Accel-Buffering or X-Accel-Charset
         """
         # Guess file mimetype
         content_type=mimetypes.guess_type(filepath)[0]
         kwargs.setdefault('content_type',content_type)
+        request=kwargs.pop('request',None)
+        chunk_size=kwargs.pop('chunk_size',None)
         if backend=='django':
-            wrapper = FileWrapper(file(filepath))
-            super(StaticServeResponse,self).__init__(wrapper,*args,**kwargs)
-            self['Content-Length'] = os.path.getsize(filepath)
+            status,headers,content=get_file_serve_content(filepath,request,kwargs['content_type'],chunk_size)
+            kwargs['status']=status
+            super(StaticServeResponse,self).__init__(content,*args,**kwargs)
+            for k,v in headers.items():
+                self[k] = v
         elif backend=='mod_xsendfile':
             super(StaticServeResponse,self).__init__(*args,**kwargs)
             self['X-Sendfile'] = filepath
@@ -110,11 +236,14 @@ class StaticServeResponse(HttpResponse):
             self[k] = v
 
 
-class StreamingServeResponse(StreamingHttpResponse):
+class StreamingServeResponse(FileResponse):
     """
     **Streaming serve response class**
     
-    *Django StreamingHttpResponse for serving static content*
+    *Django FileResponse for serving static content*
+
+    Whole files are sent using wsgi.file_wrapper when the server provides it, so servers supporting
+    it can use sendfile. Byte ranges are streamed in chunks of chunk_size bytes.
     """
     def __init__(self,filepath,download_as=None,extra_headers={},*args,**kwargs):
         """
@@ -126,13 +255,22 @@ class StreamingServeResponse(StreamingHttpResponse):
         :type download_as: String
         :param extra_headers: Extra headers that will be used in the response
         :type extra_headers: Dictionary
+        :param request: Request used for conditional and range requests
+        :type request: HttpRequest
+        :param chunk_size: Size of chunks read from file. Defaults to STATIC_SERVE_CHUNK_SIZE setting
+        :type chunk_size: Integer
         """
         # Guess file mimetype
         content_type=mimetypes.guess_type(filepath)[0]
         kwargs.setdefault('content_type',content_type)
-        wrapper = FileWrapper(file(filepath))
-        super(StreamingServeResponse,self).__init__(wrapper,*args,**kwargs)
-        self['Content-Length'] = os.path.getsize(filepath)
+        request=kwargs.pop('request',None)
+        chunk_size=kwargs.pop('chunk_size',None) or STATIC_SERVE_CHUNK_SIZE
+        status,headers,content=get_file_serve_content(filepath,request,kwargs['content_type'],chunk_size)
+        kwargs['status']=status
+        self.block_size=chunk_size
+        super(StreamingServeResponse,self).__init__(content,*args,**kwargs)
+        for k,v in headers.items():
+            self[k] = v
         # Setup download headers
         if download_as:
             self['Content-Disposition'] = 'attachment; filename=%s' % download_as
@@ -8,3 +8,17 @@
     :synopsis: 
 .. moduleauthor:: (C) 2014 Oliver Gutiérrez
 """
+
+# Django imports
+from django.conf import settings
+from django.utils.translation import get_language
+
+def get_i18n_column(name,lang=None):
+    """
+    Returns name of indexed I18N field column for given language or active language
+
+    Language codes like pt-br are converted to valid column names like pt_br
+    """
+    if lang is None:
+        lang=get_language() or settings.LANGUAGE_CODE
+    return '%s_%s' % (name,lang.replace('-','_').lower())
@@ -9,9 +9,14 @@
 .. moduleauthor:: (C) 2014 Oliver Gutiérrez
 """
 
+# Python imports
+import copy
+
 # Django imports
 from django import forms
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 
 # EVODjango imports
@@ -22,37 +27,70 @@ class I18NField(forms.MultiValueField):
     Internationalized character field
     """
     base_field=forms.CharField
+
+    # Prototype fields and error messages by field class and options
+    prototypes={}
+
+    @classmethod
+    def get_prototypes(cls,require_all_fields,max_length):
+        """
+        Returns prototype language fields and error messages built once for each field options
+        """
+        key=(cls,require_all_fields,max_length)
+        prototypes=cls.prototypes.get(key)
+        if prototypes is None:
+            if require_all_fields:
+                incompletemsg=_('Please, fill all translations')
+            else:
+                incompletemsg=_('Please, fill at least main language field (%s)' % dict(settings.LANGUAGES)[settings.LANGUAGE_CODE])
+            error_messages = {
+                'incomplete': incompletemsg,
+            }
+            fields=[]
+            for lang in get_language_set()[0]:
+                field_args={
+                    'required': require_all_fields or settings.LANGUAGE_CODE==lang,
+                    'max_length': max_length,
+                }
+                fields.append(cls.base_field(**field_args))
+            prototypes=cls.prototypes[key]=(fields,error_messages)
+        return prototypes
     
     def __init__(self, *args, **kwargs):
         """
         Class initialization method
         """
         require_all_fields=kwargs.pop('require_all_fields',False)
-        if require_all_fields:
-            incompletemsg=_('Please, fill all translations')
-        else:
-            incompletemsg=_('Please, fill at least main language field (%s)' % dict(settings.LANGUAGES)[settings.LANGUAGE_CODE])
-        error_messages = {
-            'incomplete': incompletemsg,
-        }
-        fields=[]
         max_length=kwargs.pop('max_length',None)
-        for lang,langname in settings.LANGUAGES:
-            field_args={
-                'required': require_all_fields or settings.LANGUAGE_CODE==lang,
-                'max_length': max_length,
-            }
-            field=self.base_field(**field_args)
+        prototypes,error_messages=self.get_prototypes(require_all_fields,max_length)
+        # Copy prototypes since multiple value field initialization changes their error messages and
+        # required flag. Language field widgets are not rendered, so they are shared
+        fields=[]
+        for prototype in prototypes:
+            field=copy.copy(prototype)
+            field.error_messages=dict(prototype.error_messages)
             fields.append(field)
-        
-        kwargs['widget']=I18NWidget(kwargs['widget'] for lang in settings.LANGUAGES)
-        super(I18NField, self).__init__(error_messages=error_messages, fields=fields, require_all_fields=require_all_fields, *args, **kwargs)
+        kwargs['widget']=I18NWidget.for_languages(kwargs.get('widget') or self.base_field.widget)
+        super(I18NField, self).__init__(error_messages=dict(error_messages), fields=fields, require_all_fields=require_all_fields, *args, **kwargs)
+
+    def __deepcopy__(self,memo):
+        """
+        Copy field for each form instance sharing language fields, which are not changed after initialization
+        """
+        result=super(forms.MultiValueField,self).__deepcopy__(memo)
+        result.fields=tuple(copy.copy(field) for field in self.fields)
+        return result
 
     def compress(self,data_list):
         """
         Data compression method
         """
-        data={}
-        for lang,value in zip([code for code,langname in settings.LANGUAGES],data_list):
-            data[lang]=value
-        return data
+        return dict(zip(get_language_set()[0],data_list))
+
+@receiver(setting_changed)
+def clear_field_prototypes(setting,**kwargs):
+    """
+    Clear prototype fields when language settings change
+    """
+    if setting in ('LANGUAGES','LANGUAGE_CODE'):
+        I18NField.prototypes.clear()
@@ -9,35 +9,76 @@
 .. moduleauthor:: (C) 2014 Oliver Gutiérrez
 """
 
+# Python imports
+import copy
+
 # Django imports
 from django import forms
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+# Language code and label lists for languages setting
+_language_set=[]
+
+def get_language_set():
+    """
+    Returns language codes and labels lists for languages setting
+
+    Lists are computed once and cleared when languages setting changes
+    """
+    if not _language_set:
+        _language_set[:]=[[lang for lang,langname in settings.LANGUAGES],[langname for lang,langname in settings.LANGUAGES]]
+    return _language_set
 
 class I18NWidget(forms.MultiWidget):
     """
     Internationalized input widget
     """
+    # Prototype widgets by widget class
+    prototypes={}
+
     def __init__(self,widgets,attrs=None):
         """
         Initialization method
         """
         super(I18NWidget,self).__init__(widgets=widgets,attrs=attrs)
 
+    @classmethod
+    def for_languages(cls,widget):
+        """
+        Returns a widget with one widget of given class for each language
+
+        Widgets for widget classes are copied from a prototype built once
+        """
+        if not isinstance(widget,type):
+            return cls([widget] * len(get_language_set()[0]))
+        key=(cls,widget)
+        prototype=cls.prototypes.get(key)
+        if prototype is None:
+            prototype=cls.prototypes[key]=cls([widget] * len(get_language_set()[0]))
+        return copy.deepcopy(prototype)
+
     def decompress(self,value):
         """
         Decompress value
         """
-        data_list=[]
         if value:
-            for lang,langname in settings.LANGUAGES:
-                if lang in value:
-                    data_list.append(value[lang])
-                else:
-                    data_list.append(None)
-        return data_list
+            return [value.get(lang) for lang in get_language_set()[0]]
+        return []
 
     def format_output(self,rendered_widgets):
         """
         Return formatted output            
         """
-        return '<table>' + ' '.join(['<tr><td>%s</td><td>%s</td></tr>' % data for data in zip([langname for lang,langname in settings.LANGUAGES],rendered_widgets)]) + '</table>'
+        rows=zip(get_language_set()[1],rendered_widgets)
+        return '<table>%s</table>' % ''.join(['<tr><td>%s</td><td>%s</td></tr>' % row for row in rows])
+
+@receiver(setting_changed)
+def clear_language_set(setting,**kwargs):
+    """
+    Clear cached language lists and prototypes when language settings change
+    """
+    if setting in ('LANGUAGES','LANGUAGE_CODE'):
+        del _language_set[:]
+        I18NWidget.prototypes.clear()
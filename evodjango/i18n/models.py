@@ -8,7 +8,8 @@
     :synopsis: 
 .. moduleauthor:: (C) 2014 Oliver Gutiérrez
 
-# TODO: Automatic translation support using Google Translate
+Missing languages can be translated automatically using fill_translations command and a translation
+backend from evodjango.i18n.translation
 """
 
 # Django imports
@@ -19,6 +20,7 @@ from django.conf import settings
 from django import forms
 
 # EVODjango imports
+from evodjango.i18n import get_i18n_column
 from evodjango.models import JSONField
 from evodjango.forms import TinyMCEWidget
 from evodjango.i18n.forms import I18NField
@@ -26,9 +28,65 @@ from evodjango.i18n.forms import I18NField
 class I18NTextField(JSONField):
     """
     Internationalization TextField
+
+    Indexed fields add one FIELD_LANG indexed column for each language in settings that is updated
+    on save. Those columns store up to index_length characters and can be used to order and filter
+    by language using I18NModelManager, and to show localized values without loading the field.
+    Saves with update_fields including the field but not its columns save them using an additional
+    query. Existing items can be filled using backfill_dependent_columns or dependent_columns_backfill
+    migration operation.
     """
     description = _('Internationalization TextField')
-    __metaclass__ = models.SubfieldBase
+
+    # Flag used by I18NQuerySet to find I18N fields
+    i18n_field=True
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialization method
+        """
+        self.indexed=kwargs.pop('indexed',False)
+        self.index_length=kwargs.pop('index_length',None)
+        super(I18NTextField,self).__init__(*args, **kwargs)
+        if self.index_length is None:
+            self.index_length=self.max_length or 255
+
+    def deconstruct(self):
+        """
+        Field deconstruction for migrations
+        """
+        name,path,args,kwargs=super(I18NTextField,self).deconstruct()
+        if self.indexed:
+            kwargs['indexed']=True
+            if self.index_length!=(self.max_length or 255):
+                kwargs['index_length']=self.index_length
+        return name,path,args,kwargs
+
+    def get_dependent_columns(self):
+        """
+        Returns indexed column names
+        """
+        return [get_i18n_column(self.attname,lang) for lang,langname in settings.LANGUAGES]
+
+    def get_dependent_values(self,value):
+        """
+        Returns indexed column values for field data
+        """
+        values={}
+        for lang,langname in settings.LANGUAGES:
+            text=value.get(lang) if isinstance(value,dict) else None
+            values[get_i18n_column(self.attname,lang)]=text[:self.index_length] if text else None
+        return values
+
+    def pre_save(self,model_instance,add):
+        """
+        Update indexed columns before saving
+        """
+        if self.indexed:
+            # Decode value so indexed columns are always in sync with saved data
+            for column,value in self.get_dependent_values(getattr(model_instance,self.attname)).items():
+                setattr(model_instance,column,value)
+        return super(I18NTextField,self).pre_save(model_instance,add)
     
     def formfield(self, **kwargs):
         """
@@ -36,19 +94,35 @@ class I18NTextField(JSONField):
         """
         kwargs.setdefault('required',not self.blank)
         kwargs.setdefault('label',self.verbose_name)
+        kwargs.setdefault('widget',forms.Textarea)
         return I18NField(**kwargs)
 
     def contribute_to_class(self, cls, name):
         """
         Contribute to class adding localized_FIELD methods to the model containing this field
         """
+        # Column names by language
+        columns=dict((lang,get_i18n_column(name,lang)) for lang,langname in settings.LANGUAGES)
+        indexed=self.indexed
+        index_length=self.index_length
+
         def get_localized_version(modelobj,lang=None):
             """
             Function to show localized version of a field
             """
-            data=getattr(modelobj,name)
             if lang is None:
                 lang=get_language()
+            if name not in modelobj.__dict__:
+                column=columns.get(lang) or get_i18n_column(name,lang)
+                # Use value loaded by I18NQuerySet localized method
+                if '%s_localized' % column in modelobj.__dict__:
+                    return modelobj.__dict__['%s_localized' % column] or ''
+                # Use indexed column if column value is not truncated
+                if indexed and column in modelobj.__dict__:
+                    text=modelobj.__dict__[column]
+                    if text is None or len(text) < index_length:
+                        return text or ''
+            data=getattr(modelobj,name)
             if lang in data:
                 return data[lang]
             return ''
@@ -60,12 +134,16 @@ class I18NTextField(JSONField):
         # Call original method
         super(I18NTextField,self).contribute_to_class(cls, name)
 
+        # Add indexed columns to concrete models. Historical models used in migrations get them from migration
+        if self.indexed and not cls._meta.abstract and cls.__module__!='__fake__':
+            for column in columns.values():
+                cls.add_to_class(column,models.CharField(max_length=index_length,blank=True,null=True,editable=False,db_index=True))
+
 class I18NCharField(I18NTextField):
     """
     Internationalization CharField
     """
     description = _('Internationalization CharField')
-    __metaclass__ = models.SubfieldBase
     
     def formfield(self,**kwargs):
         """
@@ -80,7 +158,6 @@ class I18NHTMLField(I18NTextField):
     Internationalization HTMLField
     """
     description = _('Internationalization HTMLField')
-    __metaclass__ = models.SubfieldBase
     
     def formfield(self,**kwargs):
         """
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Automatic translation of I18N fields
+===============================================
+
+.. module:: evodjango.i18n.translation
+    :platform: Django
+    :synopsis: Automatic translation backends and worker for I18N fields
+.. moduleauthor:: (C) 2014 Oliver Gutiérrez
+"""
+
+# Python imports
+import time
+from collections import Counter
+from multiprocessing.pool import ThreadPool
+
+# Django imports
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models, transaction
+from django.utils.module_loading import import_string
+
+class BaseTranslationBackend(object):
+    """
+    Base translation backend
+
+    Backends translate lists of texts from a source language to a target language
+    """
+    def __init__(self,**options):
+        """
+        Initialization method
+        """
+        self.options=options
+
+    def translate(self,texts,source,target):
+        """
+        Returns a list with translations for given texts in the same order
+        """
+        raise NotImplementedError('Translation backends must implement translate method')
+
+class StubTranslationBackend(BaseTranslationBackend):
+    """
+    Translation backend for tests returning texts prefixed by target language code
+    """
+    def translate(self,texts,source,target):
+        """
+        Returns texts prefixed by target language code
+        """
+        return ['[%s] %s' % (target,text) for text in texts]
+
+def get_translation_backend(path=None,**options):
+    """
+    Returns an instance of given translation backend or I18N_TRANSLATION_BACKEND setting backend
+
+    Backend options are taken from I18N_TRANSLATION_BACKEND_OPTIONS setting if not given
+    """
+    path=path or getattr(settings,'I18N_TRANSLATION_BACKEND',None)
+    if not path:
+        raise ImproperlyConfigured('No translation backend defined in I18N_TRANSLATION_BACKEND setting')
+    try:
+        backend=import_string(path)
+    except ImportError as e:
+        raise ImproperlyConfigured('Error loading translation backend %s: %s' % (path,e))
+    if not options:
+        options=getattr(settings,'I18N_TRANSLATION_BACKEND_OPTIONS',{})
+    return backend(**options)
+
+class TranslationWorker(object):
+    """
+    Worker filling missing languages of I18N fields using a translation backend
+
+    Items are processed in chunks. For each chunk, source language texts needing translation are
+    grouped by target language, deduplicated and sent to the backend in batches using up to
+    concurrency simultaneous requests. Translations are written back using one update query for
+    each field, only for languages still missing when writing.
+    """
+    def __init__(self,model,fields=None,backend=None,source=None,chunk_size=500,batch_size=50,concurrency=4):
+        """
+        Initialization method
+
+        :param model: Model to be translated
+        :param fields: I18N field names. All I18N fields by default
+        :param backend: Translation backend. Backend from settings by default
+        :param source: Source language. LANGUAGE_CODE setting by default
+        :param chunk_size: Number of items processed in each chunk
+        :param batch_size: Maximum number of texts sent in each backend request
+        :param concurrency: Maximum number of simultaneous backend requests
+        """
+        if chunk_size < 1 or batch_size < 1 or concurrency < 1:
+            raise ValueError('Chunk size, batch size and concurrency must be positive numbers')
+        self.model=model
+        if not fields:
+            fields=[field.name for field in model._meta.concrete_fields if getattr(field,'i18n_field',False)]
+        for fieldname in fields:
+            if not getattr(model._meta.get_field(fieldname),'i18n_field',False):
+                raise ValueError('%s is not an I18N field' % fieldname)
+        self.fields=fields
+        self.backend=backend or get_translation_backend()
+        self.source=source or settings.LANGUAGE_CODE
+        self.targets=[lang for lang,langname in settings.LANGUAGES if lang!=self.source]
+        self.chunk_size=chunk_size
+        self.batch_size=batch_size
+        self.concurrency=concurrency
+        self.stats=Counter()
+
+    def get_missing(self,objs):
+        """
+        Returns source texts needing translation by target language
+        """
+        missing=dict((target,set()) for target in self.targets)
+        for obj in objs:
+            for fieldname in self.fields:
+                data=getattr(obj,fieldname)
+                text=data.get(self.source)
+                if not text:
+                    continue
+                for target in self.targets:
+                    if not data.get(target):
+                        missing[target].add(text)
+                        self.stats['values']+=1
+        return missing
+
+    def translate_batch(self,batch):
+        """
+        Translate a batch of texts returning target language, texts and translations
+        """
+        target,texts=batch
+        try:
+            translations=self.backend.translate(texts,self.source,target)
+            if len(translations)!=len(texts):
+                raise ValueError('Backend returned %d translations for %d texts' % (len(translations),len(texts)))
+        except Exception:
+            return target,texts,None
+        return target,texts,translations
+
+    def translate(self,missing):
+        """
+        Returns translations by target language and source text using concurrent batched requests
+        """
+        batches=[]
+        for target,texts in missing.items():
+            texts=sorted(texts)
+            for start in range(0,len(texts),self.batch_size):
+                batches.append((target,texts[start:start + self.batch_size]))
+        translations=dict((target,{}) for target in self.targets)
+        if not batches:
+            return translations
+        pool=ThreadPool(min(self.concurrency,len(batches)))
+        try:
+            for target,texts,results in pool.imap_unordered(self.translate_batch,batches):
+                self.stats['requests']+=1
+                if results is None:
+                    self.stats['errors']+=1
+                    continue
+                self.stats['strings']+=len(texts)
+                self.stats['characters']+=sum(len(text) for text in texts)
+                translations[target].update(zip(texts,results))
+        finally:
+            pool.close()
+            pool.join()
+        return translations
+
+    def save(self,pks,translations):
+        """
+        Write translations for still missing languages using one update query for each field
+
+        Indexed language columns of indexed fields are updated in the same query
+        """
+        with transaction.atomic():
+            objs=list(self.model._default_manager.select_for_update().filter(pk__in=pks).only('pk',*self.fields))
+            for fieldname in self.fields:
+                field=self.model._meta.get_field(fieldname)
+                whens=[]
+                columns={}
+                changedpks=[]
+                for obj in objs:
+                    data=getattr(obj,fieldname)
+                    text=data.get(self.source)
+                    changed=False
+                    for target in self.targets:
+                        if text and not data.get(target) and text in translations[target]:
+                            data[target]=translations[target][text]
+                            changed=True
+                    if changed:
+                        whens.append(models.When(pk=obj.pk,then=models.Value(data,output_field=field)))
+                        if field.indexed:
+                            for column,value in field.get_dependent_values(data).items():
+                                columns.setdefault(column,[]).append(models.When(pk=obj.pk,then=models.Value(value)))
+                        changedpks.append(obj.pk)
+                if whens:
+                    values=dict((column,models.Case(*columnwhens,output_field=models.CharField()))
+                        for column,columnwhens in columns.items())
+                    values[fieldname]=models.Case(*whens,output_field=field)
+                    self.model._default_manager.filter(pk__in=changedpks).update(**values)
+                    self.stats['updated']+=len(whens)
+
+    def run(self):
+        """
+        Translate all items with missing languages and return metrics
+        """
+        started=time.time()
+        qs=self.model._default_manager.only('pk',*self.fields).order_by('pk')
+        last=None
+        while True:
+            chunk=qs if last is None else qs.filter(pk__gt=last)
+            objs=list(chunk[:self.chunk_size])
+            if not objs:
+                break
+            last=objs[-1].pk
+            self.stats['items']+=len(objs)
+            missing=self.get_missing(objs)
+            if any(missing.values()):
+                self.save([obj.pk for obj in objs],self.translate(missing))
+        self.stats['elapsed']+=time.time() - started
+        return self.get_metrics()
+
+    def get_metrics(self):
+        """
+        Returns worker metrics including throughput in translated strings and characters per second
+        """
+        metrics=dict(self.stats)
+        elapsed=self.stats['elapsed']
+        metrics['strings_per_second']=self.stats['strings'] / elapsed if elapsed else 0.0
+        metrics['characters_per_second']=self.stats['characters'] / elapsed if elapsed else 0.0
+        return metrics
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango management module
+===============================================
+
+.. module:: evodjango.management
+    :platform: Django
+    :synopsis: EVODjango management module
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango management commands
+===============================================
+
+.. module:: evodjango.management.commands
+    :platform: Django
+    :synopsis: EVODjango management commands module
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Automatic translation command
+===============================================
+
+.. module:: evodjango.management.commands.fill_translations
+    :platform: Django
+    :synopsis: Automatic translation command
+.. moduleauthor:: (C) 2014 Oliver Gutiérrez
+"""
+
+# Python imports
+import time
+
+# Django imports
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+# EVODjango imports
+from evodjango.i18n.translation import TranslationWorker, get_translation_backend
+
+class Command(BaseCommand):
+    """
+    Fill missing languages of I18N fields using a translation backend
+    """
+    help = 'Fills missing languages of I18N fields using configured translation backend'
+
+    def add_arguments(self, parser):
+        """
+        Command arguments
+        """
+        parser.add_argument('models', nargs='*',
+            help='Models to be translated in app_label.ModelName format. All models with I18N fields by default')
+        parser.add_argument('--backend', dest='backend', default=None,
+            help='Translation backend class path. Defaults to I18N_TRANSLATION_BACKEND setting')
+        parser.add_argument('--chunk-size', type=int, dest='chunk_size', default=500,
+            help='Number of items processed in each chunk. Defaults to 500')
+        parser.add_argument('--batch-size', type=int, dest='batch_size', default=50,
+            help='Maximum number of texts in each backend request. Defaults to 50')
+        parser.add_argument('--concurrency', type=int, dest='concurrency', default=4,
+            help='Maximum number of simultaneous backend requests. Defaults to 4')
+        parser.add_argument('--interval', type=int, dest='interval', default=0,
+            help='Keep running checking for missing translations every given seconds')
+
+    def handle(self, *args, **options):
+        """
+        Command handler
+        """
+        if options['models']:
+            try:
+                modellist=[apps.get_model(label) for label in options['models']]
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+        else:
+            modellist=[model for model in apps.get_models()
+                if any(getattr(field,'i18n_field',False) for field in model._meta.concrete_fields)]
+        try:
+            backend=get_translation_backend(options['backend'])
+            workers=[TranslationWorker(model,backend=backend,chunk_size=options['chunk_size'],
+                batch_size=options['batch_size'],concurrency=options['concurrency']) for model in modellist]
+        except (ImproperlyConfigured, ValueError) as e:
+            raise CommandError(e)
+
+        while True:
+            for worker in workers:
+                worker.stats.clear()
+                metrics=worker.run()
+                if int(options['verbosity']) > 1 or metrics.get('updated'):
+                    self.stdout.write('%s.%s: %d items, %d updated, %d strings in %d requests, %d errors, %.1f strings/s' % (
+                        worker.model._meta.app_label,worker.model.__name__,metrics.get('items',0),metrics.get('updated',0),
+                        metrics.get('strings',0),metrics.get('requests',0),metrics.get('errors',0),metrics['strings_per_second']))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
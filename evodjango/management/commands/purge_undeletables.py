@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Deleted items purge command
+===============================================
+
+.. module:: evodjango.management.commands.purge_undeletables
+    :platform: Django
+    :synopsis: Deleted items purge command
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Python imports
+import datetime
+
+# Django imports
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+
+# EVODjango imports
+from evodjango.models import UndeletableModel
+from evodjango.models.managers import UndeletableModelAllManager
+
+class Command(BaseCommand):
+    """
+    Remove from database items marked as deleted
+    """
+    help = 'Removes from database undeletable model items deleted more than given days ago'
+
+    def add_arguments(self, parser):
+        """
+        Command arguments
+        """
+        parser.add_argument('models', nargs='*',
+            help='Models to be purged in app_label.ModelName format. All undeletable models by default')
+        parser.add_argument('--days', type=int, dest='days', default=30,
+            help='Minimum days since deletion. Defaults to 30')
+        parser.add_argument('--chunk-size', type=int, dest='chunk_size', default=1000,
+            help='Number of items removed in each transaction. Defaults to 1000')
+        parser.add_argument('--include-undated', action='store_true', dest='include_undated', default=False,
+            help='Also remove deleted items without deletion date')
+
+    def handle(self, *args, **options):
+        """
+        Command handler
+        """
+        if options['models']:
+            try:
+                modellist=[apps.get_model(label) for label in options['models']]
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+        else:
+            modellist=[model for model in apps.get_models() if issubclass(model,UndeletableModel)]
+        if options['chunk_size'] < 1:
+            raise CommandError('Chunk size must be a positive number')
+
+        limit=timezone.now() - datetime.timedelta(days=options['days'])
+        query=models.Q(undeletable_deleted_date__lt=limit)
+        if options['include_undated']:
+            query|=models.Q(undeletable_deleted_date=None)
+
+        for model in modellist:
+            if not issubclass(model,UndeletableModel):
+                raise CommandError('%s is not an undeletable model' % model.__name__)
+            # Use a manager including deleted items bound to model
+            manager=UndeletableModelAllManager()
+            manager.model=model
+            qs=manager.filter(query,undeletable_deleted=True)
+            purged=0
+            # Remove items in chunks to avoid long running transactions
+            while True:
+                pks=list(qs.values_list('pk',flat=True)[:options['chunk_size']])
+                if not pks:
+                    break
+                with transaction.atomic():
+                    manager.filter(pk__in=pks).hard_delete()
+                purged+=len(pks)
+            if int(options['verbosity']) > 1 or purged:
+                self.stdout.write('%s.%s: %d purged' % (model._meta.app_label,model.__name__,purged))
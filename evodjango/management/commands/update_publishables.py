@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Publishable status update command
+===============================================
+
+.. module:: evodjango.management.commands.update_publishables
+    :platform: Django
+    :synopsis: Publishable status update command
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Django imports
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+# EVODjango imports
+from evodjango.models import PublishableModel
+from evodjango.models.managers import PublishableModelManager
+
+class Command(BaseCommand):
+    """
+    Update cached publishable status for publishable models
+    """
+    help = 'Updates cached publishable status of items whose publication dates have been crossed'
+
+    def add_arguments(self, parser):
+        """
+        Command arguments
+        """
+        parser.add_argument('models', nargs='*',
+            help='Models to be updated in app_label.ModelName format. All publishable models by default')
+        parser.add_argument('--full', action='store_true', dest='full', default=False,
+            help='Check all items ignoring stored watermark')
+
+    def handle(self, *args, **options):
+        """
+        Command handler
+        """
+        if options['models']:
+            try:
+                modellist=[apps.get_model(label) for label in options['models']]
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+        else:
+            modellist=[model for model in apps.get_models() if issubclass(model,PublishableModel)]
+
+        for model in modellist:
+            if not issubclass(model,PublishableModel):
+                raise CommandError('%s is not a publishable model' % model.__name__)
+            # Use a publishable manager bound to model
+            manager=PublishableModelManager()
+            manager.model=model
+            published,unpublished=manager.update_publishables(full=options['full'])
+            if int(options['verbosity']) > 1 or published or unpublished:
+                self.stdout.write('%s.%s: %d published, %d unpublished' % (
+                    model._meta.app_label,model.__name__,published,unpublished))
@@ -18,6 +18,9 @@ from django.utils import translation
 from django.utils.cache import patch_vary_headers
 from django.conf import settings
 
+# EVODjango imports
+from evodjango.models.managers import enable_translation_identity_map, clear_translation_identity_map
+
 class CaseInsensitiveURLMiddleware(object):
     """
     SEO Friendly locale middleware
@@ -40,3 +43,30 @@ class SEOFriendlyLocaleMiddleware(LocaleMiddleware):
     SEO Friendly locale middleware
     """
     response_redirect_class = HttpResponsePermanentRedirect
+
+
+class TranslationIdentityMapMiddleware(object):
+    """
+    Request scoped identity map for translatable models
+
+    Translation lookups and translated parent dereferences are memoized during the request.
+    Set TRANSLATION_IDENTITY_MAP_SKIP_WRITES setting to True to disable the map for requests
+    using methods other than GET, HEAD, OPTIONS or TRACE.
+    """
+    def process_request(self, request):
+        """
+        Request processing
+        """
+        skip_writes=getattr(settings,'TRANSLATION_IDENTITY_MAP_SKIP_WRITES',False)
+        if skip_writes and request.method not in ('GET','HEAD','OPTIONS','TRACE'):
+            clear_translation_identity_map()
+        else:
+            enable_translation_identity_map()
+        return None
+
+    def process_response(self, request, response):
+        """
+        Response processing
+        """
+        clear_translation_identity_map()
+        return response
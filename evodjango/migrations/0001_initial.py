@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublishableWatermark',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('app_label', models.CharField(max_length=100, verbose_name='Application')),
+                ('model_name', models.CharField(max_length=100, verbose_name='Model')),
+                ('last_run', models.DateTimeField(verbose_name='Last run')),
+                ('next_transition', models.DateTimeField(null=True, verbose_name='Next transition', blank=True)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='publishablewatermark',
+            unique_together=set([('app_label', 'model_name')]),
+        ),
+    ]
@@ -10,9 +10,12 @@
 """
 
 # Python imports
+import hashlib
 
 # Django imports
-from django.db import models
+from django.db import models, migrations
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -21,6 +24,9 @@ from django.conf import settings
 
 # Import all fields to models module 
 from evodjango.models.fields import *
+from evodjango.models.managers import invalidate_publishable_watermark, lower_publishable_watermark, invalidate_publishables_cache, \
+    get_publishable_sentinels, get_translations, get_translation_identity_map, TranslatableModelManager, \
+    UndeletableModelManager, UndeletableModelAllManager, GenericModelManager, I18NModelManager
 
 
 # Applications imports
@@ -64,6 +70,9 @@ class GenericModel(models.Model):
         Metadata for this model
         """
         abstract=True
+        index_together=[
+            ('content_type','object_id'),
+        ]
     
     content_type = models.ForeignKey(ContentType,verbose_name=_('Content type'),
         help_text=_('Associated content type'))
@@ -71,6 +80,8 @@ class GenericModel(models.Model):
         help_text=_('Associated object identifier'))
     content_object = GenericForeignKey('content_type', 'object_id')
 
+    objects=GenericModelManager()
+
 class GenericNullModel(models.Model):
     """
     Generic relation model
@@ -80,6 +91,9 @@ class GenericNullModel(models.Model):
         Metadata for this model
         """
         abstract=True
+        index_together=[
+            ('content_type','object_id'),
+        ]
     
     content_type = models.ForeignKey(ContentType,verbose_name=_('Content type'),blank=True,null=True,
         help_text=_('Associated content type'))
@@ -87,15 +101,73 @@ class GenericNullModel(models.Model):
         help_text=_('Associated object identifier'))
     content_object = GenericForeignKey('content_type', 'object_id')
 
+    objects=GenericModelManager()
+
+class GenericCharModel(models.Model):
+    """
+    Generic relation model using a string object identifier
+
+    Allows relations to objects with non integer primary keys like UUIDs
+    """
+    class Meta:
+        """
+        Metadata for this model
+        """
+        abstract=True
+        index_together=[
+            ('content_type','object_id'),
+        ]
+    
+    content_type = models.ForeignKey(ContentType,verbose_name=_('Content type'),
+        help_text=_('Associated content type'))
+    object_id = models.CharField(_('Object ID'),max_length=64,
+        help_text=_('Associated object identifier'))
+    content_object = GenericForeignKey('content_type', 'object_id')
+
+    objects=GenericModelManager()
+
+class GenericCharNullModel(models.Model):
+    """
+    Generic relation model using a string object identifier
+
+    Allows relations to objects with non integer primary keys like UUIDs
+    """
+    class Meta:
+        """
+        Metadata for this model
+        """
+        abstract=True
+        index_together=[
+            ('content_type','object_id'),
+        ]
+    
+    content_type = models.ForeignKey(ContentType,verbose_name=_('Content type'),blank=True,null=True,
+        help_text=_('Associated content type'))
+    object_id = models.CharField(_('Object ID'),max_length=64,blank=True,null=True,
+        help_text=_('Associated object identifier'))
+    content_object = GenericForeignKey('content_type', 'object_id')
+
+    objects=GenericModelManager()
+
 class PublishableModel(models.Model):
     """
     Publishable model
+
+    Set publishable_sentinel_dates to True to store minimum and maximum sentinel dates instead
+    of empty publication dates. This allows publishable items to be queried with a single range
+    predicate. Existing items can be converted using managers.fill_publishable_sentinels.
     """
     class Meta:
         """
         Metadata for this model
         """
         abstract=True
+        index_together=[
+            ('publishable_active','publishable_start','publishable_end'),
+        ]
+
+    # Use sentinel dates instead of empty publication dates
+    publishable_sentinel_dates=False
 
     publishable_fieldset=('Publication', {
         'description': _('Publication options'),
@@ -116,9 +188,71 @@ class PublishableModel(models.Model):
         """
         Save method overload
         """
+        # Replace empty publication dates by sentinel dates
+        if self.publishable_sentinel_dates:
+            mindate,maxdate=get_publishable_sentinels()
+            if self.publishable_start is None:
+                self.publishable_start=mindate
+            if self.publishable_end is None:
+                self.publishable_end=maxdate
         # Set publishable status on new saved and modified items
-        self.publishable_publishable=True
+        self.publishable_publishable=self.check_publishable_dates()
         super(PublishableModel,self).save(*args,**kwargs)
+        # Saved dates may introduce a transition before the stored watermark
+        state=self.get_publishable_state()
+        if state!=getattr(self,'_publishable_loaded_state',None):
+            lower_publishable_watermark(self.__class__,self.get_next_publishable_transition())
+            self._publishable_loaded_state=state
+
+    @classmethod
+    def from_db(cls,db,field_names,values):
+        """
+        Creates an instance from database values keeping loaded publication state
+        """
+        instance=super(PublishableModel,cls).from_db(db,field_names,values)
+        instance._publishable_loaded_state=instance.get_publishable_state()
+        return instance
+
+    def get_publishable_state(self):
+        """
+        Returns active flag and publication dates loaded in this object
+
+        Watermark is only lowered when saving objects whose state differs from the loaded one
+        """
+        return tuple(self.__dict__.get(name) for name in ('publishable_active','publishable_start','publishable_end'))
+
+    def get_next_publishable_transition(self,date=None):
+        """
+        Returns the nearest publication start or end date after given date for this object
+        """
+        if not self.publishable_active:
+            return None
+        if date is None:
+            date=timezone.now()
+        transitions=[]
+        if self.publishable_start and self.publishable_start > date:
+            transitions.append(self.publishable_start)
+        if self.publishable_end and self.publishable_end >= date:
+            transitions.append(self.publishable_end)
+        if transitions:
+            return min(transitions)
+        return None
+
+    def check_publishable_dates(self,date=None):
+        """
+        Computes publishable status using active flag and publication dates
+
+        Empty start or end dates mean the object has no publication limit on that side
+        """
+        if not self.publishable_active:
+            return False
+        if date is None:
+            date=timezone.now()
+        if self.publishable_start and date < self.publishable_start:
+            return False
+        if self.publishable_end and date > self.publishable_end:
+            return False
+        return True
 
     def is_publishable(self):
         """
@@ -129,25 +263,18 @@ class PublishableModel(models.Model):
             * It is in date and time or does not expire
             
         If an object has an associated object is publishable only if the associated one is publishable too
+
+        Active and date conditions are read from publishable cached field. That field is updated
+        on save and for crossed publication dates by update_publishables management command.
         """
-        # By default an object is not publishable
-        publishable=False
         # Check if we have an assocciated object and use its data instead self
         assoc=self.get_associated_publishable()
         if assoc:
             return assoc.is_publishable()
-        # Check active and not paused
-        if self.publishable_active:
-            # Check dates
-            date=timezone.now()
-            if self.publishable_start and date >= self.publishable_start and self.publishable_end and date <= self.publishable_end:
-                # Check custom conditions
-                publishable=self.extra_check_publishable()
-        # Update publishable cached field
-        if self.publishable_publishable != publishable:
-            self.publishable_publishable=publishable
-            self.save()
-        return publishable
+        # Check cached status and custom conditions
+        if self.publishable_publishable:
+            return self.extra_check_publishable()
+        return False
 
     def get_associated_publishable(self):
         """
@@ -161,6 +288,35 @@ class PublishableModel(models.Model):
         """
         return True
 
+@receiver(post_save)
+@receiver(post_delete)
+def publishable_cache_invalidation(sender,**kwargs):
+    """
+    Invalidate cached publishables when a publishable item is saved or deleted
+    """
+    if issubclass(sender,PublishableModel):
+        invalidate_publishables_cache(sender)
+
+class PublishableWatermark(models.Model):
+    """
+    Publication state watermark of a publishable model
+
+    Stores last update_publishables run and next publication date transition so runs before that
+    transition are skipped. It is stored in database instead of cache so command and web processes
+    share it with any cache backend. Requires evodjango in INSTALLED_APPS and its migrations applied.
+    """
+    class Meta:
+        """
+        Metadata for this model
+        """
+        app_label='evodjango'
+        unique_together=('app_label','model_name')
+
+    app_label=models.CharField(_('Application'),max_length=100)
+    model_name=models.CharField(_('Model'),max_length=100)
+    last_run=models.DateTimeField(_('Last run'))
+    next_transition=models.DateTimeField(_('Next transition'),blank=True,null=True)
+
 class TranslatableModel(models.Model):
     """
     Translatable model
@@ -182,6 +338,8 @@ class TranslatableModel(models.Model):
         help_text=_('Language for this model'))
     translatable_parent=models.ForeignKey('self',verbose_name=_('Translated parent'),editable=False,blank=True,null=True,db_index=True,
         help_text=_('Parent item that is translated by this one'))
+
+    objects=TranslatableModelManager()
     
     #def __getattribute__(self, name):
     #    """
@@ -196,17 +354,37 @@ class TranslatableModel(models.Model):
         Save method overload
         """
         if not self.translatable_lang:
-            self.lang=translation.get_language()
+            self.translatable_lang=translation.get_language()
         super(TranslatableModel,self).save(*args,**kwargs)
+        # Discard request translation lookups that may be outdated
+        idmap=get_translation_identity_map()
+        if idmap:
+            idmap.clear()
     
     def get_root_translation(self):
         """
         Get root translated model
         """
-        if not self.translatable_parent:
+        if not self.translatable_parent_id:
             return self
-        return self.translatable_parent
+        # Use parent from request identity map if available
+        idmap=get_translation_identity_map()
+        if idmap is None:
+            return self.translatable_parent
+        key=(self.__class__,self.translatable_parent_id)
+        if key not in idmap:
+            idmap[key]=self.translatable_parent
+        return idmap[key]
     
+    def set_translation(self,obj,lang):
+        """
+        Set already retrieved translation for given language
+        """
+        if not hasattr(self,'_translations'):
+            self._translations={}
+        self._translations[lang]=obj
+        self.translation=obj
+
     def get_translation(self,lang=None):
         """
         Get translation for given language
@@ -214,16 +392,21 @@ class TranslatableModel(models.Model):
         # If lang is not specified, we use the current thread language
         if not lang:
             lang=translation.get_language()
-        # Get root translation
-        parent=self.get_root_translation()
-        try:
-            return TranslatableModel.objects.get(translatable_parent=parent,translatable_lang=lang)
-        except:
-            return parent
+        # Use translations attached by queryset with_translations method
+        translations=getattr(self,'_translations',{})
+        if lang in translations:
+            return translations[lang]
+        # Get translation or root translation as fallback
+        if self.pk is None:
+            return self
+        return get_translations(self.__class__,[self],lang)[self.pk]
 
 class UndeletableModel(models.Model):
     """
     Undeletable model
+
+    Default manager excludes deleted items. Use all_objects manager to access deleted ones.
+    Deleting objects or querysets marks them as deleted instead of removing them from database.
     """
     class Meta:
         """
@@ -231,8 +414,61 @@ class UndeletableModel(models.Model):
         """
         abstract=True
 
-    undeletable_deleted=models.BooleanField(_('Deleted'),default=False,editable=False,db_index=True,
+    undeletable_deleted=models.BooleanField(_('Deleted'),default=False,editable=False,
         help_text=_('Indicates if this object has been deleted'))
+    undeletable_deleted_date=models.DateTimeField(_('Deletion date'),blank=True,null=True,editable=False,
+        help_text=_('Date and time this object has been deleted'))
+
+    objects=UndeletableModelManager()
+    all_objects=UndeletableModelAllManager()
+
+    def delete(self,*args,**kwargs):
+        """
+        Delete method overload to mark this object as deleted
+        """
+        self.undeletable_deleted=True
+        self.undeletable_deleted_date=timezone.now()
+        self.save(update_fields=['undeletable_deleted','undeletable_deleted_date'])
+
+    def hard_delete(self,*args,**kwargs):
+        """
+        Delete this object from database
+        """
+        return super(UndeletableModel,self).delete(*args,**kwargs)
+
+def undeletable_index(table,*columns):
+    """
+    Returns a migration operation creating an index restricted to not deleted items
+
+    Partial indexes are created in PostgreSQL and SQLite, and plain indexes in other databases.
+    Index condition matches the undeletable_deleted = false condition of default manager queries.
+    SQLite only uses the index for queries with bound parameters when statements are prepared
+    with sqlite3_prepare_v2, as Python 3 sqlite3 module does:
+
+        operations = [
+            undeletable_index('app_model','name'),
+        ]
+    """
+    name='%s_%s_undeleted' % (table[:32],hashlib.md5(','.join(columns).encode('utf-8')).hexdigest()[:8])
+
+    def create_index(apps,schema_editor):
+        vendor=schema_editor.connection.vendor
+        sql='CREATE INDEX %s ON %s (%s)' % (schema_editor.quote_name(name),schema_editor.quote_name(table),
+            ', '.join(schema_editor.quote_name(column) for column in columns))
+        # Old SQLite versions do not support false keyword
+        if vendor=='postgresql':
+            sql+=' WHERE undeletable_deleted = false'
+        elif vendor=='sqlite':
+            sql+=' WHERE undeletable_deleted = 0'
+        schema_editor.execute(sql,params=None)
+
+    def drop_index(apps,schema_editor):
+        sql='DROP INDEX %s' % schema_editor.quote_name(name)
+        if schema_editor.connection.vendor=='mysql':
+            sql+=' ON %s' % schema_editor.quote_name(table)
+        schema_editor.execute(sql,params=None)
+
+    return migrations.RunPython(create_index,drop_index)
 
 class TimestampedModel(models.Model):
     """
@@ -9,34 +9,105 @@ EVODjango model fields
 .. moduleauthor:: (C) 2012 Oliver Gutiérrez
 """
 # Python imports
-import json
+from importlib import import_module
+from functools import partial
+import base64, zlib, json
+try:
+    import lzma
+except ImportError:
+    lzma=None
 
 # Django imports
-from django.db import models
+from django.db import models, migrations, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.utils import six
+from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
 # EVODjango imports
 from evodjango import enums
-from evodjango.forms import LocationField as LocationFormField, TinyMCEWidget
+from evodjango.choices import get_choice_index
+from evodjango.geo import geohash_encode
+from evodjango.models.lookups import KeyTransformFactory
+from evodjango.forms import LocationField as LocationFormField, TinyMCEWidget, IndexedChoiceField
 
-class GenderField(models.CharField):
+class IndexedChoicesMixin(object):
+    """
+    Mixin for fields using precomputed choice lookup tables for display, validation and forms
+    """
+    # Sort form options by translated label
+    sort_choices=True
+
+    @property
+    def choice_index(self):
+        """
+        Returns choice index for field choices
+        """
+        return get_choice_index(self.choices)
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        """
+        Contribute to class adding get_FIELD_display method using choice index
+        """
+        super(IndexedChoicesMixin,self).contribute_to_class(cls, name, **kwargs)
+        index=self.choice_index
+        attname=self.attname
+
+        def get_display(modelobj):
+            """
+            Function to show choice label for field value
+            """
+            value=getattr(modelobj,attname)
+            return force_text(index.get_label(value,value),strings_only=True)
+
+        setattr(cls, 'get_%s_display' % self.name, get_display)
+
+    def validate(self, value, model_instance):
+        """
+        Validate value checking choices in choice index
+        """
+        if not self.editable:
+            return
+        if value not in self.empty_values and value not in self.choice_index:
+            raise ValidationError(self.error_messages['invalid_choice'],code='invalid_choice',params={'value': value})
+        if value is None and not self.null:
+            raise ValidationError(self.error_messages['null'], code='null')
+        if not self.blank and value in self.empty_values:
+            raise ValidationError(self.error_messages['blank'], code='blank')
+
+    def formfield(self, **kwargs):
+        """
+        Form field method overload using cached translated options
+        """
+        include_blank=self.blank or not (self.has_default() or 'initial' in kwargs)
+        index=self.choice_index
+        sort=self.sort_choices
+        kwargs.setdefault('choices',lambda: index.get_options(include_blank,sort))
+        kwargs.setdefault('choices_form_class',partial(IndexedChoiceField,choice_index=index))
+        return super(IndexedChoicesMixin,self).formfield(**kwargs)
+
+class GenderField(IndexedChoicesMixin,models.CharField):
     """
     Gender selection field
     """
     description = _('Internationalization CharField')
     __metaclass__ = models.SubfieldBase
-    
+    sort_choices=False
 
     def __init__(self, *args, **kwargs):
         """
         Class initialization method
         """
         kwargs.setdefault('max_length', 1)
-        kwargs.setdefault('choices', enums.GENDERS)
+        # Get enumeration table only when needed
+        if 'choices' not in kwargs:
+            kwargs['choices']=enums.GENDERS
         super(GenderField, self).__init__(*args, **kwargs)
 
-class CountryField(models.CharField):
+class CountryField(IndexedChoicesMixin,models.CharField):
     """
     Country selection field
     """
@@ -48,10 +119,12 @@ class CountryField(models.CharField):
         Class initialization method
         """
         kwargs.setdefault('max_length', 2)
-        kwargs.setdefault('choices', enums.COUNTRIES)
+        # Get enumeration table only when needed
+        if 'choices' not in kwargs:
+            kwargs['choices']=enums.COUNTRIES
         super(CountryField, self).__init__(*args, **kwargs)
 
-class CurrencyField(models.CharField):
+class CurrencyField(IndexedChoicesMixin,models.CharField):
     """
     Currency selection field
     """
@@ -63,10 +136,12 @@ class CurrencyField(models.CharField):
         Class initialization method
         """
         kwargs.setdefault('max_length', 3)
-        kwargs.setdefault('choices', enums.CURRENCY_CODES)
+        # Get enumeration table only when needed
+        if 'choices' not in kwargs:
+            kwargs['choices']=enums.CURRENCY_CODES
         super(CurrencyField, self).__init__(*args, **kwargs)
 
-class LanguageField(models.CharField):
+class LanguageField(IndexedChoicesMixin,models.CharField):
     """
     Language selection field
     """
@@ -81,12 +156,113 @@ class LanguageField(models.CharField):
         kwargs.setdefault('choices', settings.LANGUAGES)
         super(LanguageField, self).__init__(*args, **kwargs)
 
+# JSON codecs tried in order when no codec is specified. Set JSON_FIELD_CODECS to ('json',) to keep
+# stdlib json format when orjson or ujson are installed
+JSON_CODECS=getattr(settings,'JSON_FIELD_CODECS',('orjson','ujson','json'))
+
+def get_json_codec(name=None):
+    """
+    Returns an encoder and decoder function tuple for a JSON codec module
+
+    If no name is given, first installed module in JSON_CODECS is used. Encoders of codecs other
+    than json fall back to json for values they can not encode.
+    """
+    for codec in ([name] if name else JSON_CODECS):
+        try:
+            module=import_module(codec)
+        except ImportError:
+            continue
+        if codec=='json':
+            return module.dumps,module.loads
+        if codec=='orjson':
+            # orjson encodes to bytes
+            dumps=lambda value: module.dumps(value).decode('utf-8')
+        else:
+            dumps=module.dumps
+        return partial(encode_json_fallback,dumps),module.loads
+    raise ImproperlyConfigured('No JSON codec available in %s' % ', '.join([name] if name else JSON_CODECS))
+
+def encode_json_fallback(dumps,value):
+    """
+    Encode a value using given encoder or json module if the encoder can not encode it
+    """
+    try:
+        return dumps(value)
+    except (TypeError,OverflowError):
+        return json.dumps(value)
+
+# Compression codecs for encoded fields with header byte identifying them
+COMPRESSION_CODECS={
+    'zlib': (b'\x01',zlib.compress,zlib.decompress),
+}
+if lzma is not None:
+    COMPRESSION_CODECS['lzma']=(b'\x02',lzma.compress,lzma.decompress)
+# Header byte for not compressed binary values
+UNCOMPRESSED_HEADER=b'\x00'
+
+# Types for encoded values retrieved from binary columns
+BINARY_TYPES=(six.binary_type,bytearray,memoryview)
+if six.PY2:
+    BINARY_TYPES+=(buffer,)
+
+class RawEncodedValue(object):
+    """
+    Encoded value retrieved from database that has not been decoded
+    """
+    def __init__(self,value):
+        """
+        Initialization method
+        """
+        self.value=value
+
+class EncodedFieldDescriptor(object):
+    """
+    Encoded field descriptor
+
+    Values coming from database are kept encoded until first access
+    """
+    def __init__(self,field):
+        """
+        Initialization method
+        """
+        self.field=field
+
+    def __get__(self,obj,type=None):
+        """
+        Returns decoded value decoding it if needed
+        """
+        if obj is None:
+            return self
+        value=obj.__dict__[self.field.attname]
+        if isinstance(value,RawEncodedValue):
+            value=obj.__dict__[self.field.attname]=self.field.to_python(value.value)
+        return value
+
+    def __set__(self,obj,value):
+        """
+        Stores encoded values for later decoding and decoded ones directly
+
+        Empty values are decoded when assigned so their decoded value is saved
+        """
+        if value is None:
+            value=self.field.to_python(value)
+        elif isinstance(value,six.string_types) or isinstance(value,BINARY_TYPES):
+            value=RawEncodedValue(value)
+        obj.__dict__[self.field.attname]=value
+
 class EncodedField(models.TextField):
     """
     Encoded data field
+
+    Values are decoded on first attribute access. Values never accessed are saved back
+    without encoding them again.
+
+    Encoded values longer than compress_threshold bytes can be compressed using zlib or lzma
+    compression. Compressed values are stored in text columns as a header character followed
+    by base64 encoded data, so not compressed values can be read side by side. Use binary
+    storage to store values in binary columns with a header byte and no base64 overhead.
     """
     description = _('Encoded data field')
-    __metaclass__ = models.SubfieldBase
     
     def __init__(self,*args, **kwargs):
         """
@@ -98,54 +274,225 @@ class EncodedField(models.TextField):
         self.decodecb=kwargs.pop('decoder',None)
         if self.decodecb is None:
             raise ValueError(_('No decoder callback defined'))
+        self.compression=kwargs.pop('compression',None)
+        if self.compression is not None and self.compression not in COMPRESSION_CODECS:
+            raise ImproperlyConfigured('Compression codec %s is not available' % self.compression)
+        self.compress_threshold=kwargs.pop('compress_threshold',1024)
+        self.storage=kwargs.pop('storage','text')
+        if self.storage not in ('text','binary'):
+            raise ValueError(_('Invalid storage type'))
         super(EncodedField,self).__init__(*args, **kwargs)
     
+    def deconstruct(self):
+        """
+        Field deconstruction for migrations
+        """
+        name,path,args,kwargs=super(EncodedField,self).deconstruct()
+        if self.compression is not None:
+            kwargs['compression']=self.compression
+        if self.compress_threshold!=1024:
+            kwargs['compress_threshold']=self.compress_threshold
+        if self.storage!='text':
+            kwargs['storage']=self.storage
+        return name,path,args,kwargs
+
+    def get_internal_type(self):
+        """
+        Returns internal type depending on storage
+        """
+        if self.storage=='binary':
+            return 'BinaryField'
+        return super(EncodedField,self).get_internal_type()
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        """
+        Contribute to class setting lazy decoding descriptor
+        """
+        super(EncodedField,self).contribute_to_class(cls, name, **kwargs)
+        setattr(cls, self.name, EncodedFieldDescriptor(self))
+
     def dummy_encode_decode(self,value):
         """
         Dummy enconde/decode method for raising not implemented error
         """
 
+    def pack(self,value):
+        """
+        Compress an encoded value if needed and convert it to storage format
+        """
+        data=value.encode('utf-8') if isinstance(value,six.text_type) else value
+        header=None
+        if self.compression and len(data) >= self.compress_threshold:
+            header,compress,decompress=COMPRESSION_CODECS[self.compression]
+            data=compress(data)
+        if self.storage=='binary':
+            return (header or UNCOMPRESSED_HEADER) + data
+        if header is None:
+            return value
+        return header.decode('ascii') + base64.b64encode(data).decode('ascii')
+
+    def unpack(self,value):
+        """
+        Convert a stored value to encoded value decompressing it if needed
+
+        Values that are not stored values, like already decoded ones, are returned unchanged.
+        Binary values without a known header byte are legacy values stored without header.
+        """
+        if not value or not isinstance(value,six.string_types + BINARY_TYPES):
+            return value
+        if self.storage=='binary' and isinstance(value,BINARY_TYPES):
+            value=value.tobytes() if isinstance(value,memoryview) else bytes(value)
+            header,data=value[:1],value[1:]
+        elif value[0] in ('\x01','\x02'):
+            header,data=value[0].encode('ascii'),base64.b64decode(value[1:])
+        else:
+            return value
+        for name,(codecheader,compress,decompress) in COMPRESSION_CODECS.items():
+            if header==codecheader:
+                data=decompress(data)
+                break
+        else:
+            if header!=UNCOMPRESSED_HEADER:
+                data=value
+        return data.decode('utf-8')
+
     def to_python(self,value):
         """
         Python object casting method
         """
-        return self.decodecb(value)
+        return self.decodecb(self.unpack(value))
+
+    def pre_save(self,model_instance,add):
+        """
+        Returns value to be saved keeping not decoded values as they are
+        """
+        value=model_instance.__dict__.get(self.attname)
+        if isinstance(value,RawEncodedValue):
+            return value
+        return super(EncodedField,self).pre_save(model_instance,add)
 
     def get_prep_value(self,value):
         """
         DB object casting method
         """
-        return self.encodecb(value)
+        if isinstance(value,RawEncodedValue):
+            return value.value
+        value=self.encodecb(value)
+        if value is None:
+            return None
+        return self.pack(value)
+
+    def get_db_prep_value(self,value,connection,prepared=False):
+        """
+        DB specific object casting method
+        """
+        value=super(EncodedField,self).get_db_prep_value(value,connection,prepared)
+        if self.storage=='binary' and value is not None:
+            return connection.Database.Binary(value)
+        return value
 
 class JSONField(EncodedField):
     """
     JSON data field
+
+    Uses codec parameter as JSON module name or first installed module in JSON_CODECS
+
+    Keys can be used in queries as transforms like field__key='value' or field__key__icontains='x'.
+    Key values are compared as text. Use field__key__num and field__key__bool for numbers and booleans.
+    Key names matching lookup or transform names like contains, in or num are interpreted as lookups.
     """
     description = _('JSON encoded data field')
-    __metaclass__ = models.SubfieldBase
     
     def __init__(self, *args, **kwargs):
         """
         Initialization method
         """
-        super(JSONField,self).__init__(encoder=json.dumps,decoder=self.decode_json, *args, **kwargs)
+        self.codec=kwargs.pop('codec',None)
+        self.encode_json,self.loads_json=get_json_codec(self.codec)
+        super(JSONField,self).__init__(encoder=self.encode_json,decoder=self.decode_json, *args, **kwargs)
     
+    def deconstruct(self):
+        """
+        Field deconstruction for migrations
+        """
+        name,path,args,kwargs=super(JSONField,self).deconstruct()
+        if self.codec is not None:
+            kwargs['codec']=self.codec
+        return name,path,args,kwargs
+
+    def get_transform(self,name):
+        """
+        Returns a key transform for names that are not registered transforms
+        """
+        transform=super(JSONField,self).get_transform(name)
+        if transform:
+            return transform
+        return KeyTransformFactory(name)
+
     def decode_json(self,value):
         """
         Python object casting method
         """
         if not value:
             return {}
-        elif isinstance(value, dict):
+        elif not isinstance(value, six.string_types):
             return value
-        return json.loads(value)
+        return self.loads_json(value)
 
 class LocationField(JSONField):
     """
     Location field class
+
+    Indexed location fields add FIELD_lat, FIELD_lon and FIELD_geohash indexed columns to the model
+    that are updated on save. Those columns are used by LocationModelManager spatial queries.
+    Saves with update_fields including the field but not its columns save them using an additional
+    query. Existing items can be filled using backfill_dependent_columns or dependent_columns_backfill
+    migration operation.
     """
     description = _('JSON encoded latitude and longitude')
-    __metaclass__ = models.SubfieldBase
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialization method
+        """
+        self.indexed=kwargs.pop('indexed',False)
+        super(LocationField,self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        """
+        Field deconstruction for migrations
+        """
+        name,path,args,kwargs=super(LocationField,self).deconstruct()
+        if self.indexed:
+            kwargs['indexed']=True
+        return name,path,args,kwargs
+
+    def get_dependent_columns(self):
+        """
+        Returns indexed column names
+        """
+        return ['%s_lat' % self.attname,'%s_lon' % self.attname,'%s_geohash' % self.attname]
+
+    def get_dependent_values(self,value):
+        """
+        Returns indexed column values for a location
+        """
+        try:
+            lat,lon=float(value['lat']),float(value['lon'])
+            geohash=geohash_encode(lat,lon)
+        except (KeyError,TypeError,ValueError):
+            lat=lon=geohash=None
+        return dict(zip(self.get_dependent_columns(),(lat,lon,geohash)))
+
+    def pre_save(self,model_instance,add):
+        """
+        Update indexed columns before saving
+        """
+        if self.indexed:
+            # Decode value so indexed columns are always in sync with saved data
+            for column,value in self.get_dependent_values(getattr(model_instance,self.attname)).items():
+                setattr(model_instance,column,value)
+        return super(LocationField,self).pre_save(model_instance,add)
 
     def formfield(self, **kwargs):
         """
@@ -177,6 +524,88 @@ class LocationField(JSONField):
         # Call original method
         super(LocationField,self).contribute_to_class(cls, name)
 
+        # Add indexed columns to concrete models. Historical models used in migrations get them from migration
+        if self.indexed and not cls._meta.abstract and cls.__module__!='__fake__':
+            latcolumn,loncolumn,geohashcolumn=self.get_dependent_columns()
+            cls.add_to_class(latcolumn,models.FloatField(blank=True,null=True,editable=False,db_index=True))
+            cls.add_to_class(loncolumn,models.FloatField(blank=True,null=True,editable=False,db_index=True))
+            cls.add_to_class(geohashcolumn,models.CharField(max_length=12,blank=True,null=True,editable=False,db_index=True))
+
+def get_dependent_fields(model):
+    """
+    Returns fields with indexed columns of a model
+
+    Indexed fields provide get_dependent_columns and get_dependent_values methods
+    """
+    return [field for field in model._meta.concrete_fields
+        if getattr(field,'indexed',False) and hasattr(field,'get_dependent_values')]
+
+@receiver(post_save)
+def save_dependent_columns(sender,instance,raw=False,using=None,update_fields=None,**kwargs):
+    """
+    Save indexed columns of fields saved using update_fields without including those columns
+
+    Columns are saved using an additional update query. Include them in update_fields to avoid it.
+    """
+    if raw or not update_fields:
+        return
+    values={}
+    for field in get_dependent_fields(sender):
+        columns=field.get_dependent_columns()
+        if field.name in update_fields and not update_fields.issuperset(columns):
+            values.update((column,getattr(instance,column)) for column in columns)
+    if values:
+        sender._base_manager.using(using).filter(pk=instance.pk).update(**values)
+
+def backfill_dependent_columns(model,fieldnames=None,chunk_size=500):
+    """
+    Fill indexed columns of fields for all existing items of a model
+
+    Use it after enabling indexed option for fields with existing data. All fields with indexed
+    columns are used if no field names are given. Returns the number of processed items.
+    """
+    if fieldnames:
+        fields=[model._meta.get_field(fieldname) for fieldname in fieldnames]
+    else:
+        fields=get_dependent_fields(model)
+    if not fields:
+        return 0
+    qs=model._base_manager.only('pk',*[field.name for field in fields]).order_by('pk')
+    last=None
+    processed=0
+    # Update items in chunks to avoid long running transactions
+    while True:
+        chunk=qs if last is None else qs.filter(pk__gt=last)
+        objs=list(chunk[:chunk_size])
+        if not objs:
+            break
+        last=objs[-1].pk
+        with transaction.atomic(using=qs.db):
+            for obj in objs:
+                values={}
+                for field in fields:
+                    values.update(field.get_dependent_values(getattr(obj,field.attname)))
+                model._base_manager.filter(pk=obj.pk).update(**values)
+        processed+=len(objs)
+    return processed
+
+def dependent_columns_backfill(app_label,model_name,*fieldnames):
+    """
+    Returns a migration operation filling indexed columns of fields for existing items
+
+    Add it after the operations adding the indexed columns:
+
+        operations = [
+            migrations.AddField('place','location_lat',...),
+            ...
+            dependent_columns_backfill('app','Place','location'),
+        ]
+    """
+    def backfill(apps,schema_editor):
+        backfill_dependent_columns(apps.get_model(app_label,model_name),fieldnames or None)
+
+    return migrations.RunPython(backfill,migrations.RunPython.noop)
+
 class EXIFField(JSONField):
     """
     EXIF data field
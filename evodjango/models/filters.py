@@ -9,6 +9,42 @@ Filter related classes and utilities
 .. moduleauthor:: (C) 2013 Oliver Gutiérrez
 """
 
+# Python imports
+import inspect, hashlib, datetime, decimal
+
+# Django imports
+from django.core.cache import cache
+from django.db.models import Q, Count
+from django.utils import six
+from django.utils.dateparse import parse_date, parse_datetime
+
+# Cache key for facet counts
+FACETS_CACHE_KEY='evodjango.filters.facets.%s.%s'
+
+def parse_decimal(value):
+    """
+    Returns a decimal for given value or None if value is not a valid finite number
+    """
+    try:
+        value=decimal.Decimal(value)
+    except decimal.InvalidOperation:
+        return None
+    return value if value.is_finite() else None
+
+# Range value parsers. Parsers return None for invalid values
+RANGE_PARSERS={
+    'int': lambda value: int(value) if value.lstrip('+-').isdigit() else None,
+    'decimal': parse_decimal,
+    'date': parse_date,
+    'datetime': parse_datetime,
+}
+
+# Steps for discrete range types
+RANGE_STEPS={
+    'int': 1,
+    'date': datetime.timedelta(days=1),
+}
+
 class FilterProcessor(object):
     """
     Filter processor class
@@ -22,8 +58,47 @@ class FilterProcessor(object):
             filterspecs = {
                 'shortcut': (processor, [processor,parameters])
             }
+
+        Filter specs are compiled and validated on initialization
+
+        :raises: ValueError if filter specs are not valid
         """
-        self.filterspecs=filterspecs        
+        self.filterspecs=filterspecs
+        self.compiled=self.compile()
+
+    def compile(self):
+        """
+        Compile filter specs into a table of bound processors with their parameters
+
+        Returns a dictionary with (name, processor, parameters, is_list, kind) tuples by shortcut.
+        Kind is the processor name for built-in processors and None for callables.
+
+        :raises: ValueError if a filter spec is not valid
+        """
+        table={}
+        for shortcut,spec in self.filterspecs.items():
+            processor=spec[0]
+            parms=tuple(spec[1]) if len(spec) > 1 else ()
+            islist=False
+            kind=None
+            if isinstance(processor,six.string_types):
+                kind=processor
+                # List values for multiple processor are sent as shortcut[]
+                islist=processor=='multiple' and shortcut[-2:]=='[]'
+                method=getattr(self,'process_' + processor,None)
+                if method is None:
+                    raise ValueError('Unknown filter processor "%s" for "%s"' % (processor,shortcut))
+                processor=method
+            elif not callable(processor):
+                raise ValueError('Filter processor for "%s" is not callable' % shortcut)
+            # Check processor accepts given parameters. Signatures of builtins, classes and partials are not available
+            if inspect.isfunction(processor) or inspect.ismethod(processor):
+                try:
+                    inspect.getcallargs(processor,None,*parms)
+                except TypeError as e:
+                    raise ValueError('Invalid parameters for "%s" filter: %s' % (shortcut,e))
+            table[shortcut]=(shortcut[:-2] if islist else shortcut,processor,parms,islist,kind)
+        return table
 
     def process_simple(self, value, fieldname, valuetype=str, blank=False):
         """
@@ -37,28 +112,69 @@ class FilterProcessor(object):
             fieldname: valuetype(value)
         }
 
-    def process_range(self, value, fieldname, inclusive=True, blank=False):
+    def parse_range(self, value, valuetype='decimal'):
+        """
+        Parse a range value into typed lower and higher extremes
+
+        Ranges are given as lo..hi, lo.. or ..hi. Numeric ranges also accept legacy lo-hi format.
+        Missing extremes are returned as None.
+
+        :raises: ValueError if range value is not valid
         """
-        Return a filter for a numeric range
+        if valuetype not in RANGE_PARSERS:
+            raise ValueError('Unknown range type "%s"' % valuetype)
+        value=six.text_type(value).strip()
+        if '..' in value:
+            parts=value.split('..')
+        elif valuetype in ('int','decimal'):
+            parts=value.split('-')
+        else:
+            parts=[]
+        if len(parts)!=2:
+            raise ValueError('Invalid range "%s"' % value)
+        parser=RANGE_PARSERS[valuetype]
+        extremes=[]
+        for part in parts:
+            part=part.strip()
+            if part=='':
+                extremes.append(None)
+                continue
+            parsed=parser(part)
+            if parsed is None:
+                raise ValueError('Invalid %s value "%s"' % (valuetype,part))
+            extremes.append(parsed)
+        low,high=extremes
+        if low is None and high is None:
+            raise ValueError('Invalid range "%s"' % value)
+        if low is not None and high is not None and low > high:
+            raise ValueError('Invalid range "%s"' % value)
+        return low,high
+
+    def process_range(self, value, fieldname, inclusive=True, blank=False, valuetype='decimal'):
+        """
+        Return a filter for a typed range
+
+        Valuetype can be int, decimal, date or datetime. Higher extreme of inclusive int and date
+        ranges is resolved to a lower than filter on the next value.
+
+        :raises: ValueError if range value is not valid
         """
         # Check empty values
         if not blank and (value=='' or value==None):
             return {}
 
-        if inclusive:
-            gt='__gte'
-            lt='__lte'
-        else:
-            gt='__gt'
-            lt='__lt'
-        
         # Get lower and higher extremes
-        low,high=value.split('-')
+        low,high=self.parse_range(value,valuetype)
 
-        return {
-            fieldname + gt: low,
-            fieldname + lt: high,
-        }
+        filters={}
+        if low is not None:
+            filters[fieldname + ('__gte' if inclusive else '__gt')]=low
+        if high is not None:
+            if inclusive and valuetype in RANGE_STEPS:
+                filters[fieldname + '__lt']=high + RANGE_STEPS[valuetype]
+            else:
+                filters[fieldname + ('__lte' if inclusive else '__lt')]=high
+        return filters
 
     def process_multiple(self, value, fieldname, separator=',', blank=False):
         """
@@ -87,32 +203,154 @@ class FilterProcessor(object):
             return {}
         return filters
 
+    def process_parts(self,filterdata):
+        """
+        Process filter data using compiled filter specs keeping filters for each shortcut apart
+
+        filterdata: dict of shortcut-value items
+
+        Returns filters by shortcut name, clean filters and errors dictionaries
+        """
+        parts={}
+        cleanfilters={}
+        errors={}
+        for shortcut,value in filterdata.items():
+            if shortcut not in self.compiled:
+                continue
+            name,processor,parms,islist,kind=self.compiled[shortcut]
+            if islist:
+                value=filterdata.getlist(shortcut)
+            try:
+                parts[name]=processor(value,*parms)
+                cleanfilters[name]=value
+            except Exception as e:
+                errors[name]=six.text_type(e)
+        return parts,cleanfilters,errors
+
+    def process(self,filterdata):
+        """
+        Process filter data using compiled filter specs
+
+        filterdata: dict of shortcut-value items
+
+        Returns filters, clean filters and errors dictionaries. Errors dictionary contains an
+        error message for each filter that could not be processed
+        """
+        parts,cleanfilters,errors=self.process_parts(filterdata)
+        filters={}
+        for part in parts.values():
+            filters.update(part)
+        return filters,cleanfilters,errors
+
+    def normalize_value(self,kind,parms,value,part):
+        """
+        Returns a normalized hashable version of a clean filter value
+
+        Values are not stripped as processors filter using them as given
+        """
+        if kind=='multiple':
+            separator=parms[1] if len(parms) > 1 else ','
+            values=value if isinstance(value,list) else value.split(separator)
+            return tuple(sorted(set(six.text_type(item) for item in values)))
+        if kind=='range':
+            # Use resolved filters so equivalent ranges get the same value
+            return tuple(sorted((lookup,six.text_type(extreme)) for lookup,extreme in part.items()))
+        if isinstance(value,list):
+            return tuple(six.text_type(item) for item in value)
+        return six.text_type(value)
+
+    def get_signature(self,filterdata,parts=None,cleanfilters=None):
+        """
+        Returns a canonical hashable signature for filter data
+
+        Signature is independent of filters order and skips filters without effect, so
+        equivalent filter data get the same signature. Already processed parts and clean
+        filters can be given to avoid processing filter data again.
+        """
+        if parts is None or cleanfilters is None:
+            parts,cleanfilters,errors=self.process_parts(filterdata)
+        specs=dict((name,(kind,parms)) for name,processor,parms,islist,kind in self.compiled.values())
+        signature=[]
+        for name,value in cleanfilters.items():
+            if parts.get(name):
+                kind,parms=specs[name]
+                signature.append((name,self.normalize_value(kind,parms,value,parts[name])))
+        return tuple(sorted(signature))
+
+    def get_facets(self,queryset,filterdata,facets=None,cache_timeout=None,cache_prefix=''):
+        """
+        Returns value counts for facets using one aggregate query for each facet
+
+        Counts for each facet are computed applying all filters except the facet own filter.
+
+        queryset: base queryset
+        filterdata: dict of shortcut-value items
+        facets: list of simple or multiple filter shortcut names. All of them by default
+        cache_timeout: seconds to cache results for same model, filter signature and facets
+        cache_prefix: cached results identifier for filtered base querysets, like a category slug
+
+        Returns a dictionary with a list of (value, count) tuples ordered by count by facet
+
+        :raises: ValueError if any filter is not valid, instead of counting with wider filters
+        """
+        fields=dict((name,parms[0]) for name,processor,parms,islist,kind in self.compiled.values()
+            if kind in ('simple','multiple'))
+        if facets is None:
+            facets=sorted(fields)
+        parts,cleanfilters,errors=self.process_parts(filterdata)
+        self.check_errors(errors)
+        # Check cached results
+        if cache_timeout:
+            opts=queryset.model._meta
+            signature=repr((cache_prefix,self.get_signature(filterdata,parts,cleanfilters),list(facets)))
+            key=FACETS_CACHE_KEY % ('%s.%s' % (opts.app_label,opts.model_name),hashlib.md5(signature.encode('utf-8')).hexdigest())
+            result=cache.get(key)
+            if result is not None:
+                return result
+        result={}
+        for name in facets:
+            field=fields[name]
+            # Apply all filters but facet own filter
+            filters={}
+            for other,part in parts.items():
+                if other!=name:
+                    filters.update(part)
+            rows=queryset.filter(**filters).values(field).annotate(facet_count=Count('pk')).order_by('-facet_count')
+            result[name]=[(row[field],row['facet_count']) for row in rows]
+        if cache_timeout:
+            cache.set(key,result,cache_timeout)
+        return result
+
+    def get_query(self,filterdata):
+        """
+        Process filter data and return a Q object and an errors dictionary
+        
+        filterdata: dict of shortcut-value items
+        """
+        filters,cleanfilters,errors=self.process(filterdata)
+        return Q(**filters),errors
+
+    def check_errors(self,errors):
+        """
+        Check errors dictionary returned by filter processing
+
+        :raises: ValueError reporting all invalid filters if there are errors
+        """
+        if errors:
+            raise ValueError('Invalid filters: %s' % ', '.join('%s (%s)' % item for item in sorted(errors.items())))
+
     def get_filters(self,filterdata,return_clean=False):
         """
         Process filter data and return a filters dictionary
         
         filterdata: dict of shortcut-value items
+
+        :raises: ValueError if any filter is not valid, instead of returning wider filters
         """
-        # Process filter data using given specs
-        filters={}
-        cleanfilters={}
-        for shortcut,value in filterdata.items():            
-            if shortcut in self.filterspecs:
-                processor=self.filterspecs[shortcut][0]
-                parms=self.filterspecs[shortcut][1]
-                if isinstance(processor,str):
-                    if processor=='multiple' and '[]' == shortcut[-2:]:
-                        value=filterdata.getlist(shortcut)
-                        shortcut=shortcut[:-2]
-                    processor=getattr(self, 'process_' + processor)
-                try:
-                    filters.update(processor(value,*parms))
-                    cleanfilters[shortcut]=value
-                except:
-                    pass
+        # Process filter data using compiled specs
+        filters,cleanfilters,errors=self.process(filterdata)
+        self.check_errors(errors)
         # Return processed filters
         if return_clean:
             return filters,cleanfilters
         return filters
-
-    
\ No newline at end of file
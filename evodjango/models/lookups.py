@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango model lookups
+===============================================
+
+.. module:: evodjango.models.lookups
+    :platform: Django
+    :synopsis: EVODjango model lookups and transforms module
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Python imports
+import hashlib
+
+# Django imports
+from django.db import models, migrations
+from django.db.models.expressions import Expression, F
+from django.db.models.lookups import Transform
+
+def get_json_key_sql(column,keys,vendor):
+    """
+    Returns SQL expression extracting the text value for a key path from a JSON text column
+
+    Key path is written as a literal so expression indexes can be used by queries.
+    Values are always returned as text, so numbers are compared as text on all databases.
+    Supported databases are PostgreSQL, SQLite and MySQL.
+    """
+    if vendor=='postgresql':
+        path='{%s}' % ','.join('"%s"' % key.replace('\\','\\\\').replace('"','\\"') for key in keys)
+        return "(NULLIF(%s, '')::json #>> '%s')" % (column,path.replace("'","''"))
+    path='$%s' % ''.join('."%s"' % key.replace('\\','\\\\').replace('"','\\"') for key in keys)
+    if vendor=='sqlite':
+        # json_extract returns typed values for numbers and booleans
+        return "CAST(json_extract(%s, '%s') AS TEXT)" % (column,path.replace("'","''"))
+    if vendor=='mysql':
+        return "CAST(JSON_UNQUOTE(JSON_EXTRACT(%s, '%s')) AS CHAR)" % (column,path.replace("'","''"))
+    raise NotImplementedError('JSON key lookups are not supported for %s databases' % vendor)
+
+class JSONKeyField(models.TextField):
+    """
+    Output field for JSON key transforms allowing nested key transforms
+    """
+    def get_transform(self,name):
+        """
+        Returns a transform for a nested key
+        """
+        transform=super(JSONKeyField,self).get_transform(name)
+        if transform:
+            return transform
+        return KeyTransformFactory(name)
+
+class KeyTransform(Transform):
+    """
+    Transform extracting a key value from JSON encoded data
+
+    Values are compared as text. Use num and bool transforms to compare numbers and booleans
+    like field__key__num__gte=10 or field__key__bool=True. Not available for compressed encoded fields.
+    """
+    output_field=JSONKeyField()
+
+    def __init__(self,key_name,*args,**kwargs):
+        """
+        Initialization method
+        """
+        super(KeyTransform,self).__init__(*args,**kwargs)
+        self.key_name=key_name
+
+    def as_sql(self,compiler,connection):
+        """
+        Returns SQL for this transform joining nested key transforms in a single key path
+        """
+        keys=[self.key_name]
+        lhs=self.lhs
+        while isinstance(lhs,KeyTransform):
+            keys.insert(0,lhs.key_name)
+            lhs=lhs.lhs
+        sql,params=compiler.compile(lhs)
+        # Escape percent signs in key path literal for query parameters interpolation
+        return get_json_key_sql(sql,[key.replace('%','%%') for key in keys],connection.vendor),params
+
+class KeyTransformFactory(object):
+    """
+    Key transform factory
+    """
+    def __init__(self,key_name):
+        """
+        Initialization method
+        """
+        self.key_name=key_name
+
+    def __call__(self,*args,**kwargs):
+        """
+        Returns a key transform
+        """
+        return KeyTransform(self.key_name,*args,**kwargs)
+
+class NumericKeyTransform(Transform):
+    """
+    Transform casting a JSON key value to a number
+
+    Keys must contain numbers or numeric strings. Non numeric values raise errors in PostgreSQL.
+    """
+    lookup_name='num'
+    output_field=models.FloatField()
+
+    def as_sql(self,compiler,connection):
+        """
+        Returns SQL casting key value to a number
+        """
+        sql,params=compiler.compile(self.lhs)
+        if connection.vendor=='postgresql':
+            return 'CAST(%s AS double precision)' % sql,params
+        if connection.vendor=='mysql':
+            return 'CAST(%s AS DECIMAL(65,30))' % sql,params
+        return 'CAST(%s AS REAL)' % sql,params
+
+class BooleanKeyTransform(Transform):
+    """
+    Transform casting a JSON key value to a boolean
+
+    SQLite stores JSON true values as 1, so number 1 is also considered true.
+    """
+    lookup_name='bool'
+    output_field=models.BooleanField()
+
+    def as_sql(self,compiler,connection):
+        """
+        Returns SQL checking if key value is true
+        """
+        sql,params=compiler.compile(self.lhs)
+        return "(%s IN ('true', '1'))" % sql,params
+
+JSONKeyField.register_lookup(NumericKeyTransform)
+JSONKeyField.register_lookup(BooleanKeyTransform)
+
+class JSONKey(Expression):
+    """
+    Expression extracting a key path value from a JSON encoded data field as text
+
+    Can be used in annotations to load a single value without loading the whole field:
+
+        Model.objects.annotate(title_es=JSONKey('title','es'))
+    """
+    def __init__(self,fieldname,*keys):
+        """
+        Initialization method
+        """
+        super(JSONKey,self).__init__(output_field=models.TextField())
+        self.source=F(fieldname)
+        self.keys=keys
+
+    def get_source_expressions(self):
+        """
+        Returns source field expression
+        """
+        return [self.source]
+
+    def set_source_expressions(self,exprs):
+        """
+        Sets source field expression
+        """
+        self.source,=exprs
+
+    def as_sql(self,compiler,connection):
+        """
+        Returns SQL for key path extraction
+        """
+        sql,params=compiler.compile(self.source)
+        return get_json_key_sql(sql,[key.replace('%','%%') for key in self.keys],connection.vendor),params
+
+def json_key_index(table,column,*keys):
+    """
+    Returns a migration operation creating an expression index on a JSON encoded data key path
+
+    Index expression matches the one used by key lookups like field__key or field__key__subkey.
+    Supported databases are PostgreSQL and SQLite:
+
+        operations = [
+            json_key_index('app_model','title','es'),
+        ]
+    """
+    name='%s_%s' % (table[:32],hashlib.md5(('%s.%s' % (column,'.'.join(keys))).encode('utf-8')).hexdigest()[:12])
+
+    def create_index(apps,schema_editor):
+        expression=get_json_key_sql(schema_editor.quote_name(column),keys,schema_editor.connection.vendor)
+        schema_editor.execute('CREATE INDEX %s ON %s (%s)' % (
+            schema_editor.quote_name(name),schema_editor.quote_name(table),expression),params=None)
+
+    def drop_index(apps,schema_editor):
+        schema_editor.execute('DROP INDEX %s' % schema_editor.quote_name(name),params=None)
+
+    return migrations.RunPython(create_index,drop_index)
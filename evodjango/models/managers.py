@@ -10,11 +10,143 @@ EVODjango model managers module
 """
 
 # Python imports
+import datetime, hashlib, uuid, threading, math
+from collections import Counter
 
 # Django imports
-from django.db import models
+from django.apps import apps
+from django.db import models, transaction
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
 from django.utils.translation import ugettext_lazy as _
-from django.utils import timezone
+from django.utils.encoding import force_text
+from django.utils import six, timezone, translation
+
+# EVODjango imports
+from evodjango.geo import EARTH_RADIUS, geohash_encode, geohash_neighbours, geohash_cell_size, order_by_distance
+from evodjango.i18n import get_i18n_column
+from evodjango.models.lookups import JSONKey
+
+# Cache key for model cached data versions
+MODEL_CACHE_VERSION_KEY='evodjango.version.%s.%s.%s'
+
+# Cache key for cached publishables
+PUBLISHABLE_CACHE_KEY='evodjango.publishable.pks.%s.%s.%s.%s'
+
+# Default and maximum expiration time for cached publishables
+PUBLISHABLE_CACHE_TIMEOUT=getattr(settings,'PUBLISHABLE_CACHE_TIMEOUT',300)
+
+# Cached publishables hit and miss counters for this process
+publishable_cache_stats=Counter()
+
+# Sentinel dates used instead of empty publication dates
+PUBLISHABLE_MIN_DATE=datetime.datetime(1900,1,1)
+PUBLISHABLE_MAX_DATE=datetime.datetime(9999,12,31)
+
+def get_publishable_sentinels():
+    """
+    Returns minimum and maximum dates used instead of empty publication dates
+    """
+    if settings.USE_TZ:
+        return PUBLISHABLE_MIN_DATE.replace(tzinfo=timezone.utc),PUBLISHABLE_MAX_DATE.replace(tzinfo=timezone.utc)
+    return PUBLISHABLE_MIN_DATE,PUBLISHABLE_MAX_DATE
+
+def fill_publishable_sentinels(model):
+    """
+    Replaces empty publication dates with sentinel dates for existing items of a model
+
+    Can be used from a RunPython data migration with the historical model:
+
+        def forwards(apps, schema_editor):
+            fill_publishable_sentinels(apps.get_model('app_label', 'ModelName'))
+
+    Returns the number of updated start and end dates
+    """
+    mindate,maxdate=get_publishable_sentinels()
+    qs=model._default_manager.all()
+    started=qs.filter(publishable_start=None).update(publishable_start=mindate)
+    ended=qs.filter(publishable_end=None).update(publishable_end=maxdate)
+    return started,ended
+
+def get_publishable_watermarks(model):
+    """
+    Returns a queryset with the publication state watermark of a model
+
+    Watermarks are stored in database so they are shared by all processes. Returns None if
+    evodjango application is not installed, so publishable status updates check all items.
+    """
+    try:
+        watermarkmodel=apps.get_model('evodjango','PublishableWatermark')
+    except LookupError:
+        return None
+    opts=model._meta.concrete_model._meta
+    return watermarkmodel._default_manager.filter(app_label=opts.app_label,model_name=opts.model_name)
+
+def lower_publishable_watermark(model,transition):
+    """
+    Sets next transition of publication state watermark of a model to given date if it is earlier
+    """
+    watermarks=get_publishable_watermarks(model)
+    if transition is not None and watermarks is not None:
+        watermarks.filter(models.Q(next_transition=None) | models.Q(next_transition__gt=transition)) \
+            .update(next_transition=transition)
+
+def invalidate_publishable_watermark(model):
+    """
+    Removes publication state watermark for a model so next update checks all rows
+    """
+    watermarks=get_publishable_watermarks(model)
+    if watermarks is not None:
+        watermarks.delete()
+
+def get_model_cache_version(model,namespace,renew=False):
+    """
+    Returns current version for cached data of a model in a namespace, generating a new one if needed
+
+    Renewing the version invalidates all cached data for the model in that namespace
+    """
+    key=MODEL_CACHE_VERSION_KEY % (namespace,model._meta.app_label,model._meta.model_name)
+    version=None if renew else cache.get(key)
+    if version is None:
+        version=uuid.uuid4().hex
+        cache.set(key,version,None)
+    return version
+
+def get_publishable_cache_version(model,renew=False):
+    """
+    Returns current version for cached publishables of a model, generating a new one if needed
+    """
+    return get_model_cache_version(model,'publishable',renew)
+
+def invalidate_publishables_cache(model):
+    """
+    Invalidates all cached publishables for a model
+    """
+    get_publishable_cache_version(model,renew=True)
+
+def get_filter_signature_value(value):
+    """
+    Returns a hashable representation of a filter value for cache key signatures
+
+    Model instances are represented by their model and primary key, and iterables by tuples of
+    their represented items, sorted for sets.
+
+    :raises: ValueError for queryset values, that should be given as primary key lists
+    """
+    if isinstance(value,models.QuerySet):
+        raise ValueError('Queryset filter values can not be used in cache signatures, use primary key lists')
+    if isinstance(value,models.Model):
+        opts=value._meta.concrete_model._meta
+        return (opts.app_label,opts.model_name,value.pk)
+    if isinstance(value,dict):
+        return tuple(sorted((key,get_filter_signature_value(item)) for key,item in value.items()))
+    if isinstance(value,(set,frozenset)):
+        return tuple(sorted((get_filter_signature_value(item) for item in value),key=repr))
+    if isinstance(value,(list,tuple)):
+        return tuple(get_filter_signature_value(item) for item in value)
+    return value
 
 class PublishableModelManager(models.Manager):
     """
@@ -24,10 +156,634 @@ class PublishableModelManager(models.Manager):
         """
         Get all posts for a given tag and filters
         """
-        # Filter by active publishables
+        # Filter by active publishables in publishable start and end date
+        qs=self.get_queryset().filter(self.get_publishable_q(timezone.now()))
+        return qs.filter(**filters)
+
+    def get_cached_publishables(self,**filters):
+        """
+        Get publishables for given filters using cached primary keys
+
+        Matching primary keys are cached per filter signature until the nearest publication start
+        or end date, so cached results never include expired or miss newly published items. Cache
+        is invalidated when any item of the model is saved or deleted.
+
+        :raises: ValueError if a filter value is a queryset
+        """
+        opts=self.model._meta
+        # Generate a key for given filters signature
+        signature=repr(sorted((name,get_filter_signature_value(value)) for name,value in filters.items()))
+        key=PUBLISHABLE_CACHE_KEY % (opts.app_label,opts.model_name,get_publishable_cache_version(self.model),
+            hashlib.md5(signature.encode('utf-8')).hexdigest())
+        pks=cache.get(key)
+        if pks is None:
+            publishable_cache_stats[(opts.app_label,opts.model_name,'misses')]+=1
+            timestamp=timezone.now()
+            pks=list(self.get_publishables(**filters).values_list('pk',flat=True))
+            # Expire cached data at next publication boundary
+            timeout=PUBLISHABLE_CACHE_TIMEOUT
+            transition=self.get_next_transition(timestamp)
+            if transition is not None:
+                timeout=min(timeout,int((transition - timestamp).total_seconds()))
+            if timeout > 0:
+                cache.set(key,pks,timeout)
+        else:
+            publishable_cache_stats[(opts.app_label,opts.model_name,'hits')]+=1
+        return self.get_queryset().filter(pk__in=pks)
+
+    def get_cache_stats(self):
+        """
+        Returns cached publishables hit and miss counters for this model in current process
+        """
+        opts=self.model._meta
+        return {
+            'hits': publishable_cache_stats[(opts.app_label,opts.model_name,'hits')],
+            'misses': publishable_cache_stats[(opts.app_label,opts.model_name,'misses')],
+        }
+
+    def get_publishable_q(self,timestamp):
+        """
+        Returns a Q object matching items that are publishable at given timestamp
+
+        Models storing sentinel dates instead of empty publication dates get a single range
+        predicate usable by (publishable_active,publishable_start,publishable_end) index
+        """
+        if getattr(self.model,'publishable_sentinel_dates',False):
+            return models.Q(publishable_active=True,publishable_start__lte=timestamp,publishable_end__gte=timestamp)
+        return models.Q(publishable_active=True) & \
+            (models.Q(publishable_start=None) | models.Q(publishable_start__lte=timestamp)) & \
+            (models.Q(publishable_end=None) | models.Q(publishable_end__gte=timestamp))
+
+    def get_next_transition(self,timestamp=None):
+        """
+        Returns the nearest publication start or end date after given timestamp
+        """
+        if timestamp is None:
+            timestamp=timezone.now()
         qs=self.get_queryset().filter(publishable_active=True)
-        # Filter by publishable start and end date
-        timestamp=timezone.now()
-        qs=qs.filter(models.Q(publishable_start=None) | models.Q (publishable_start__lte=timestamp))
-        qs=qs.filter(models.Q(publishable_end=None) | models.Q (publishable_end__gte=timestamp))
-        return qs.filter(**filters)
\ No newline at end of file
+        start=qs.filter(publishable_start__gt=timestamp).aggregate(
+            transition=models.Min('publishable_start'))['transition']
+        end=qs.filter(publishable_end__gte=timestamp).aggregate(
+            transition=models.Min('publishable_end'))['transition']
+        transitions=[date for date in (start,end) if date is not None]
+        if transitions:
+            return min(transitions)
+        return None
+
+    def update_publishables(self,full=False,timestamp=None):
+        """
+        Update cached publishable status for items whose publication dates have been crossed
+
+        Status is updated using set based updates. A watermark with last run and next transition
+        dates is stored in database so updates are skipped until next transition is reached. Saved
+        items lower the next transition to their own nearest publication date. Use full parameter
+        to check all items ignoring the watermark. All items are checked on every run if evodjango
+        application is not installed.
+
+        Returns a tuple with the number of published and unpublished items
+        """
+        if timestamp is None:
+            timestamp=timezone.now()
+        watermarks=get_publishable_watermarks(self.model)
+        qs=self.get_queryset()
+        # Lock watermark so items saved during the update lower it after it is stored
+        with transaction.atomic():
+            watermark=None
+            if watermarks is not None:
+                watermark=watermarks.select_for_update().first()
+            # Check watermark to narrow items to the ones crossing a boundary since last run
+            if watermark is not None and not full:
+                if watermark.next_transition is None or timestamp < watermark.next_transition:
+                    return 0,0
+                qs=qs.filter(
+                    models.Q(publishable_start__gt=watermark.last_run,publishable_start__lte=timestamp) |
+                    models.Q(publishable_end__gte=watermark.last_run,publishable_end__lt=timestamp))
+            # Update status only on items where cached value differs
+            state=self.get_publishable_q(timestamp)
+            published=qs.filter(state).filter(publishable_publishable=False).update(publishable_publishable=True)
+            unpublished=qs.exclude(state).filter(publishable_publishable=True).update(publishable_publishable=False)
+            if watermarks is None:
+                return published,unpublished
+            # Store new watermark
+            next_transition=self.get_next_transition(timestamp)
+            if not watermarks.update(last_run=timestamp,next_transition=next_transition):
+                opts=self.model._meta.concrete_model._meta
+                watermarks.model._default_manager.create(app_label=opts.app_label,model_name=opts.model_name,
+                    last_run=timestamp,next_transition=next_transition)
+        return published,unpublished
+
+# Request scoped identity map for translation lookups
+_translation_identity_map=threading.local()
+
+def enable_translation_identity_map():
+    """
+    Enables translation identity map for current thread
+    """
+    _translation_identity_map.data={}
+
+def clear_translation_identity_map():
+    """
+    Disables translation identity map for current thread discarding stored items
+    """
+    _translation_identity_map.data=None
+
+def get_translation_identity_map():
+    """
+    Returns translation identity map for current thread or None if it is not enabled
+
+    Map stores (model,root_pk,lang) translation lookups and (model,parent_pk) parent dereferences
+    """
+    return getattr(_translation_identity_map,'data',None)
+
+def get_translations(model,objs,lang):
+    """
+    Returns a dictionary with translations for given language indexed by object primary key
+
+    Translations and needed root translations for all objects are retrieved in one query.
+    Objects without translation for given language get their root translation.
+    """
+    # Use translations already in identity map
+    idmap=get_translation_identity_map()
+    translations={}
+    pending=[]
+    for obj in objs:
+        key=(model,obj.translatable_parent_id or obj.pk,lang)
+        if idmap is not None and key in idmap:
+            translations[obj.pk]=idmap[key]
+        else:
+            pending.append(obj)
+    if not pending:
+        return translations
+    # Get root translation identifiers for all objects
+    loaded=dict((obj.pk,obj) for obj in pending)
+    rootids=set(obj.translatable_parent_id or obj.pk for obj in pending)
+    missing=rootids.difference(loaded)
+    query=models.Q(translatable_parent__in=rootids,translatable_lang=lang)
+    if missing:
+        query|=models.Q(pk__in=missing)
+    # Retrieve translations and not loaded root translations
+    found={}
+    for item in model._default_manager.filter(query):
+        if item.translatable_parent_id in rootids and item.translatable_lang==lang:
+            found[item.translatable_parent_id]=item
+        if item.pk in missing:
+            loaded[item.pk]=item
+            if idmap is not None:
+                idmap[(model,item.pk)]=item
+    # Use root translation as fallback and keep loaded parents for get_root_translation
+    cachename=model._meta.get_field('translatable_parent').get_cache_name()
+    for obj in pending:
+        rootid=obj.translatable_parent_id or obj.pk
+        translations[obj.pk]=found.get(rootid,loaded.get(rootid,obj))
+        if obj.translatable_parent_id and rootid in loaded and not hasattr(obj,cachename):
+            setattr(obj,cachename,loaded[rootid])
+        if idmap is not None:
+            idmap[(model,rootid,lang)]=translations[obj.pk]
+    return translations
+
+class TranslatableQuerySet(models.QuerySet):
+    """
+    Translatable model queryset
+    """
+    def __init__(self,*args,**kwargs):
+        """
+        Class initialization method
+        """
+        super(TranslatableQuerySet,self).__init__(*args,**kwargs)
+        self._translation_lang=None
+
+    def _clone(self,*args,**kwargs):
+        """
+        Clone method overload to keep translation language
+        """
+        clone=super(TranslatableQuerySet,self)._clone(*args,**kwargs)
+        clone._translation_lang=self._translation_lang
+        return clone
+
+    def _fetch_all(self):
+        """
+        Fetch method overload for attaching translations to retrieved objects
+        """
+        fetch=self._result_cache is None
+        super(TranslatableQuerySet,self)._fetch_all()
+        if fetch and self._translation_lang:
+            objs=[obj for obj in self._result_cache if isinstance(obj,self.model)]
+            if objs:
+                translations=get_translations(self.model,objs,self._translation_lang)
+                for obj in objs:
+                    obj.set_translation(translations[obj.pk],self._translation_lang)
+
+    def with_translations(self,lang=None):
+        """
+        Attach translation for given language to all retrieved objects using a single query
+
+        Translation is available in translation attribute and through get_translation method
+        """
+        if not lang:
+            lang=translation.get_language()
+        clone=self._clone()
+        clone._translation_lang=lang
+        return clone
+
+class TranslatableModelManager(models.Manager):
+    """
+    Translatable model manager
+    """
+    def get_queryset(self):
+        """
+        Returns a translatable queryset
+        """
+        return TranslatableQuerySet(self.model,using=self._db)
+
+    def with_translations(self,lang=None):
+        """
+        Get all items with attached translation for given language
+        """
+        return self.get_queryset().with_translations(lang)
+
+class UndeletableQuerySet(models.QuerySet):
+    """
+    Undeletable model queryset
+    """
+    def delete(self):
+        """
+        Mark all items as deleted using a single update
+        """
+        return self.update(undeletable_deleted=True,undeletable_deleted_date=timezone.now())
+    delete.alters_data=True
+    delete.queryset_only=True
+
+    def undelete(self):
+        """
+        Restore all deleted items using a single update
+        """
+        return self.update(undeletable_deleted=False,undeletable_deleted_date=None)
+    undelete.alters_data=True
+
+    def hard_delete(self):
+        """
+        Delete all items from database
+        """
+        return super(UndeletableQuerySet,self).delete()
+    hard_delete.alters_data=True
+    hard_delete.queryset_only=True
+
+class UndeletableModelManager(models.Manager):
+    """
+    Undeletable model manager excluding deleted items
+    """
+    def get_queryset(self):
+        """
+        Returns an undeletable queryset without deleted items
+        """
+        return UndeletableQuerySet(self.model,using=self._db).filter(undeletable_deleted=False)
+
+class UndeletableModelAllManager(models.Manager):
+    """
+    Undeletable model manager including deleted items
+    """
+    def get_queryset(self):
+        """
+        Returns an undeletable queryset
+        """
+        return UndeletableQuerySet(self.model,using=self._db)
+
+def get_content_objects(objs,select_related=None,only=None):
+    """
+    Attach related content objects to given generic model objects
+
+    Objects are grouped by content type and each related model is retrieved using one query.
+    Content types are got from content types cache.
+
+    select_related and only are dictionaries with model classes or app_label.modelname labels
+    as keys and lists of fields to be used for querying each related model as values
+    """
+    # Group object identifiers by content type
+    groups={}
+    for obj in objs:
+        if obj.content_type_id is not None and obj.object_id is not None:
+            groups.setdefault(obj.content_type_id,set()).add(obj.object_id)
+    # Retrieve objects for each content type
+    related={}
+    pkfields={}
+    for ctid,ids in groups.items():
+        model=ContentType.objects.get_for_id(ctid).model_class()
+        if model is None:
+            continue
+        pkfields[ctid]=model._meta.pk
+        label='%s.%s' % (model._meta.app_label,model._meta.model_name)
+        qs=model._base_manager.all()
+        for method,option in (('select_related',select_related),('only',only)):
+            if option:
+                fields=option.get(model,option.get(label))
+                if fields:
+                    qs=getattr(qs,method)(*fields)
+        for pk,item in qs.in_bulk(ids).items():
+            related[(ctid,pk)]=item
+    # Attach objects to generic relation cache
+    for obj in objs:
+        item=None
+        if obj.content_type_id in pkfields and obj.object_id is not None:
+            # String object identifiers are converted to related model primary key type
+            pk=pkfields[obj.content_type_id].to_python(obj.object_id)
+            item=related.get((obj.content_type_id,pk))
+        setattr(obj,obj.__class__.content_object.cache_attr,item)
+    return objs
+
+class GenericQuerySet(models.QuerySet):
+    """
+    Generic relation model queryset
+    """
+    def __init__(self,*args,**kwargs):
+        """
+        Class initialization method
+        """
+        super(GenericQuerySet,self).__init__(*args,**kwargs)
+        self._content_objects_options=None
+
+    def _clone(self,*args,**kwargs):
+        """
+        Clone method overload to keep content objects prefetch options
+        """
+        clone=super(GenericQuerySet,self)._clone(*args,**kwargs)
+        clone._content_objects_options=self._content_objects_options
+        return clone
+
+    def _fetch_all(self):
+        """
+        Fetch method overload for attaching content objects to retrieved objects
+        """
+        fetch=self._result_cache is None
+        super(GenericQuerySet,self)._fetch_all()
+        if fetch and self._content_objects_options is not None:
+            objs=[obj for obj in self._result_cache if isinstance(obj,self.model)]
+            if objs:
+                get_content_objects(objs,**self._content_objects_options)
+
+    def for_objects(self,objs):
+        """
+        Filter items related to any of given objects using a single query
+        """
+        # Group object identifiers by content type
+        groups={}
+        for obj in objs:
+            ctid=ContentType.objects.get_for_model(obj).pk
+            groups.setdefault(ctid,set()).add(obj.pk)
+        if not groups:
+            return self.none()
+        query=models.Q()
+        for ctid,ids in groups.items():
+            query|=models.Q(content_type=ctid,object_id__in=ids)
+        return self.filter(query)
+
+    def get_for_objects(self,objs):
+        """
+        Returns a dictionary with the list of items related to each one of given objects
+
+        All items are retrieved using a single query
+        """
+        objs=list(objs)
+        keys=dict(((ContentType.objects.get_for_model(obj).pk,force_text(obj.pk)),obj) for obj in objs)
+        result=dict((obj,[]) for obj in objs)
+        for item in self.for_objects(objs):
+            obj=keys.get((item.content_type_id,force_text(item.object_id)))
+            if obj is not None:
+                result[obj].append(item)
+        return result
+
+    def prefetch_content_objects(self,select_related=None,only=None):
+        """
+        Retrieve content objects for all items using one query for each content type
+
+        See get_content_objects for select_related and only parameters format
+        """
+        clone=self._clone()
+        clone._content_objects_options={
+            'select_related': select_related,
+            'only': only,
+        }
+        return clone
+
+class GenericModelManager(models.Manager):
+    """
+    Generic relation model manager
+    """
+    def get_queryset(self):
+        """
+        Returns a generic relation queryset
+        """
+        return GenericQuerySet(self.model,using=self._db)
+
+    def prefetch_content_objects(self,select_related=None,only=None):
+        """
+        Get all items with attached content objects
+        """
+        return self.get_queryset().prefetch_content_objects(select_related,only)
+
+    def for_objects(self,objs):
+        """
+        Get all items related to any of given objects
+        """
+        return self.get_queryset().for_objects(objs)
+
+    def get_for_objects(self,objs):
+        """
+        Get items related to each one of given objects
+        """
+        return self.get_queryset().get_for_objects(objs)
+
+class LocationQuerySet(models.QuerySet):
+    """
+    Queryset for models with indexed location fields
+    """
+    def within_bbox(self,south,west,north,east,field='location'):
+        """
+        Filter items located inside a bounding box
+
+        Bounding boxes crossing the antimeridian are specified with west greater than east
+        """
+        query=models.Q(**{'%s_lat__gte' % field: south, '%s_lat__lte' % field: north})
+        if west <= east:
+            query&=models.Q(**{'%s_lon__gte' % field: west, '%s_lon__lte' % field: east})
+        else:
+            query&=models.Q(**{'%s_lon__gte' % field: west}) | models.Q(**{'%s_lon__lte' % field: east})
+        return self.filter(query)
+
+    def with_distances(self,lat,lon,field='location',k=None):
+        """
+        Returns a list of items ordered by distance to given point, limited to the k nearest ones
+
+        Distances are computed from retrieved coordinates and only returned items are retrieved
+        as model objects. Distance in kilometers is set in distance attribute of each item
+        """
+        return order_by_distance(self,lat,lon,k=k,field=field)
+
+    def nearest(self,lat,lon,k=10,field='location',precision=6):
+        """
+        Returns a list with the k nearest items to given point ordered by distance
+
+        Candidates are got from geohash cells surrounding the point, starting with given precision
+        and reducing it until k items are found inside the radius covered by those cells.
+        Distance in kilometers is set in distance attribute of each item
+        """
+        if k < 1:
+            return []
+        kmdegree=math.radians(EARTH_RADIUS)
+        for cellprecision in range(precision,0,-1):
+            cells=geohash_neighbours(geohash_encode(lat,lon,cellprecision))
+            if len(cells) < 9:
+                # Cells near the poles do not cover any radius
+                continue
+            query=models.Q()
+            for cell in cells:
+                query|=models.Q(**{'%s_geohash__gte' % field: cell, '%s_geohash__lt' % field: cell + '{'})
+            # Radius covered by cells surrounding the point cell
+            height,width=geohash_cell_size(cellprecision)
+            radius=min(height,width * math.cos(math.radians(min(90.0,abs(lat) + height)))) * kmdegree
+            items=self.filter(query).with_distances(lat,lon,field,k)
+            # Items are ordered by distance, so all of them are inside the radius if the last one is
+            if len(items) >= k and items[k - 1].distance <= radius:
+                return items
+        # Use all located items when there are not enough items near the point
+        return self.exclude(**{'%s_lat' % field: None}).with_distances(lat,lon,field,k)
+
+class LocationModelManager(models.Manager):
+    """
+    Manager for models with indexed location fields
+    """
+    def get_queryset(self):
+        """
+        Returns a location queryset
+        """
+        return LocationQuerySet(self.model,using=self._db)
+
+    def within_bbox(self,south,west,north,east,field='location'):
+        """
+        Get all items located inside a bounding box
+        """
+        return self.get_queryset().within_bbox(south,west,north,east,field)
+
+    def with_distances(self,lat,lon,field='location',k=None):
+        """
+        Get all items ordered by distance to given point, limited to the k nearest ones
+        """
+        return self.get_queryset().with_distances(lat,lon,field,k)
+
+    def nearest(self,lat,lon,k=10,field='location',precision=6):
+        """
+        Get the k nearest items to given point
+        """
+        return self.get_queryset().nearest(lat,lon,k,field,precision)
+
+class I18NQuerySet(models.QuerySet):
+    """
+    Queryset for models with indexed I18N fields
+
+    Field names given to localized methods are replaced by indexed column for active language
+    """
+    def get_i18n_lookup(self,lookup):
+        """
+        Returns lookup using indexed column for active language if it refers to an indexed I18N field
+        """
+        prefix='-' if lookup.startswith('-') else ''
+        parts=lookup.lstrip('-').split('__',1)
+        try:
+            field=self.model._meta.get_field(parts[0])
+        except FieldDoesNotExist:
+            return lookup
+        if not getattr(field,'i18n_field',False) or not field.indexed:
+            return lookup
+        parts[0]=get_i18n_column(parts[0])
+        return prefix + '__'.join(parts)
+
+    def order_by_localized(self,*fieldnames):
+        """
+        Order items by active language values of indexed I18N fields
+        """
+        return self.order_by(*[self.get_i18n_lookup(fieldname) for fieldname in fieldnames])
+
+    def filter_localized(self,**kwargs):
+        """
+        Filter items by active language values of indexed I18N fields
+        """
+        return self.filter(**dict((self.get_i18n_lookup(lookup),value) for lookup,value in kwargs.items()))
+
+    def exclude_localized(self,**kwargs):
+        """
+        Exclude items by active language values of indexed I18N fields
+        """
+        return self.exclude(**dict((self.get_i18n_lookup(lookup),value) for lookup,value in kwargs.items()))
+
+    def defer_localized(self,*fieldnames):
+        """
+        Defer loading of indexed I18N fields loading only indexed column for active language
+
+        Localized accessors use the indexed column when its value is not truncated
+        """
+        active=[self.get_i18n_lookup(fieldname) for fieldname in fieldnames]
+        deferred=[]
+        for fieldname in fieldnames:
+            deferred.append(fieldname)
+            for lang,langname in settings.LANGUAGES:
+                column=get_i18n_column(fieldname,lang)
+                if column not in active:
+                    deferred.append(column)
+        return self.defer(*deferred)
+
+    def localized(self,lang=None,*fieldnames):
+        """
+        Load only given languages values of I18N fields using database JSON extraction
+
+        Lang can be a language code or a list of language codes. Active language is used by default.
+        Fields are deferred and their values for loaded languages are available through localized_FIELD
+        and localized_FIELD_LANG accessors. Accessors for other languages load the whole field with
+        one query for each item. All I18N fields are used if no field names are given. Not available
+        for compressed or binary stored fields.
+        """
+        if not lang:
+            lang=translation.get_language() or settings.LANGUAGE_CODE
+        langs=[lang] if isinstance(lang,six.string_types) else lang
+        if not fieldnames:
+            fieldnames=[field.name for field in self.model._meta.concrete_fields if getattr(field,'i18n_field',False)]
+        annotations={}
+        for fieldname in fieldnames:
+            field=self.model._meta.get_field(fieldname)
+            if field.compression or field.storage!='text':
+                raise ValueError('Localized loading is not available for %s field' % fieldname)
+            for code in langs:
+                annotations['%s_localized' % get_i18n_column(fieldname,code)]=JSONKey(fieldname,code)
+        return self.defer(*fieldnames).annotate(**annotations)
+
+class I18NModelManager(models.Manager):
+    """
+    Manager for models with indexed I18N fields
+    """
+    def get_queryset(self):
+        """
+        Returns an I18N queryset
+        """
+        return I18NQuerySet(self.model,using=self._db)
+
+    def order_by_localized(self,*fieldnames):
+        """
+        Get all items ordered by active language values of indexed I18N fields
+        """
+        return self.get_queryset().order_by_localized(*fieldnames)
+
+    def filter_localized(self,**kwargs):
+        """
+        Get items filtered by active language values of indexed I18N fields
+        """
+        return self.get_queryset().filter_localized(**kwargs)
+
+    def defer_localized(self,*fieldnames):
+        """
+        Get all items loading only indexed column for active language of indexed I18N fields
+        """
+        return self.get_queryset().defer_localized(*fieldnames)
+
+    def localized(self,lang=None,*fieldnames):
+        """
+        Get all items loading only given languages values of I18N fields
+        """
+        return self.get_queryset().localized(lang,*fieldnames)
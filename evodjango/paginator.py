@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango paginator module
+===============================================
+
+.. module:: evodjango.paginator
+    :platform: Django
+    :synopsis: EVODjango keyset paginator module
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Django imports
+from django.core import signing
+from django.db import connections, models, DatabaseError
+
+class KeysetPage(object):
+    """
+    Keyset paginator page
+
+    Provides a Django Page like interface. Pages have no number, so use next_cursor and
+    previous_cursor values to link next and previous pages.
+    """
+    def __init__(self,object_list,paginator,next_cursor=None,previous_cursor=None):
+        """
+        Class initialization method
+        """
+        self.object_list=object_list
+        self.paginator=paginator
+        self.next_cursor=next_cursor
+        self.previous_cursor=previous_cursor
+
+    def __repr__(self):
+        return '<Keyset page with %d items>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self,index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        """
+        Returns if there is a next page
+        """
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        """
+        Returns if there is a previous page
+        """
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        """
+        Returns if there are more pages
+        """
+        return self.has_next() or self.has_previous()
+
+class KeysetPaginator(object):
+    """
+    Keyset paginator
+
+    Paginates a queryset seeking from last item of previous page using ordering field and
+    primary key instead of counting items and using offsets, so page retrieval time does not
+    depend on page depth. Pages are selected using signed cursors.
+    """
+    def __init__(self,queryset,per_page=25,order_by='-timestamped_created',salt='evodjango.paginator'):
+        """
+        Class initialization method
+
+        :param queryset: Queryset to be paginated
+        :type queryset: QuerySet
+        :param per_page: Items per page
+        :type per_page: int
+        :param order_by: Field used for ordering prefixed with - for descending ordering
+        :type order_by: String
+        :param salt: Salt used for signing cursors
+        :type salt: String
+        """
+        self.queryset=queryset
+        self.per_page=int(per_page)
+        self.descending=order_by.startswith('-')
+        self.field=queryset.model._meta.get_field(order_by.lstrip('-'))
+        self.salt=salt
+
+    def encode_cursor(self,obj,direction):
+        """
+        Returns a signed cursor for seeking from given object in given direction
+        """
+        return signing.dumps([self.field.value_to_string(obj),obj.pk,direction],salt=self.salt,compress=True)
+
+    def decode_cursor(self,cursor):
+        """
+        Returns field value, primary key and direction stored in a cursor
+
+        :raises: ValueError if cursor is not valid
+        """
+        try:
+            value,pk,direction=signing.loads(cursor,salt=self.salt)
+        except (signing.BadSignature,TypeError,ValueError):
+            raise ValueError('Invalid cursor')
+        if direction not in ('next','prev'):
+            raise ValueError('Invalid cursor')
+        return value,pk,direction
+
+    def seek(self,queryset,value,pk,forward=True):
+        """
+        Filter given queryset to items after or before given ordering field value and primary key
+        """
+        name=self.field.name
+        lookup='gt' if forward else 'lt'
+        # Redundant inclusive bound lets the database use an index range scan on the ordering field
+        queryset=queryset.filter(**{'%s__%se' % (name,lookup): value})
+        return queryset.filter(models.Q(**{'%s__%s' % (name,lookup): value}) |
+            models.Q(**{name: value, 'pk__%s' % lookup: pk}))
+
+    def page(self,cursor=None):
+        """
+        Returns the page for given cursor. First page is returned when no cursor is given
+        """
+        name=self.field.name
+        qs=self.queryset
+        direction='next'
+        if cursor:
+            value,pk,direction=self.decode_cursor(cursor)
+            # Seek after or before cursor item
+            qs=self.seek(qs,value,pk,(direction=='next') != self.descending)
+        # Reverse ordering for previous pages
+        descending=self.descending != (direction=='prev')
+        if descending:
+            qs=qs.order_by('-%s' % name,'-pk')
+        else:
+            qs=qs.order_by(name,'pk')
+        # Get an extra item to check if there are more pages
+        items=list(qs[:self.per_page + 1])
+        more=len(items) > self.per_page
+        items=items[:self.per_page]
+        if direction=='prev':
+            items.reverse()
+        # Generate cursors for next and previous pages
+        next_cursor=previous_cursor=None
+        if items:
+            if more or direction=='prev':
+                next_cursor=self.encode_cursor(items[-1],'next')
+            if cursor and (more or direction=='next'):
+                previous_cursor=self.encode_cursor(items[0],'prev')
+        return KeysetPage(items,self,next_cursor,previous_cursor)
+
+    def approximate_count(self):
+        """
+        Returns approximate number of rows in paginated model table using database statistics
+
+        Statistics are available for PostgreSQL, MySQL and analyzed SQLite databases. Returns
+        None if statistics are not available. Queryset filters are not taken into account.
+        """
+        table=self.queryset.model._meta.db_table
+        connection=connections[self.queryset.db]
+        queries={
+            'postgresql': 'SELECT reltuples FROM pg_class WHERE relname = %s',
+            'mysql': 'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s',
+            'sqlite': 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s',
+        }
+        if connection.vendor not in queries:
+            return None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(queries[connection.vendor],[table])
+                row=cursor.fetchone()
+        except DatabaseError:
+            return None
+        if row is None or row[0] is None:
+            return None
+        # SQLite statistics store row count as first value
+        count=int(str(row[0]).split()[0].split('.')[0])
+        if count < 0:
+            return None
+        return count
@@ -27,6 +27,7 @@ from django.conf import settings
 
 # EVODjango imports
 from evodjango import utils as evodjango_utils
+from evodjango.paginator import KeysetPaginator
 
 # Temporary references for compatibility
 inject_app_defaults=evodjango_utils.inject_app_defaults
@@ -100,6 +101,18 @@ def paginate_items(obj_list,elems=25,pagenum=1):
         objs = paginator.page(paginator.num_pages)
     return objs
 
+def paginate_items_by_cursor(queryset,elems=25,cursor=None,order_by='-timestamped_created'):
+    """
+    Paginate items in a given queryset using keyset pagination
+    """
+    paginator = KeysetPaginator(queryset, elems, order_by)
+    try:
+        objs = paginator.page(cursor)
+    except ValueError:
+        # If cursor is not valid, deliver first page.
+        objs = paginator.page()
+    return objs
+
 
     
 
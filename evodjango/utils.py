@@ -92,6 +92,9 @@ def flatten_response_content(response):
 def static_serve(filepath,backend='django',download_as=None,extra_headers={},*args,**kwargs):
     """
     Static serve tool function
+
+    Pass request keyword argument to answer conditional and range requests and chunk_size
+    keyword argument to change file read size when using django backend
     """
     if os.path.exists(filepath) and not os.path.isdir(filepath):
         if backend=='django':
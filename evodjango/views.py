@@ -26,7 +26,7 @@ def favicon(req,favicon_path='favicon.ico',backend='django'):
     """
     Favicon serving 
     """
-    return evodjango_static_serve(settings.STATIC_ROOT + favicon_path,backend,extra_headers={'Content-Type': 'image/vnd.microsoft.icon'})
+    return evodjango_static_serve(settings.STATIC_ROOT + favicon_path,backend,extra_headers={'Content-Type': 'image/vnd.microsoft.icon'},request=req)
 
 def simple_robots(req,options={}):
     """
@@ -61,7 +61,7 @@ def static_serve(req,path,backend='django'):
     """
     Static serving
     """
-    return evodjango_static_serve(settings.STATIC_ROOT + path,backend)
+    return evodjango_static_serve(settings.STATIC_ROOT + path,backend,request=req)
 
 #def media_serve(req,path,check_callback=None):
 #    """
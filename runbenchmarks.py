@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango benchmark runner
+===============================================
+
+Runs EVODjango benchmarks on a test database using tests.settings:
+
+    python runbenchmarks.py [--rows N] [benchmark names]
+
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+# Python imports
+import os, argparse
+
+# Django imports
+import django
+from django.db import connection
+
+if __name__=='__main__':
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE','tests.settings')
+    django.setup()
+    from tests import benchmarks
+    parser=argparse.ArgumentParser(description='Runs EVODjango benchmarks')
+    parser.add_argument('names',nargs='*',help='Benchmark names. All benchmarks by default')
+    parser.add_argument('--rows',type=int,default=10000,help='Number of rows created by benchmarks. Defaults to 10000')
+    options=parser.parse_args()
+    connection.creation.create_test_db(verbosity=0)
+    benchmarks.run(options.names,options.rows)
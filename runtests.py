@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango test runner
+===============================================
+
+Runs EVODjango tests using tests.settings:
+
+    python runtests.py [test labels]
+
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+# Python imports
+import os, sys
+
+# Django imports
+import django
+from django.conf import settings
+from django.test.utils import get_runner
+
+if __name__=='__main__':
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE','tests.settings')
+    django.setup()
+    runner=get_runner(settings)()
+    failures=runner.run_tests(sys.argv[1:] or ['tests'])
+    sys.exit(bool(failures))
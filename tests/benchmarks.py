@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango benchmarks
+===============================================
+
+.. module:: tests.benchmarks
+    :platform: Django
+    :synopsis: EVODjango benchmarks run by runbenchmarks.py
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Python imports
+import os, sys, time, datetime, random, subprocess, tempfile
+from wsgiref.util import FileWrapper
+from collections import OrderedDict
+
+# Django imports
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.contrib.contenttypes.models import ContentType
+from django.core.paginator import Paginator
+from django.db import models, connection, transaction
+from django.db.models import Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django import forms
+from django.forms.models import modelform_factory
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+# EVODjango imports
+from evodjango.decorators import cache_filtered_list
+from evodjango import enums
+from evodjango.geo import geohash_encode, haversine
+from evodjango.http import StreamingServeResponse
+from evodjango.i18n.forms import I18NField, I18NWidget
+from evodjango.models.fields import get_json_codec, CountryField
+from evodjango.models.managers import get_publishable_sentinels
+from evodjango.models.filters import FilterProcessor
+from evodjango.paginator import KeysetPaginator
+
+# Test models
+from tests.testapp.models import Article, Page, Post, Entry, Tag, Author, Note, Product, Document
+
+# Registered benchmarks by name
+BENCHMARKS=OrderedDict()
+
+def benchmark(func):
+    """
+    Decorator registering a benchmark function receiving the number of rows
+    """
+    BENCHMARKS[func.__name__]=func
+    return func
+
+def timed(func,*args,**kwargs):
+    """
+    Returns elapsed time in seconds and result of a function call
+    """
+    started=time.time()
+    result=func(*args,**kwargs)
+    return time.time() - started,result
+
+def report(label,elapsed,extra=''):
+    """
+    Writes a benchmark result line
+    """
+    sys.stdout.write(('    %-50s %10.4fs %s' % (label,elapsed,extra)).rstrip() + '\n')
+
+def run(names,rows):
+    """
+    Runs given benchmarks or all of them, rolling back created rows after each one
+    """
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise ValueError('Unknown benchmark %s' % name)
+        sys.stdout.write('%s (%d rows)\n' % (name,rows))
+        with transaction.atomic():
+            BENCHMARKS[name](rows)
+            transaction.set_rollback(True)
+
+@benchmark
+def publishables(rows):
+    """
+    Per object publishable status recompute against set based sweep and watermark checks
+    """
+    now=timezone.now()
+    Article.objects.bulk_create([Article(title='Article %d' % index,publishable_active=True,
+        publishable_start=now + datetime.timedelta(minutes=index % 120),publishable_end=now + datetime.timedelta(days=1))
+        for index in range(rows)],batch_size=500)
+    timestamp=now + datetime.timedelta(hours=1)
+
+    def recompute():
+        changed=0
+        for article in Article.objects.filter(publishable_active=True).iterator():
+            publishable=article.check_publishable_dates(timestamp)
+            if publishable!=article.publishable_publishable:
+                Article.objects.filter(pk=article.pk).update(publishable_publishable=publishable)
+                changed+=1
+        return changed
+
+    sid=transaction.savepoint()
+    elapsed,changed=timed(recompute)
+    report('Per object recompute',elapsed,'%d changed' % changed)
+    transaction.savepoint_rollback(sid)
+    elapsed,changed=timed(Article.objects.update_publishables,full=True,timestamp=timestamp)
+    report('Bulk sweep',elapsed,'%d published, %d unpublished' % changed)
+    timestamp+=datetime.timedelta(minutes=30)
+    elapsed,changed=timed(Article.objects.update_publishables,timestamp=timestamp)
+    report('Watermark sweep 30 minutes later',elapsed,'%d published, %d unpublished' % changed)
+    elapsed,changed=timed(Article.objects.update_publishables,timestamp=timestamp + datetime.timedelta(seconds=1))
+    report('Watermark sweep before next boundary',elapsed,'%d published, %d unpublished' % changed)
+
+@benchmark
+def publishable_queries(rows):
+    """
+    Publishable items query using empty publication dates against sentinel dates and composite index
+    """
+    generator=random.Random(0)
+    now=timezone.now()
+    mindate,maxdate=get_publishable_sentinels()
+    Article.objects.bulk_create([Article(title='Article %d' % index,publishable_active=index % 10==0,
+        publishable_start=mindate if index % 3 else now + datetime.timedelta(hours=generator.randint(-48,48)),
+        publishable_end=maxdate if index % 4 else now + datetime.timedelta(hours=generator.randint(-48,48)))
+        for index in range(rows)],batch_size=500)
+
+    def get_plan(qs):
+        sql,params=qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql,params)
+            return ' '.join(str(row[-1]) for row in cursor.fetchall())
+
+    sentinel=Article.objects.filter(Article.objects.get_publishable_q(now))
+    elapsed,count=timed(sentinel.count)
+    report('Sentinel dates range predicate',elapsed,'%d publishable, %s' % (count,get_plan(sentinel)))
+    sid=transaction.savepoint()
+    Article.objects.filter(publishable_start=mindate).update(publishable_start=None)
+    Article.objects.filter(publishable_end=maxdate).update(publishable_end=None)
+    empty=Article.objects.filter(Q(publishable_active=True) &
+        (Q(publishable_start=None) | Q(publishable_start__lte=now)) & (Q(publishable_end=None) | Q(publishable_end__gte=now)))
+    elapsed,count=timed(empty.count)
+    report('Empty dates OR predicate',elapsed,'%d publishable, %s' % (count,get_plan(empty)))
+    transaction.savepoint_rollback(sid)
+
+@benchmark
+def filter_processor(rows):
+    """
+    Compiled filter processor against getattr based processing of 15 filter keys for each request
+    """
+    filterspecs={}
+    filterdata={}
+    for index in range(5):
+        filterspecs['simple%d' % index]=('simple',['simple%d' % index,int])
+        filterdata['simple%d' % index]=str(index)
+        filterspecs['range%d' % index]=('range',['range%d' % index])
+        filterdata['range%d' % index]='%d..%d' % (index,index * 10)
+        filterspecs['multiple%d' % index]=('multiple',['multiple%d' % index])
+        filterdata['multiple%d' % index]='a,b,c'
+    processor=FilterProcessor(filterspecs)
+
+    def uncompiled():
+        for request in range(rows):
+            filters={}
+            for shortcut,value in filterdata.items():
+                if shortcut in filterspecs:
+                    method=getattr(processor,'process_' + filterspecs[shortcut][0])
+                    try:
+                        filters.update(method(value,*filterspecs[shortcut][1]))
+                    except Exception:
+                        pass
+
+    def compiled():
+        for request in range(rows):
+            processor.get_filters(filterdata)
+
+    report('Uncompiled getattr processing',timed(uncompiled)[0],'%d requests' % rows)
+    report('Compiled processing',timed(compiled)[0],'%d requests' % rows)
+
+def get_sample_data(index):
+    """
+    Returns a JSON serializable value of about 2KB for encoded field benchmarks
+    """
+    return {
+        'id': index,
+        'title': 'Document %d' % index,
+        'tags': ['tag%d' % (index % 10),'tag%d' % (index % 7)],
+        'items': [{'name': 'Item %d' % item, 'price': item * 1.5, 'stock': item % 3 == 0} for item in range(40)],
+    }
+
+@benchmark
+def encoded_fields(rows):
+    """
+    Stored bytes and encode and decode time for plain, zlib compressed text and binary JSON fields
+    """
+    quote=connection.ops.quote_name
+    for fieldname in ('data','compressed','binary'):
+        documents=[Document(**{fieldname: get_sample_data(index)}) for index in range(rows)]
+        sid=transaction.savepoint()
+        elapsed,result=timed(Document.objects.bulk_create,documents,batch_size=500)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT SUM(LENGTH(%s)) FROM %s' % (quote(fieldname),quote(Document._meta.db_table)))
+            size=cursor.fetchone()[0]
+        report('%s encode and insert' % fieldname,elapsed,'%d bytes stored' % size)
+        elapsed,result=timed(lambda: [getattr(document,fieldname) for document in Document.objects.only('pk',fieldname)])
+        report('%s load and decode' % fieldname,elapsed)
+        transaction.savepoint_rollback(sid)
+
+@benchmark
+def json_fields(rows):
+    """
+    Lazy decoding of JSON fields not accessed after loading and encode and decode time for each JSON codec
+    """
+    values=[get_sample_data(index) for index in range(rows)]
+    Document.objects.bulk_create([Document(data=value) for value in values],batch_size=500)
+    elapsed,result=timed(lambda: list(Document.objects.only('pk','data')))
+    report('Load without field access',elapsed)
+    elapsed,result=timed(lambda: [document.data for document in Document.objects.only('pk','data')])
+    report('Load with field access',elapsed)
+    for codec in ('json','ujson','orjson'):
+        try:
+            dumps,loads=get_json_codec(codec)
+        except ImproperlyConfigured:
+            sys.stdout.write('    %s codec is not installed\n' % codec)
+            continue
+        elapsed,result=timed(lambda: [loads(dumps(value)) for value in values])
+        report('%s encode and decode' % codec,elapsed)
+
+@benchmark
+def translations(rows):
+    """
+    Queries and time for per object translation lookups against with_translations for pages of items
+    """
+    Page.objects.bulk_create([Page(title='Página %d' % index,translatable_lang='es') for index in range(rows)],batch_size=500)
+    roots=list(Page.objects.order_by('pk'))
+    # Translate half of the items
+    Page.objects.bulk_create([Page(title='Page %d' % index,translatable_lang='en',translatable_parent=root)
+        for index,root in enumerate(roots) if index % 2==0],batch_size=500)
+    qs=Page.objects.filter(translatable_lang='es').order_by('pk')
+    for size in (10,100,1000):
+        with CaptureQueriesContext(connection) as queries:
+            elapsed,result=timed(lambda: [page.get_translation('en') for page in qs[:size]])
+        report('Per object lookups for %d items' % size,elapsed,'%d queries' % len(queries))
+        with CaptureQueriesContext(connection) as queries:
+            elapsed,result=timed(lambda: [page.get_translation('en') for page in qs.with_translations('en')[:size]])
+        report('with_translations for %d items' % size,elapsed,'%d queries' % len(queries))
+
+@benchmark
+def nearest(rows):
+    """
+    Geohash narrowed k nearest neighbours search against full scans
+    """
+    generator=random.Random(0)
+    documents=[]
+    for index in range(rows):
+        lat,lon=generator.uniform(36,43),generator.uniform(-9,3)
+        documents.append(Document(location={'lat': lat, 'lon': lon},location_lat=lat,location_lon=lon,
+            location_geohash=geohash_encode(lat,lon)))
+    Document.objects.bulk_create(documents,batch_size=500)
+    lat,lon,k=40.4168,-3.7038,10
+
+    def python_scan():
+        items=[(haversine(lat,lon,document.location['lat'],document.location['lon']),document.pk)
+            for document in Document.objects.all()]
+        return [pk for distance,pk in sorted(items)[:k]]
+
+    elapsed,expected=timed(python_scan)
+    report('Full scan decoding locations',elapsed)
+    elapsed,result=timed(Document.objects.with_distances,lat,lon,k=k)
+    report('Full scan of indexed columns',elapsed,'same result' if [item.pk for item in result]==expected else 'different result')
+    elapsed,result=timed(Document.objects.nearest,lat,lon,k=k)
+    report('Geohash nearest',elapsed,'same result' if [item.pk for item in result]==expected else 'different result')
+
+@benchmark
+def localized_loading(rows):
+    """
+    Load time and loaded bytes of I18N fields with 8 languages against single language loading
+    """
+    langs=('es','en','fr','de','it','pt','ca','eu')
+    Post.objects.bulk_create([Post(title=dict((lang,'%s %d' % (lang,index)) for lang in langs),
+        body=dict((lang,'<p>%s %d</p>' % (lang * 200,index)) for lang in langs)) for index in range(rows)],batch_size=500)
+
+    def full():
+        return [post.localized_body_es() for post in Post.objects.only('pk','body')]
+
+    def localized():
+        return [post.localized_body_es() for post in Post.objects.localized('es','body').only('pk')]
+
+    elapsed,result=timed(full)
+    size=sum(len(value) for value in Post.objects.values_list('body',flat=True))
+    report('Full field loading',elapsed,'%d bytes loaded' % size)
+    elapsed,result=timed(localized)
+    size=sum(len(value) for value in Post.objects.localized('es','body').values_list('body_es_localized',flat=True))
+    report('Localized loading',elapsed,'%d bytes loaded' % size)
+
+@benchmark
+def pagination(rows):
+    """
+    First and last page retrieval using offset pagination against keyset pagination
+    """
+    now=timezone.now()
+    Entry.objects.bulk_create([Entry(title='Entry %d' % index,timestamped_created=now - datetime.timedelta(seconds=index),
+        timestamped_modified=now) for index in range(rows)],batch_size=500)
+    qs=Entry.objects.order_by('-timestamped_created','-pk')
+    paginator=Paginator(qs,25)
+    keyset=KeysetPaginator(qs,25)
+    last=paginator.num_pages
+    # Cursor pointing to last item of the page before the last one
+    cursor=keyset.encode_cursor(qs[(last - 1) * 25 - 1],'next')
+    for label,number in (('first',1),('last',last)):
+        elapsed,result=timed(lambda: list(paginator.page(number)))
+        report('Offset pagination %s page (%d)' % (label,number),elapsed)
+        elapsed,result=timed(lambda: list(keyset.page(cursor if number > 1 else None)))
+        report('Keyset pagination %s page' % label,elapsed)
+
+@benchmark
+def content_objects(rows):
+    """
+    Queries and time for per object generic relation access against content objects prefetching
+    """
+    Article.objects.bulk_create([Article(title='Article %d' % index) for index in range(rows)],batch_size=500)
+    Tag.objects.bulk_create([Tag(name='Tag %d' % index) for index in range(rows)],batch_size=500)
+    Author.objects.bulk_create([Author(name='Author %d' % index) for index in range(rows)],batch_size=500)
+    # Interleave notes related to each model
+    targets=zip(Article.objects.order_by('pk'),Tag.objects.order_by('pk'),Author.objects.order_by('pk'))
+    Note.objects.bulk_create([Note(content_object=target,text=target.pk) for group in targets for target in group],
+        batch_size=500)
+    qs=Note.objects.order_by('pk')
+    for size in (10,100,1000):
+        with CaptureQueriesContext(connection) as queries:
+            elapsed,result=timed(lambda: [note.content_object for note in qs[:size]])
+        report('Per object access for %d items' % size,elapsed,'%d queries' % len(queries))
+        with CaptureQueriesContext(connection) as queries:
+            elapsed,result=timed(lambda: [note.content_object for note in qs.prefetch_content_objects()[:size]])
+        report('prefetch_content_objects for %d items' % size,elapsed,'%d queries' % len(queries))
+
+@benchmark
+def generic_relations(rows):
+    """
+    Related generic items lookup for pages of objects with and without content type and object identifier index
+    """
+    Article.objects.bulk_create([Article(title='Article %d' % index) for index in range(rows)],batch_size=500)
+    articles=list(Article.objects.order_by('pk'))
+    Note.objects.bulk_create([Note(content_object=article,text='Note %d' % index) for article in articles
+        for index in range(2)],batch_size=500)
+    page=articles[::max(rows // 25,1)][:25]
+    contenttype=ContentType.objects.get_for_model(Article)
+
+    def per_object():
+        return dict((article,list(Note.objects.filter(content_type=contenttype,object_id=article.pk))) for article in page)
+
+    quote=connection.ops.quote_name
+    with connection.cursor() as cursor:
+        constraints=connection.introspection.get_constraints(cursor,Note._meta.db_table)
+    index=[name for name,constraint in constraints.items()
+        if constraint['index'] and constraint['columns']==['content_type_id','object_id']][0]
+    sid=transaction.savepoint()
+    with connection.cursor() as cursor:
+        cursor.execute('DROP INDEX %s' % quote(index))
+    report('Per object lookups without index',timed(per_object)[0],'%d objects' % len(page))
+    report('get_for_objects without index',timed(Note.objects.get_for_objects,page)[0],'%d objects' % len(page))
+    transaction.savepoint_rollback(sid)
+    report('Per object lookups with index',timed(per_object)[0],'%d objects' % len(page))
+    report('get_for_objects with index',timed(Note.objects.get_for_objects,page)[0],'%d objects' % len(page))
+
+@benchmark
+def choices(rows):
+    """
+    Country select rendering, validation and display with plain choices against precomputed choice index
+    """
+    values=[value for value,label in enums.COUNTRIES] * 4
+    for label,field in (('Plain choices',models.CharField(max_length=2,choices=enums.COUNTRIES)),
+            ('Choice index',CountryField())):
+        elapsed,result=timed(lambda: [field.formfield().widget.render('country','es') for render in range(rows)])
+        report('%s select render' % label,elapsed,'%d renders of %d options' % (rows,len(enums.COUNTRIES)))
+        formfield=field.formfield()
+        elapsed,result=timed(lambda: [formfield.clean(value) for value in values])
+        report('%s form validation' % label,elapsed,'%d values' % len(values))
+    elapsed,result=timed(lambda: [dict(enums.COUNTRIES).get(value,value) for value in values])
+    report('Plain choices display',elapsed,'%d values' % len(values))
+    index=CountryField().choice_index
+    elapsed,result=timed(lambda: [index.get_label(value,value) for value in values])
+    report('Choice index display',elapsed,'%d values' % len(values))
+
+@benchmark
+def enums_import(rows):
+    """
+    Enumerations module import time in a new interpreter against import building all tables
+    """
+    # Django translation module is imported before timing
+    template='import time, django.utils.translation; started=time.time(); import evodjango.enums as enums; %s; ' \
+        'print(time.time() - started)'
+    for label,code in (('Lazy import','pass'),('Import building all tables','[getattr(enums,name) for name in enums.TABLES]')):
+        # Best of five runs
+        elapsed=min(float(subprocess.check_output([sys.executable,'-c',template % code])) for run in range(5))
+        report(label,elapsed)
+
+@benchmark
+def filtered_list(rows):
+    """
+    Filtered list view requests with shuffled parameters cached by query string against filter signature
+    """
+    generator=random.Random(0)
+    colors=('red','green','blue','black','white')
+    Product.objects.bulk_create([Product(name='Product %d' % index,color=generator.choice(colors),
+        size=generator.choice('SML'),price=generator.randint(1,100)) for index in range(rows)],batch_size=500)
+    processor=FilterProcessor({
+        'color': ('simple',['color']),
+        'size': ('multiple',['size']),
+        'price': ('range',['price']),
+    })
+
+    def view(req):
+        filters=processor.get_filters(req.GET)
+        return HttpResponse(','.join(Product.objects.filter(**filters).order_by('name')[:25].values_list('name',flat=True)))
+
+    def querystring_cached(req):
+        key='benchmark.filtered_list.%s' % req.META['QUERY_STRING']
+        response=cache.get(key)
+        if response is None:
+            response=view(req)
+            cache.set(key,response,300)
+        return response
+
+    # Requests for 20 filter combinations with parameters in random order
+    factory=RequestFactory()
+    requests=[]
+    for index in range(1000):
+        combination=index % 20
+        params=['color=%s' % colors[combination % 5],'size=%s' % ('S,M' if combination % 2 else 'M,S'),
+            'price=%d..%d' % (combination // 5 * 20,combination // 5 * 20 + 40)]
+        generator.shuffle(params)
+        requests.append(factory.get('/products/?' + '&'.join(params)))
+    for label,func in (('Not cached',view),('Cached by query string',querystring_cached),
+            ('Cached by filter signature',cache_filtered_list(processor,Product)(view))):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            elapsed,result=timed(lambda: [func(req) for req in requests])
+        report(label,elapsed,'%d requests, %d queries' % (len(requests),len(queries)))
+
+@benchmark
+def i18n_forms(rows):
+    """
+    I18N model form creation and rendering with 8 languages for each request, as admin does, rebuilding
+    language fields against copying prototypes, and field copies for form instances
+    """
+    langs=(('es','Spanish'),('en','English'),('fr','French'),('de','German'),('it','Italian'),('pt','Portuguese'),
+        ('ca','Catalan'),('eu','Basque'))
+    instance=Post(title=dict((lang,'Title %s' % lang) for lang,langname in langs),
+        body=dict((lang,'Body %s' % lang) for lang,langname in langs))
+
+    def render(rebuild):
+        for index in range(rows):
+            if rebuild:
+                I18NField.prototypes.clear()
+                I18NWidget.prototypes.clear()
+            modelform_factory(Post,fields=('title','body'))(instance=instance).as_p()
+
+    def copy_fields(func):
+        for index in range(rows):
+            [func(field,{}) for field in fields]
+
+    with override_settings(LANGUAGES=langs):
+        report('Language fields rebuilt',timed(render,True)[0],'%d renders' % rows)
+        report('Prototypes copied',timed(render,False)[0],'%d renders' % rows)
+        fields=modelform_factory(Post,fields=('title','body')).base_fields.values()
+        report('Language fields deep copied',timed(copy_fields,forms.MultiValueField.__deepcopy__)[0],'%d forms' % rows)
+        report('Language fields shallow copied',timed(copy_fields,I18NField.__deepcopy__)[0],'%d forms' % rows)
+
+@benchmark
+def file_serving(rows):
+    """
+    Throughput of file streaming with 8KB file wrapper chunks against StreamingServeResponse, and bytes
+    sent for range and conditional requests. Files have one KB for each row
+    """
+    factory=RequestFactory()
+    fileobj=tempfile.NamedTemporaryFile(suffix='.bin')
+    fileobj.write(os.urandom(1024) * rows)
+    fileobj.flush()
+    size=rows * 1024
+
+    def serve(response):
+        # Iterate and close response as WSGI servers without file_wrapper do
+        sent=sum(len(data) for data in response)
+        response.close()
+        return sent
+
+    def throughput(elapsed,sent):
+        return '%d bytes sent, %.1f MB/s' % (sent,sent / elapsed / 1048576.0 if elapsed else 0)
+
+    elapsed,sent=timed(lambda: serve(StreamingHttpResponse(FileWrapper(open(fileobj.name,'rb')))))
+    report('File wrapper streaming',elapsed,throughput(elapsed,sent))
+    elapsed,sent=timed(lambda: serve(StreamingServeResponse(fileobj.name,request=factory.get('/'))))
+    report('StreamingServeResponse streaming',elapsed,throughput(elapsed,sent))
+    response=StreamingServeResponse(fileobj.name,request=factory.get('/'))
+    elapsed,sent=timed(lambda: serve(FileWrapper(response.file_to_stream,response.block_size)))
+    report('StreamingServeResponse through file_wrapper',elapsed,throughput(elapsed,sent))
+    request=factory.get('/',HTTP_RANGE='bytes=-1048576')
+    elapsed,sent=timed(lambda: serve(StreamingServeResponse(fileobj.name,request=request)))
+    report('Last MB range request',elapsed,throughput(elapsed,sent))
+    request=factory.get('/',HTTP_IF_NONE_MATCH=response['ETag'])
+    elapsed,sent=timed(lambda: serve(StreamingServeResponse(fileobj.name,request=request)))
+    report('Conditional request',elapsed,'%d bytes sent of %d' % (sent,size))
+    fileobj.close()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango test settings
+===============================================
+
+.. module:: tests.settings
+    :platform: Django
+    :synopsis: EVODjango test settings
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+SECRET_KEY='evodjango-tests'
+
+DATABASES={
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+INSTALLED_APPS=[
+    'django.contrib.contenttypes',
+    'evodjango',
+    'tests.testapp',
+]
+
+USE_TZ=True
+
+LANGUAGE_CODE='es'
+
+LANGUAGES=(
+    ('es','Spanish'),
+    ('en','English'),
+)
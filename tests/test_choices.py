@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango choices tests
+===============================================
+
+.. module:: tests.test_choices
+    :platform: Django
+    :synopsis: EVODjango choice lookup tables tests
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Django imports
+from django.core.exceptions import ValidationError
+from django.forms.models import modelform_factory
+from django.test import SimpleTestCase
+
+# EVODjango imports
+from evodjango import enums
+from evodjango.choices import ChoiceIndex, get_choice_index
+
+# Test models
+from tests.testapp.models import Profile
+
+class ChoiceIndexTest(SimpleTestCase):
+    """
+    Precomputed choice lookup tables
+    """
+    def test_lookups(self):
+        """
+        Labels and valid values are looked up by value
+        """
+        index=ChoiceIndex(((1,'One'),(2,'Two')))
+        self.assertIn(1,index)
+        self.assertIn('2',index)
+        self.assertNotIn(3,index)
+        self.assertEqual(index.get_label(2),'Two')
+        self.assertEqual(index.get_label(3,'Three'),'Three')
+
+    def test_options(self):
+        """
+        Options are sorted ignoring case and accents and built once for each language
+        """
+        index=ChoiceIndex((('z','Zeta'),('a',u'Árbol'),('v',u'avión')))
+        options=index.get_options(sort=True,lang='es')
+        self.assertEqual([value for value,label in options],['a','v','z'])
+        self.assertIs(index.get_options(sort=True,lang='es'),options)
+        self.assertEqual([value for value,label in index.get_options(include_blank=True,lang='es')],['','z','a','v'])
+
+    def test_shared_index(self):
+        """
+        Same choices sequence shares its choice index
+        """
+        self.assertIs(get_choice_index(enums.COUNTRIES),Profile._meta.get_field('country').choice_index)
+
+class IndexedChoicesFieldTest(SimpleTestCase):
+    """
+    Enumeration backed model fields using choice indexes
+    """
+    def test_display(self):
+        """
+        Display methods return choice labels or values not in choices
+        """
+        self.assertEqual(Profile(country='es').get_country_display(),'Spain')
+        self.assertEqual(Profile(country='xx').get_country_display(),'xx')
+
+    def test_validation(self):
+        """
+        Model validation rejects values not in choices
+        """
+        Profile(country='es',currency='EUR').full_clean()
+        with self.assertRaises(ValidationError) as context:
+            Profile(country='xx',currency='EUR').full_clean()
+        self.assertEqual(list(context.exception.message_dict),['country'])
+
+    def test_formfield(self):
+        """
+        Form fields render sorted options and validate values using choice index
+        """
+        form_class=modelform_factory(Profile,fields=('gender','country','currency'))
+        form=form_class(data={'gender': 'f', 'country': 'es', 'currency': 'EUR'})
+        self.assertTrue(form.is_valid())
+        form=form_class(data={'gender': 'x', 'country': 'xx', 'currency': 'EUR'})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(sorted(form.errors),['country','gender'])
+        choices=list(form_class().fields['country'].choices)
+        self.assertEqual(choices[0][0],'')
+        self.assertEqual(choices[1:],sorted(choices[1:],key=lambda choice: choice[1].lower()))
+        # Genders keep their order
+        self.assertEqual([value for value,label in form_class().fields['gender'].choices],['','m','f','o'])
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango enumerations tests
+===============================================
+
+.. module:: tests.test_enums
+    :platform: Django
+    :synopsis: EVODjango lazy enumerations tests
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Python imports
+import sys, subprocess
+
+# Django imports
+from django.test import SimpleTestCase
+
+# EVODjango imports
+from evodjango import enums
+
+class LazyEnumsTest(SimpleTestCase):
+    """
+    Enumeration tables built on first access
+    """
+    def test_import_does_not_build_tables(self):
+        """
+        Importing enumerations module does not build any table
+        """
+        code='import evodjango.enums as enums; print(sorted(set(enums.TABLES) & set(enums.__dict__)))'
+        output=subprocess.check_output([sys.executable,'-c',code])
+        self.assertEqual(output.strip(),b'[]')
+
+    def test_tables(self):
+        """
+        Tables are built once on first access and can be imported by name
+        """
+        countries=enums.COUNTRIES
+        self.assertIs(enums.COUNTRIES,countries)
+        self.assertIn(('es',u'Spain'),[(value,u'%s' % label) for value,label in countries])
+        self.assertEqual(enums.TLD_SET,frozenset(enums.TLD_LIST))
+        namespace={}
+        exec('from evodjango.enums import *',namespace)
+        self.assertEqual(sorted(name for name in namespace if name.isupper()),sorted(enums.TABLES))
+
+    def test_unknown_table(self):
+        """
+        Unknown attributes raise AttributeError
+        """
+        self.assertRaises(AttributeError,getattr,enums,'UNKNOWN')
+        self.assertFalse(hasattr(enums,'UNKNOWN'))
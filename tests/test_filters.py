@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango filter tests
+===============================================
+
+.. module:: tests.test_filters
+    :platform: Django
+    :synopsis: EVODjango filter processor tests
+.. moduleauthor:: (C) 2013 Oliver Gutiérrez
+"""
+
+# Python imports
+import datetime, decimal
+from functools import partial
+
+# Django imports
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import HttpResponse, QueryDict
+from django.test import SimpleTestCase, TestCase, RequestFactory
+
+# EVODjango imports
+from evodjango.decorators import cache_filtered_list
+from evodjango.models.filters import FilterProcessor
+
+# Test models
+from tests.testapp.models import Product
+
+def name_filter(value,fieldname):
+    """
+    Custom processor returning a filter for a name field
+    """
+    return {fieldname: value}
+
+class FilterProcessorCompileTest(SimpleTestCase):
+    """
+    Filter specs compilation and filter errors
+    """
+    def test_invalid_specs(self):
+        """
+        Unknown processors and wrong parameters are reported on initialization
+        """
+        self.assertRaises(ValueError,FilterProcessor,{'q': ('unknown',['name'])})
+        self.assertRaises(ValueError,FilterProcessor,{'q': ('simple',['name',str,False,'extra'])})
+        self.assertRaises(ValueError,FilterProcessor,{'q': (name_filter,[])})
+        self.assertRaises(ValueError,FilterProcessor,{'q': ('not callable',)})
+
+    def test_builtin_and_partial_processors(self):
+        """
+        Processors without inspectable signature are accepted
+        """
+        processor=FilterProcessor({
+            'pairs': (dict,[]),
+            'name': (partial(name_filter,fieldname='name'),[]),
+        })
+        filters=processor.get_filters({'pairs': [('active',True)], 'name': 'x'})
+        self.assertEqual(filters,{'active': True, 'name': 'x'})
+
+    def test_errors(self):
+        """
+        Invalid filters are reported instead of being silently dropped
+        """
+        processor=FilterProcessor({
+            'name': (name_filter,['name']),
+            'price': ('range',['price']),
+        })
+        query,errors=processor.get_query({'name': 'x', 'price': 'a..b'})
+        self.assertEqual(str(query),str(Q(name='x')))
+        self.assertEqual(list(errors),['price'])
+        self.assertRaises(ValueError,processor.get_filters,{'name': 'x', 'price': 'a..b'})
+
+class RangeTest(TestCase):
+    """
+    Typed open ended ranges
+    """
+    def setUp(self):
+        """
+        Create filter processor
+        """
+        self.processor=FilterProcessor({
+            'price': ('range',['price']),
+            'units': ('range',['units',True,False,'int']),
+            'exclusive': ('range',['units',False,False,'int']),
+            'available': ('range',['available',True,False,'date']),
+            'created': ('range',['created',True,False,'datetime']),
+        })
+
+    def test_parse_range(self):
+        """
+        Range extremes are parsed to their type and missing extremes are None
+        """
+        parse=self.processor.parse_range
+        self.assertEqual(parse('-10..-2','int'),(-10,-2))
+        self.assertEqual(parse('5-','int'),(5,None))
+        self.assertEqual(parse('..9.5'),(None,decimal.Decimal('9.5')))
+        self.assertEqual(parse('2014-01-01..','date'),(datetime.date(2014,1,1),None))
+        self.assertEqual(parse('2014-01-01T10:00..2014-01-02 10:00','datetime'),
+            (datetime.datetime(2014,1,1,10),datetime.datetime(2014,1,2,10)))
+        for value,valuetype in (('..','int'),('5..2','int'),('a..b','int'),('1.5..2','int'),('nan..1','decimal'),
+                ('2014-01-01-2014-02-01','date'),('2014-13-01..','date'),('1..2..3','int'),('1..2','float')):
+            self.assertRaises(ValueError,parse,value,valuetype)
+
+    def test_filters(self):
+        """
+        Inclusive discrete ranges are resolved to lower than next value filters
+        """
+        get_filters=self.processor.get_filters
+        self.assertEqual(get_filters({'units': '1..5'}),{'units__gte': 1, 'units__lt': 6})
+        self.assertEqual(get_filters({'exclusive': '1..5'}),{'units__gt': 1, 'units__lt': 5})
+        self.assertEqual(get_filters({'price': '..9.99'}),{'price__lte': decimal.Decimal('9.99')})
+        self.assertEqual(get_filters({'available': '..2014-01-31'}),{'available__lt': datetime.date(2014,2,1)})
+        self.assertEqual(get_filters({'price': ''}),{})
+        self.assertRaises(ValueError,get_filters,{'units': '1..x'})
+
+    def test_query(self):
+        """
+        Range filters select items in range including extremes
+        """
+        for name,price,available in (('a','-5.5','2014-01-01'),('b','10','2014-01-31'),('c','10.01','2014-02-01')):
+            Product.objects.create(name=name,price=decimal.Decimal(price),available=available)
+        for filterdata,names in (({'price': '-10..10'},['a','b']),({'price': '10..'},['b','c']),
+                ({'available': '2014-01-01..2014-01-31'},['a','b']),({'available': '2014-02-01..'},['c'])):
+            qs=Product.objects.filter(**self.processor.get_filters(filterdata)).order_by('name')
+            self.assertEqual(list(qs.values_list('name',flat=True)),names)
+
+class SignatureTest(SimpleTestCase):
+    """
+    Canonical filter signatures
+    """
+    def setUp(self):
+        """
+        Create filter processor
+        """
+        self.processor=FilterProcessor({
+            'color': ('simple',['color']),
+            'size': ('multiple',['size']),
+            'tags[]': ('multiple',['tags']),
+            'price': ('range',['price']),
+            'units': ('range',['units',True,False,'int']),
+        })
+
+    def get_signature(self,querystring):
+        """
+        Returns signature for a query string
+        """
+        return self.processor.get_signature(QueryDict(querystring))
+
+    def test_equivalent_filters(self):
+        """
+        Equivalent filter data get the same signature
+        """
+        signature=self.get_signature('color=red&size=M,S&tags[]=a&tags[]=b&price=1..5&units=2..3')
+        self.assertEqual(self.get_signature('units=2-3&price=1-5&tags[]=b&tags[]=a&size=S,M,S&color=red'),signature)
+        self.assertEqual(self.get_signature('color=red&size=M,S&tags[]=a&tags[]=b&price=1..5&units=2..3&color2=x'),signature)
+        self.assertEqual(self.get_signature('color='),self.get_signature(''))
+
+    def test_different_filters(self):
+        """
+        Filter data filtering different items get different signatures
+        """
+        signatures=set(self.get_signature(querystring) for querystring in
+            ('color=red','color=red%20','color=blue','size=M','size=M,S','price=1..5','price=1..','units=2..3'))
+        self.assertEqual(len(signatures),8)
+
+class FilteredListCacheTest(TestCase):
+    """
+    Filtered list views cached by filter signature
+    """
+    def setUp(self):
+        """
+        Create a cached list view counting its calls
+        """
+        cache.clear()
+        self.factory=RequestFactory()
+        self.calls=[]
+        processor=FilterProcessor({
+            'color': ('simple',['color']),
+            'price': ('range',['price']),
+        })
+
+        @cache_filtered_list(processor,Product)
+        def view(req):
+            self.calls.append(req)
+            filters=processor.get_filters(req.GET)
+            return HttpResponse(','.join(Product.objects.filter(**filters).order_by('name').values_list('name',flat=True)))
+
+        self.view=view
+        Product.objects.create(name='a',color='red',price=1)
+        Product.objects.create(name='b',color='blue',price=2)
+
+    def get(self,querystring):
+        """
+        Returns view response content for a query string
+        """
+        return self.view(self.factory.get('/products/?' + querystring)).content
+
+    def test_cached_responses(self):
+        """
+        Equivalent requests are served from cache until a model item is saved
+        """
+        self.assertEqual(self.get('color=red&price=1..2'),b'a')
+        self.assertEqual(self.get('price=1-2&color=red'),b'a')
+        self.assertEqual(len(self.calls),1)
+        self.assertEqual(self.get('color=blue'),b'b')
+        self.assertEqual(len(self.calls),2)
+        Product.objects.create(name='c',color='red',price=2)
+        self.assertEqual(self.get('color=red&price=1..2'),b'a,c')
+        self.assertEqual(len(self.calls),3)
+
+    def test_invalid_filters(self):
+        """
+        Requests with invalid filters are not cached
+        """
+        for index in range(2):
+            self.assertRaises(ValueError,self.get,'color=red&price=x..y')
+        self.assertEqual(len(self.calls),2)
+
+class FacetsTest(TestCase):
+    """
+    Facet counts for filtered items
+    """
+    def setUp(self):
+        """
+        Create products with several colors and sizes
+        """
+        cache.clear()
+        for name,color,size in (('a','red','S'),('b','red','M'),('c','blue','M'),('d','green','L')):
+            Product.objects.create(name=name,color=color,size=size)
+        self.processor=FilterProcessor({
+            'color': ('simple',['color']),
+            'size[]': ('multiple',['size']),
+            'price': ('range',['price']),
+        })
+
+    def test_facets(self):
+        """
+        Facet counts apply all filters except the facet own filter
+        """
+        facets=self.processor.get_facets(Product.objects.all(),{'color': 'red'})
+        self.assertEqual(dict(facets['color']),{'red': 2, 'blue': 1, 'green': 1})
+        self.assertEqual(dict(facets['size']),{'S': 1, 'M': 1})
+
+    def test_invalid_filters(self):
+        """
+        Invalid filters raise errors instead of counting with wider filters
+        """
+        self.assertRaises(ValueError,self.processor.get_facets,Product.objects.all(),{'color': 'red', 'price': 'x..y'})
+
+    def test_cached_facets(self):
+        """
+        Cached facets are shared by requests with same filters and separated by cache prefix
+        """
+        facets=self.processor.get_facets(Product.objects.all(),{'color': 'red'},['size'],cache_timeout=60)
+        Product.objects.create(name='e',color='red',size='L')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.processor.get_facets(Product.objects.all(),{'color': 'red'},['size'],cache_timeout=60),facets)
+        facets=self.processor.get_facets(Product.objects.all(),{'color': 'red'},['size'],cache_timeout=60,cache_prefix='new')
+        self.assertEqual(dict(facets['size']),{'S': 1, 'M': 1, 'L': 1})
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango HTTP tests
+===============================================
+
+.. module:: tests.test_http
+    :platform: Django
+    :synopsis: EVODjango file serving responses tests
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Python imports
+import os, shutil, tempfile
+
+# Django imports
+from django.test import SimpleTestCase, RequestFactory
+from django.utils.http import http_date
+
+# EVODjango imports
+from evodjango.http import parse_range_header, StaticServeResponse, StreamingServeResponse
+
+class RangeHeaderTest(SimpleTestCase):
+    """
+    Range header parsing
+    """
+    def test_ranges(self):
+        """
+        Satisfiable ranges are clipped to file size and invalid headers are ignored
+        """
+        self.assertEqual(parse_range_header('bytes=0-9',100),[(0,9)])
+        self.assertEqual(parse_range_header('bytes=90-',100),[(90,99)])
+        self.assertEqual(parse_range_header('bytes=-10',100),[(90,99)])
+        self.assertEqual(parse_range_header('bytes=-200',100),[(0,99)])
+        self.assertEqual(parse_range_header('bytes=0-0, 50-200',100),[(0,0),(50,99)])
+        self.assertEqual(parse_range_header('bytes=100-',100),[])
+        for header in (None,'','items=0-9','bytes=9-0','bytes=a-b','bytes=5'):
+            self.assertIsNone(parse_range_header(header,100))
+
+class FileServeTest(SimpleTestCase):
+    """
+    Conditional and range requests for served files
+    """
+    def setUp(self):
+        """
+        Create a file to be served
+        """
+        self.tempdir=tempfile.mkdtemp()
+        self.filepath=os.path.join(self.tempdir,'data.txt')
+        self.data=b''.join(b'%09d\n' % index for index in range(1000))
+        with open(self.filepath,'wb') as fileobj:
+            fileobj.write(self.data)
+        self.factory=RequestFactory()
+
+    def tearDown(self):
+        """
+        Remove served file
+        """
+        shutil.rmtree(self.tempdir)
+
+    def serve(self,response_class=StreamingServeResponse,method='get',**headers):
+        """
+        Returns status, headers and content of a response serving the file
+        """
+        request=getattr(self.factory,method)('/data.txt',**headers)
+        response=response_class(self.filepath,request=request,chunk_size=1000)
+        content=b''.join(response.streaming_content) if response.streaming else response.content
+        return response.status_code,response,content
+
+    def test_whole_file(self):
+        """
+        Whole files are sent using a file object that can be passed to wsgi.file_wrapper
+        """
+        status,response,content=self.serve()
+        self.assertEqual((status,content),(200,self.data))
+        self.assertEqual(response['Content-Length'],str(len(self.data)))
+        self.assertEqual(response['Accept-Ranges'],'bytes')
+        self.assertEqual(response['Content-Type'],'text/plain')
+        response=StreamingServeResponse(self.filepath)
+        self.assertTrue(hasattr(response.file_to_stream,'read'))
+        response.close()
+
+    def test_single_range(self):
+        """
+        Single ranges are answered with partial content
+        """
+        status,response,content=self.serve(HTTP_RANGE='bytes=1995-2004')
+        self.assertEqual((status,content),(206,self.data[1995:2005]))
+        self.assertEqual(response['Content-Range'],'bytes 1995-2004/%d' % len(self.data))
+        self.assertEqual(response['Content-Length'],'10')
+        status,response,content=self.serve(StaticServeResponse,HTTP_RANGE='bytes=-5')
+        self.assertEqual((status,content),(206,self.data[-5:]))
+
+    def test_multiple_ranges(self):
+        """
+        Multiple ranges are answered with a multipart response
+        """
+        status,response,content=self.serve(HTTP_RANGE='bytes=0-9,5000-')
+        self.assertEqual(status,206)
+        self.assertTrue(response['Content-Type'].startswith('multipart/byteranges; boundary='))
+        self.assertEqual(response['Content-Length'],str(len(content)))
+        self.assertIn(b'Content-Range: bytes 0-9/10000\r\n\r\n' + self.data[:10],content)
+        self.assertIn(b'Content-Range: bytes 5000-9999/10000\r\n\r\n' + self.data[5000:],content)
+
+    def test_invalid_ranges(self):
+        """
+        Not satisfiable ranges get 416 and ranges with an outdated If-Range get the whole file
+        """
+        status,response,content=self.serve(HTTP_RANGE='bytes=20000-')
+        self.assertEqual((status,content),(416,b''))
+        self.assertEqual(response['Content-Range'],'bytes */10000')
+        status,response,content=self.serve(HTTP_RANGE='bytes=0-9',HTTP_IF_RANGE='"other"')
+        self.assertEqual((status,content),(200,self.data))
+        etag=self.serve()[1]['ETag']
+        status,response,content=self.serve(HTTP_RANGE='bytes=0-9',HTTP_IF_RANGE=etag)
+        self.assertEqual((status,content),(206,self.data[:10]))
+
+    def test_conditional_requests(self):
+        """
+        Requests with matching validators get not modified responses
+        """
+        etag=self.serve()[1]['ETag']
+        status,response,content=self.serve(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((status,content),(304,b''))
+        self.assertEqual(self.serve(HTTP_IF_NONE_MATCH='"other", %s' % etag)[0],304)
+        self.assertEqual(self.serve(HTTP_IF_NONE_MATCH='"other"')[0],200)
+        mtime=os.stat(self.filepath).st_mtime
+        self.assertEqual(self.serve(HTTP_IF_MODIFIED_SINCE=http_date(mtime))[0],304)
+        self.assertEqual(self.serve(HTTP_IF_MODIFIED_SINCE=http_date(mtime - 60))[0],200)
+        # Only GET and HEAD requests are evaluated
+        self.assertEqual(self.serve(method='post',HTTP_IF_NONE_MATCH=etag,HTTP_RANGE='bytes=0-9')[0],200)
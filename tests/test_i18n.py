@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango I18N tests
+===============================================
+
+.. module:: tests.test_i18n
+    :platform: Django
+    :synopsis: EVODjango I18N fields tests
+.. moduleauthor:: (C) 2014 Oliver Gutiérrez
+"""
+
+# Django imports
+from django import forms
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.forms.models import modelform_factory
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.utils import translation
+from django.utils.six import StringIO
+
+# EVODjango imports
+from evodjango.i18n.forms import I18NField, I18NWidget
+from evodjango.i18n.translation import TranslationWorker, StubTranslationBackend, get_translation_backend
+from evodjango.models.fields import backfill_dependent_columns
+
+# Test models
+from tests.testapp.models import Post
+
+class LocalizedLoadingTest(TestCase):
+    """
+    Language projected loading of I18N fields
+    """
+    def setUp(self):
+        """
+        Create a post with Spanish and English values
+        """
+        self.post=Post.objects.create(title={'es': 'Hola', 'en': 'Hello'},body={'es': 'Cuerpo', 'en': 'Body'})
+
+    def test_localized_language(self):
+        """
+        Loaded language values are available through accessors without loading fields
+        """
+        with self.assertNumQueries(1):
+            post=Post.objects.localized('en','body').get()
+            self.assertEqual(post.localized_body_en(),'Body')
+            with translation.override('en'):
+                self.assertEqual(post.localized_body(),'Body')
+        self.assertNotIn('body',post.__dict__)
+
+    def test_localized_languages(self):
+        """
+        Several languages can be loaded at once
+        """
+        with self.assertNumQueries(1):
+            post=Post.objects.localized(['es','en']).get()
+            self.assertEqual((post.localized_title_es(),post.localized_title_en()),('Hola','Hello'))
+            self.assertEqual((post.localized_body_es(),post.localized_body_en()),('Cuerpo','Body'))
+
+    def test_other_language(self):
+        """
+        Accessors for languages not loaded load the whole field
+        """
+        post=Post.objects.localized('es','body').get()
+        with self.assertNumQueries(1):
+            self.assertEqual(post.localized_body_en(),'Body')
+        self.assertEqual(post.body,{'es': 'Cuerpo', 'en': 'Body'})
+
+class IndexedColumnsTest(TestCase):
+    """
+    Indexed language columns of I18N fields
+    """
+    def setUp(self):
+        """
+        Create posts with Spanish and English titles
+        """
+        self.posts=[Post.objects.create(title={'es': es, 'en': en}) for es,en in
+            (('Casa','House'),('Perro','Dog'),('Arbol con un titulo muy largo','Tree'))]
+
+    def get_columns(self,post):
+        """
+        Returns stored indexed columns of a post
+        """
+        return tuple(Post.objects.filter(pk=post.pk).values_list('title_es','title_en').get())
+
+    def test_columns(self):
+        """
+        Indexed columns store truncated values and are updated when saving the field
+        """
+        self.assertTrue(Post._meta.get_field('title_es').db_index)
+        self.assertEqual(self.get_columns(self.posts[2]),('Arbol con un titulo ','Tree'))
+        post=self.posts[0]
+        post.title={'es': 'Casita'}
+        with self.assertNumQueries(2):
+            post.save(update_fields=['title'])
+        self.assertEqual(self.get_columns(post),('Casita',None))
+        post.title={'es': 'Casa', 'en': 'House'}
+        with self.assertNumQueries(1):
+            post.save(update_fields=['title','title_es','title_en'])
+        self.assertEqual(self.get_columns(post),('Casa','House'))
+
+    def test_order_and_filter(self):
+        """
+        Querysets are ordered and filtered by active language columns
+        """
+        with translation.override('en'):
+            qs=Post.objects.order_by_localized('-title')
+            self.assertEqual([post.pk for post in qs],[self.posts[index].pk for index in (2,0,1)])
+            self.assertEqual(list(Post.objects.filter_localized(title__startswith='Do')),[self.posts[1]])
+        with translation.override('es'):
+            self.assertEqual([post.pk for post in Post.objects.order_by_localized('title')],
+                [self.posts[index].pk for index in (2,0,1)])
+            self.assertEqual(list(Post.objects.filter_localized(title='Perro')),[self.posts[1]])
+            self.assertEqual(Post.objects.all().exclude_localized(title='Perro').count(),2)
+
+    def test_defer_localized(self):
+        """
+        Localized accessors use active language column loading full field only for truncated values
+        """
+        with translation.override('es'):
+            posts=list(Post.objects.defer_localized('title').order_by('pk'))
+            with self.assertNumQueries(0):
+                self.assertEqual([post.localized_title() for post in posts[:2]],['Casa','Perro'])
+            with self.assertNumQueries(1):
+                self.assertEqual(posts[2].localized_title(),'Arbol con un titulo muy largo')
+
+    def test_backfill(self):
+        """
+        Backfill fills columns of items updated without saving them
+        """
+        Post.objects.filter(pk=self.posts[0].pk).update(title={'es': 'Hogar', 'en': 'Home'})
+        self.assertEqual(self.get_columns(self.posts[0]),('Casa','House'))
+        self.assertEqual(backfill_dependent_columns(Post,chunk_size=2),3)
+        self.assertEqual(self.get_columns(self.posts[0]),('Hogar','Home'))
+
+class I18NFormTest(SimpleTestCase):
+    """
+    I18N form fields and widgets built from prototypes
+    """
+    def setUp(self):
+        """
+        Create model form class
+        """
+        self.form_class=modelform_factory(Post,fields=('title','body'))
+
+    def test_render_and_clean(self):
+        """
+        Forms render one widget for each language and clean values to dictionaries
+        """
+        form=self.form_class(data={'title_0': 'Hola', 'title_1': 'Hello', 'body_0': 'Cuerpo', 'body_1': ''})
+        html=form.as_p()
+        self.assertEqual(html.count('<tr>'),4)
+        self.assertIn('<td>English</td>',html)
+        self.assertIn('<textarea',html)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['title'],{'es': 'Hola', 'en': 'Hello'})
+        form=self.form_class(data={'title_0': '', 'title_1': 'Hello'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('title',form.errors)
+
+    def test_prototypes(self):
+        """
+        Field instances get copies of prototype fields and widgets
+        """
+        first=I18NField(widget=forms.TextInput,max_length=10)
+        second=I18NField(widget=forms.TextInput,max_length=10)
+        self.assertEqual(len(first.fields),2)
+        self.assertIsNot(first.fields[0],second.fields[0])
+        self.assertIsNot(first.fields[0].error_messages,second.fields[0].error_messages)
+        self.assertIsNot(first.widget.widgets[0],second.widget.widgets[0])
+        first.widget.widgets[0].attrs['class']='main'
+        self.assertNotIn('class',second.widget.widgets[0].attrs)
+        self.assertNotIn('class',I18NWidget.for_languages(forms.TextInput).widgets[0].attrs)
+
+    def test_languages_setting_change(self):
+        """
+        Prototypes are rebuilt when languages setting changes
+        """
+        with override_settings(LANGUAGES=(('es','Spanish'),('en','English'),('fr','French'))):
+            field=I18NField(widget=forms.TextInput)
+            self.assertEqual(len(field.fields),3)
+            self.assertEqual(field.clean(['Hola','','Salut']),{'es': 'Hola', 'en': '', 'fr': 'Salut'})
+            self.assertEqual(field.widget.decompress({'fr': 'Salut'}),[None,None,'Salut'])
+        self.assertEqual(len(I18NField(widget=forms.TextInput).fields),2)
+
+class FailingTranslationBackend(StubTranslationBackend):
+    """
+    Translation backend failing for a target language
+    """
+    def translate(self,texts,source,target):
+        """
+        Fail for English translations
+        """
+        if target=='en':
+            raise IOError('Service unavailable')
+        return super(FailingTranslationBackend,self).translate(texts,source,target)
+
+class TranslationWorkerTest(TestCase):
+    """
+    Automatic translation of missing languages
+    """
+    def setUp(self):
+        """
+        Create posts with missing English values
+        """
+        self.posts=[
+            Post.objects.create(title={'es': 'Hola'},body={'es': 'Cuerpo'}),
+            Post.objects.create(title={'es': 'Hola'},body={'es': 'Cuerpo', 'en': 'Body'}),
+            Post.objects.create(title={'es': ''},body={}),
+        ]
+
+    def test_run(self):
+        """
+        Missing languages are translated once for each distinct text and saved with indexed columns
+        """
+        worker=TranslationWorker(Post,backend=StubTranslationBackend(),chunk_size=2,batch_size=1)
+        metrics=worker.run()
+        posts=list(Post.objects.order_by('pk'))
+        self.assertEqual(posts[0].title,{'es': 'Hola', 'en': '[en] Hola'})
+        self.assertEqual(posts[0].body,{'es': 'Cuerpo', 'en': '[en] Cuerpo'})
+        self.assertEqual(posts[1].body,{'es': 'Cuerpo', 'en': 'Body'})
+        self.assertEqual(posts[2].title,{'es': ''})
+        self.assertEqual(Post.objects.filter(title_en='[en] Hola').count(),2)
+        self.assertEqual((metrics['items'],metrics['values'],metrics['strings'],metrics['requests']),(3,3,2,2))
+        self.assertEqual(metrics['updated'],3)
+        # Nothing left to translate
+        worker.stats.clear()
+        self.assertNotIn('updated',worker.run())
+
+    def test_backend_errors(self):
+        """
+        Failed requests are counted and their languages are left missing
+        """
+        worker=TranslationWorker(Post,['title'],backend=FailingTranslationBackend(),source='es')
+        metrics=worker.run()
+        self.assertEqual((metrics['errors'],metrics.get('updated',0)),(1,0))
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).title,{'es': 'Hola'})
+
+    def test_configuration_errors(self):
+        """
+        Invalid fields, options and backends are reported
+        """
+        backend=StubTranslationBackend()
+        self.assertRaises(ValueError,TranslationWorker,Post,['id'],backend=backend)
+        self.assertRaises(ValueError,TranslationWorker,Post,backend=backend,batch_size=0)
+        self.assertRaises(ImproperlyConfigured,get_translation_backend)
+        self.assertRaises(ImproperlyConfigured,get_translation_backend,'evodjango.i18n.translation.Unknown')
+        with override_settings(I18N_TRANSLATION_BACKEND='evodjango.i18n.translation.StubTranslationBackend',
+                I18N_TRANSLATION_BACKEND_OPTIONS={'key': 'secret'}):
+            self.assertEqual(get_translation_backend().options,{'key': 'secret'})
+
+    def test_command(self):
+        """
+        Command translates given models reporting metrics
+        """
+        out=StringIO()
+        call_command('fill_translations','testapp.Post',backend='evodjango.i18n.translation.StubTranslationBackend',stdout=out)
+        self.assertIn('testapp.Post: 3 items, 3 updated, 2 strings in 1 requests, 0 errors',out.getvalue())
+        self.assertEqual(Post.objects.get(pk=self.posts[0].pk).title['en'],'[en] Hola')
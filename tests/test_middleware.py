@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango middleware tests
+===============================================
+
+.. module:: tests.test_middleware
+    :platform: Django
+    :synopsis: EVODjango middleware tests
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Django imports
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+
+# EVODjango imports
+from evodjango.middleware import TranslationIdentityMapMiddleware
+from evodjango.models.managers import get_translation_identity_map
+
+# Test models
+from tests.testapp.models import Page
+
+class TranslationIdentityMapTest(TestCase):
+    """
+    Request scoped translation identity map
+    """
+    def setUp(self):
+        """
+        Create a page with an English translation
+        """
+        self.page=Page.objects.create(title='Hola',translatable_lang='es')
+        self.translation=Page.objects.create(title='Hello',translatable_lang='en',translatable_parent=self.page)
+        self.middleware=TranslationIdentityMapMiddleware()
+        self.factory=RequestFactory()
+
+    def tearDown(self):
+        """
+        Clear identity map left by failed tests
+        """
+        self.middleware.process_response(None,None)
+
+    def test_request_lookups(self):
+        """
+        Translation lookups and parent dereferences are memoized until the response
+        """
+        request=self.factory.get('/')
+        self.middleware.process_request(request)
+        pages=[Page.objects.get(pk=self.page.pk) for index in range(3)]
+        translations=[Page.objects.get(pk=self.translation.pk) for index in range(3)]
+        with self.assertNumQueries(2):
+            for page in pages:
+                self.assertEqual(page.get_translation('en'),self.translation)
+            for translation in translations:
+                self.assertEqual(translation.get_root_translation(),self.page)
+        response=self.middleware.process_response(request,HttpResponse())
+        self.assertEqual(response.status_code,200)
+        self.assertIsNone(get_translation_identity_map())
+
+    def test_save_clears_map(self):
+        """
+        Saving translatable items discards memoized lookups
+        """
+        self.middleware.process_request(self.factory.get('/'))
+        self.assertEqual(self.page.get_translation('en'),self.translation)
+        self.translation.translatable_parent=None
+        self.translation.save()
+        self.assertEqual(self.page.get_translation('en'),self.page)
+
+    @override_settings(TRANSLATION_IDENTITY_MAP_SKIP_WRITES=True)
+    def test_skip_writes(self):
+        """
+        Identity map can be disabled for write requests
+        """
+        self.middleware.process_request(self.factory.post('/'))
+        self.assertIsNone(get_translation_identity_map())
+        self.middleware.process_request(self.factory.get('/'))
+        self.assertEqual(get_translation_identity_map(),{})
@@ -0,0 +1,537 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango model tests
+===============================================
+
+.. module:: tests.test_models
+    :platform: Django
+    :synopsis: EVODjango model tests
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Python imports
+import datetime
+
+# Django imports
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import six, timezone
+from django.utils.six import StringIO
+
+# EVODjango imports
+from evodjango.geo import order_by_distance
+from evodjango.models import PublishableWatermark, undeletable_index
+from evodjango.models.fields import RawEncodedValue
+from evodjango.models.managers import fill_publishable_sentinels, get_publishable_sentinels
+
+# Test models
+from tests.testapp.models import Article, Page, Item, Tag, Author, Note, NullNote, CharNote, Document
+
+class PublishableQueryPlanTest(TestCase):
+    """
+    Publishable queries using sentinel dates
+    """
+    def test_sentinel_dates(self):
+        """
+        Empty publication dates are stored as sentinel dates
+        """
+        article=Article.objects.create(title='Article',publishable_active=True)
+        article=Article.objects.get(pk=article.pk)
+        self.assertEqual(article.publishable_start.year,1900)
+        self.assertEqual(article.publishable_end.year,9999)
+        self.assertEqual(list(Article.objects.get_publishables()),[article])
+
+    def test_fill_sentinels(self):
+        """
+        Empty publication dates of existing items are replaced by sentinel dates
+        """
+        now=timezone.now()
+        articles=[Article.objects.create(title='Article %d' % index,publishable_active=True,publishable_start=now)
+            for index in range(3)]
+        Article.objects.filter(pk__in=[article.pk for article in articles[:2]]).update(publishable_start=None)
+        Article.objects.filter(pk=articles[0].pk).update(publishable_end=None)
+        self.assertEqual(fill_publishable_sentinels(Article),(2,1))
+        mindate,maxdate=get_publishable_sentinels()
+        self.assertEqual(Article.objects.filter(publishable_start=mindate).count(),2)
+        self.assertEqual(Article.objects.filter(publishable_end=maxdate).count(),3)
+        self.assertEqual(fill_publishable_sentinels(Article),(0,0))
+
+    def test_composite_index_plan(self):
+        """
+        Publishable query uses composite publication index
+        """
+        qs=Article.objects.get_publishables()
+        sql,params=qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            constraints=connection.introspection.get_constraints(cursor,Article._meta.db_table)
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql,params)
+            plan=' '.join(str(row[-1]) for row in cursor.fetchall())
+        indexes=[name for name,constraint in constraints.items()
+            if constraint['columns']==['publishable_active','publishable_start','publishable_end']]
+        self.assertEqual(len(indexes),1)
+        self.assertIn(indexes[0],plan)
+
+class PublishableUpdateTest(TestCase):
+    """
+    Publishable status updates for crossed publication dates
+    """
+    def setUp(self):
+        """
+        Create an article to be published in one hour and another one to be unpublished in two hours
+        """
+        self.now=timezone.now()
+        self.starting=Article.objects.create(title='Starting',publishable_active=True,
+            publishable_start=self.now + datetime.timedelta(hours=1))
+        self.ending=Article.objects.create(title='Ending',publishable_active=True,
+            publishable_end=self.now + datetime.timedelta(hours=2))
+
+    def get_publishable_titles(self):
+        """
+        Returns titles of items with publishable status
+        """
+        return sorted(Article.objects.filter(publishable_publishable=True).values_list('title',flat=True))
+
+    def test_update_publishables(self):
+        """
+        Items crossing publication dates are updated and watermark skips runs until next transition
+        """
+        self.assertEqual(self.get_publishable_titles(),['Ending'])
+        self.assertEqual(Article.objects.update_publishables(timestamp=self.now),(0,0))
+        watermark=PublishableWatermark.objects.get(app_label='testapp',model_name='article')
+        self.assertEqual(watermark.next_transition,self.starting.publishable_start)
+        # Runs before next transition only read the watermark
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(Article.objects.update_publishables(timestamp=self.now + datetime.timedelta(minutes=30)),(0,0))
+        self.assertFalse([query for query in queries if Article._meta.db_table in query['sql']])
+        self.assertEqual(Article.objects.update_publishables(timestamp=self.now + datetime.timedelta(minutes=90)),(1,0))
+        self.assertEqual(self.get_publishable_titles(),['Ending','Starting'])
+        self.assertEqual(Article.objects.update_publishables(timestamp=self.now + datetime.timedelta(hours=3)),(0,1))
+        self.assertEqual(self.get_publishable_titles(),['Starting'])
+        self.assertEqual(Article.objects.update_publishables(timestamp=self.now + datetime.timedelta(hours=4)),(0,0))
+
+    def test_save_lowers_watermark(self):
+        """
+        Saved items with earlier publication dates lower the watermark and unchanged ones do not update it
+        """
+        Article.objects.update_publishables(timestamp=self.now)
+        article=Article.objects.get(pk=self.ending.pk)
+        with self.assertNumQueries(1):
+            article.save()
+        article.publishable_end=self.now + datetime.timedelta(minutes=30)
+        article.save()
+        self.assertEqual(PublishableWatermark.objects.get().next_transition,article.publishable_end)
+        self.assertEqual(Article.objects.update_publishables(timestamp=self.now + datetime.timedelta(minutes=45)),(0,1))
+
+    def test_without_watermark(self):
+        """
+        All items are checked when evodjango application is not installed
+        """
+        with self.modify_settings(INSTALLED_APPS={'remove': 'evodjango'}):
+            self.ending.save()
+            self.assertEqual(Article.objects.update_publishables(timestamp=self.now + datetime.timedelta(minutes=90)),(1,0))
+            self.assertEqual(Article.objects.update_publishables(timestamp=self.now + datetime.timedelta(hours=3)),(0,1))
+        self.assertFalse(PublishableWatermark.objects.exists())
+
+    def test_command(self):
+        """
+        Command updates crossed items of given models
+        """
+        Article.objects.filter(pk=self.starting.pk).update(publishable_start=self.now - datetime.timedelta(hours=1))
+        out=StringIO()
+        call_command('update_publishables','testapp.Article',stdout=out)
+        self.assertEqual(out.getvalue().strip(),'testapp.Article: 1 published, 0 unpublished')
+        self.assertEqual(self.get_publishable_titles(),['Ending','Starting'])
+
+class PublishableCacheTest(TestCase):
+    """
+    Cached publishables primary keys
+    """
+    def setUp(self):
+        """
+        Create two publishable articles and clear cache
+        """
+        cache.clear()
+        self.first=Article.objects.create(title='First',publishable_active=True)
+        self.second=Article.objects.create(title='Second',publishable_active=True)
+
+    def get_cached(self,**filters):
+        """
+        Returns sorted cached publishables titles and hit and miss counters increments
+        """
+        stats=Article.objects.get_cache_stats()
+        titles=sorted(Article.objects.get_cached_publishables(**filters).values_list('title',flat=True))
+        current=Article.objects.get_cache_stats()
+        return titles,current['hits'] - stats['hits'],current['misses'] - stats['misses']
+
+    def test_hits_and_misses(self):
+        """
+        Filters with same signature share cached primary keys
+        """
+        self.assertEqual(self.get_cached(title__in=['First','Second']),(['First','Second'],0,1))
+        self.assertEqual(self.get_cached(title__in=['First','Second']),(['First','Second'],1,0))
+        self.assertEqual(self.get_cached(title__in=['First']),(['First'],0,1))
+        self.assertEqual(self.get_cached(pk__in=[self.first.pk]),(['First'],0,1))
+        self.assertEqual(self.get_cached(pk__in=[self.second.pk]),(['Second'],0,1))
+
+    def test_invalidation(self):
+        """
+        Saving or deleting items invalidates cached primary keys
+        """
+        self.get_cached()
+        self.second.publishable_active=False
+        self.second.save()
+        self.assertEqual(self.get_cached(),(['First'],0,1))
+        self.first.delete()
+        self.assertEqual(self.get_cached(),([],0,1))
+
+    def test_queryset_values(self):
+        """
+        Queryset filter values are rejected
+        """
+        self.assertRaises(ValueError,Article.objects.get_cached_publishables,pk__in=Article.objects.all())
+
+class TranslationsTest(TestCase):
+    """
+    Batched translation lookups
+    """
+    def setUp(self):
+        """
+        Create a page with an English translation and a page without it
+        """
+        self.translated=Page.objects.create(title='Hola',translatable_lang='es')
+        self.translation=Page.objects.create(title='Hello',translatable_lang='en',translatable_parent=self.translated)
+        self.untranslated=Page.objects.create(title='Adiós',translatable_lang='es')
+
+    def test_with_translations_queries(self):
+        """
+        Translations and root translations of a list cost one query besides the list query
+        """
+        with self.assertNumQueries(2):
+            pages=list(Page.objects.with_translations('en').order_by('pk'))
+            self.assertEqual([page.get_translation('en') for page in pages],[self.translation,self.translation,self.untranslated])
+            self.assertEqual([page.translation for page in pages],[self.translation,self.translation,self.untranslated])
+            self.assertEqual([page.get_root_translation() for page in pages],[self.translated,self.translated,self.untranslated])
+
+    def test_get_translation(self):
+        """
+        Single object translation lookup uses concrete model and root translation as fallback
+        """
+        self.assertEqual(self.translated.get_translation('en'),self.translation)
+        self.assertEqual(self.translation.get_translation('es'),self.translated)
+        self.assertEqual(self.untranslated.get_translation('en'),self.untranslated)
+
+class UndeletableTest(TestCase):
+    """
+    Soft deletion of undeletable items
+    """
+    def setUp(self):
+        """
+        Create three items
+        """
+        self.items=[Item.objects.create(name='Item %d' % index) for index in range(3)]
+
+    def test_delete(self):
+        """
+        Deleted items are marked as deleted and excluded by default manager
+        """
+        self.items[0].delete()
+        self.assertEqual(Item.objects.count(),2)
+        self.assertEqual(Item.all_objects.count(),3)
+        deleted=Item.all_objects.get(pk=self.items[0].pk)
+        self.assertTrue(deleted.undeletable_deleted)
+        self.assertIsNotNone(deleted.undeletable_deleted_date)
+
+    def test_queryset_delete(self):
+        """
+        Querysets are deleted, restored and removed using single queries
+        """
+        with self.assertNumQueries(1):
+            self.assertEqual(Item.objects.exclude(pk=self.items[0].pk).delete(),2)
+        self.assertEqual(list(Item.objects.all()),[self.items[0]])
+        with self.assertNumQueries(1):
+            self.assertEqual(Item.all_objects.filter(undeletable_deleted=True).undelete(),2)
+        self.assertEqual(Item.objects.count(),3)
+        Item.objects.filter(pk=self.items[0].pk).hard_delete()
+        self.assertEqual(Item.all_objects.count(),2)
+
+    def test_partial_index(self):
+        """
+        Partial index condition matches default manager queries condition
+        """
+        operation=undeletable_index(Item._meta.db_table,'name')
+        with connection.schema_editor() as editor:
+            operation.code(None,editor)
+        qs=Item.objects.filter(name='Item 1')
+        sql,params=qs.query.sql_with_params()
+        # Inline parameters as drivers interpolating them on client side do
+        sql=sql % tuple("'%s'" % param if isinstance(param,six.string_types) else int(param) for param in params)
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            plan=' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('_undeleted',plan)
+        self.assertEqual(list(qs),[self.items[1]])
+
+    def test_purge_command(self):
+        """
+        Purge command removes items deleted before given days in chunks
+        """
+        now=timezone.now()
+        Item.objects.filter(pk=self.items[0].pk).update(undeletable_deleted=True,undeletable_deleted_date=now - datetime.timedelta(days=40))
+        Item.objects.filter(pk=self.items[1].pk).update(undeletable_deleted=True,undeletable_deleted_date=now - datetime.timedelta(days=10))
+        Item.objects.filter(pk=self.items[2].pk).update(undeletable_deleted=True)
+        out=StringIO()
+        call_command('purge_undeletables','testapp.Item',days=30,chunk_size=1,stdout=out)
+        self.assertEqual(out.getvalue().strip(),'testapp.Item: 1 purged')
+        call_command('purge_undeletables','testapp.Item',days=5,include_undated=True,stdout=out)
+        self.assertFalse(Item.all_objects.exists())
+
+class GenericContentObjectsTest(TestCase):
+    """
+    Generic content objects prefetching
+    """
+    def setUp(self):
+        """
+        Create notes related to items of three models
+        """
+        targets=[Article.objects.create(title='Article %d' % index) for index in range(3)] + \
+            [Tag.objects.create(name='Tag %d' % index) for index in range(3)] + \
+            [Author.objects.create(name='Author %d' % index) for index in range(3)]
+        for target in targets:
+            Note.objects.create(content_object=target,text=target.pk)
+            NullNote.objects.create(content_object=target,text=target.pk)
+        NullNote.objects.create(text='empty')
+        self.targets=targets
+
+    def test_prefetch_queries(self):
+        """
+        N notes across K content types cost K + 1 queries
+        """
+        with self.assertNumQueries(4):
+            notes=list(Note.objects.prefetch_content_objects())
+            objects=[note.content_object for note in notes]
+        self.assertEqual(sorted(objects,key=repr),sorted(self.targets,key=repr))
+
+    def test_prefetch_null_content_type(self):
+        """
+        Items without content type get an empty content object without queries
+        """
+        with self.assertNumQueries(4):
+            notes=list(NullNote.objects.prefetch_content_objects())
+            objects=[note.content_object for note in notes]
+        self.assertEqual(len(notes),10)
+        self.assertEqual(objects.count(None),1)
+
+class GenericRelationIndexTest(TestCase):
+    """
+    Generic relations lookup from related objects
+    """
+    def setUp(self):
+        """
+        Create two notes for each one of three articles and three tags
+        """
+        self.targets=[Article.objects.create(title='Article %d' % index) for index in range(3)] + \
+            [Tag.objects.create(name='Tag %d' % index) for index in range(3)]
+        for target in self.targets:
+            for index in range(2):
+                Note.objects.create(content_object=target,text='%s %d' % (target,index))
+                CharNote.objects.create(content_object=target,text='%s %d' % (target,index))
+
+    def test_get_for_objects(self):
+        """
+        Items related to several objects of different models are retrieved using one query
+        """
+        targets=self.targets[1:5]
+        with self.assertNumQueries(1):
+            result=Note.objects.get_for_objects(targets)
+        self.assertEqual(sorted(result.keys(),key=repr),sorted(targets,key=repr))
+        for target,notes in result.items():
+            self.assertEqual(sorted(note.text for note in notes),['%s 0' % target,'%s 1' % target])
+        self.assertEqual(list(Note.objects.for_objects([])),[])
+
+    def test_query_plan(self):
+        """
+        Related objects lookup uses the content type and object identifier index
+        """
+        sql,params=Note.objects.for_objects(self.targets[:1]).query.sql_with_params()
+        with connection.cursor() as cursor:
+            constraints=connection.introspection.get_constraints(cursor,Note._meta.db_table)
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql,params)
+            plan=' '.join(str(row[-1]) for row in cursor.fetchall())
+        indexes=[name for name,constraint in constraints.items()
+            if constraint['columns']==['content_type_id','object_id']]
+        self.assertEqual(len(indexes),1)
+        self.assertIn(indexes[0],plan)
+
+    def test_string_identifiers(self):
+        """
+        String object identifiers are resolved to related objects and looked up from them
+        """
+        notes=list(CharNote.objects.prefetch_content_objects().order_by('pk'))
+        with self.assertNumQueries(0):
+            objects=[note.content_object for note in notes]
+        self.assertEqual(objects,[target for target in self.targets for index in range(2)])
+        result=CharNote.objects.get_for_objects(self.targets[:2])
+        self.assertEqual([len(result[target]) for target in self.targets[:2]],[2,2])
+
+class EncodedFieldTest(TestCase):
+    """
+    Encoded fields validation and storage
+    """
+    def test_full_clean_round_trip(self):
+        """
+        Decoded values pass model validation and are stored and retrieved unchanged
+        """
+        value={'text': 'x' * 100, 'items': [1,2,3]}
+        document=Document(data=value,compressed=value,binary=value,location={'lat': 40.4, 'lon': -3.7})
+        document.full_clean()
+        document.save()
+        document=Document.objects.get(pk=document.pk)
+        self.assertEqual(document.data,value)
+        self.assertEqual(document.compressed,value)
+        self.assertEqual(document.binary,value)
+        document.full_clean()
+
+    def test_compressed_storage(self):
+        """
+        Values longer than compression threshold are stored compressed
+        """
+        value={'text': 'x' * 100}
+        document=Document.objects.create(data=value,compressed=value,binary=value)
+        stored=Document.objects.values_list('compressed',flat=True).get(pk=document.pk)
+        self.assertEqual(stored[0],'\x01')
+
+    def test_location_columns(self):
+        """
+        Location columns are updated for values assigned as text and for update_fields saves
+        """
+        document=Document.objects.create(location='{"lat": 40.4, "lon": -3.7}')
+        self.assertEqual(Document.objects.get(pk=document.pk).location_lat,40.4)
+        document.location={'lat': 10.0, 'lon': 20.0}
+        document.save(update_fields=['location'])
+        document=Document.objects.get(pk=document.pk)
+        self.assertEqual((document.location_lat,document.location_lon),(10.0,20.0))
+        # Including columns in update_fields saves them without an additional query
+        document.location={'lat': 11.0, 'lon': 21.0}
+        with self.assertNumQueries(1):
+            document.save(update_fields=['location','location_lat','location_lon','location_geohash'])
+        self.assertEqual(Document.objects.filter(location_lat=11.0,location_lon=21.0).count(),1)
+
+    def test_raw_values_not_decoded(self):
+        """
+        Values retrieved from database are decoded on first access
+        """
+        document=Document.objects.create(data={'a': 1})
+        document=Document.objects.get(pk=document.pk)
+        self.assertIsInstance(document.__dict__['data'],RawEncodedValue)
+        self.assertEqual(document.data,{'a': 1})
+
+    def test_legacy_values(self):
+        """
+        Values stored before compression or binary storage are read side by side with new ones
+        """
+        value={'text': 'x' * 100}
+        new=Document.objects.create(compressed=value,binary=value)
+        legacy=Document.objects.create()
+        with connection.cursor() as cursor:
+            cursor.execute('UPDATE %s SET %s=%%s, %s=%%s WHERE id=%%s' % (connection.ops.quote_name(Document._meta.db_table),
+                connection.ops.quote_name('compressed'),connection.ops.quote_name('binary')),
+                ['{"legacy": 1}',connection.Database.Binary(b'{"legacy": 2}'),legacy.pk])
+        documents=Document.objects.in_bulk([new.pk,legacy.pk])
+        self.assertEqual((documents[new.pk].compressed,documents[new.pk].binary),(value,value))
+        self.assertEqual((documents[legacy.pk].compressed,documents[legacy.pk].binary),({'legacy': 1},{'legacy': 2}))
+
+    def test_none_value(self):
+        """
+        Empty values are decoded when assigned and saved as empty encoded values
+        """
+        document=Document.objects.create(data={'a': 1})
+        document.data=None
+        self.assertEqual(document.data,{})
+        document.save()
+        self.assertEqual(Document.objects.values_list('data',flat=True).get(pk=document.pk),'{}')
+
+class JSONKeyLookupTest(TestCase):
+    """
+    JSON key path lookups
+    """
+    def setUp(self):
+        """
+        Create documents with text, number and boolean keys
+        """
+        self.first=Document.objects.create(data={'name': 'first', 'count': 5, 'ratio': 0.5, 'active': True, 'info': {'lang': 'es'}})
+        self.second=Document.objects.create(data={'name': 'second', 'count': 40, 'ratio': 2.5, 'active': False, 'info': {'lang': 'en'}})
+
+    def test_text_lookups(self):
+        """
+        Text and nested keys are compared as text
+        """
+        self.assertEqual(list(Document.objects.filter(data__name='first')),[self.first])
+        self.assertEqual(list(Document.objects.filter(data__name__icontains='SEC')),[self.second])
+        self.assertEqual(list(Document.objects.filter(data__info__lang='en')),[self.second])
+
+    def test_number_lookups(self):
+        """
+        Numbers match as text and compare numerically using num transform
+        """
+        self.assertEqual(list(Document.objects.filter(data__count=5)),[self.first])
+        self.assertEqual(list(Document.objects.filter(data__ratio='2.5')),[self.second])
+        self.assertEqual(list(Document.objects.filter(data__count__num__gt=10)),[self.second])
+        self.assertEqual(list(Document.objects.filter(data__ratio__num__lt=1)),[self.first])
+
+    def test_boolean_lookups(self):
+        """
+        Booleans are compared using bool transform
+        """
+        self.assertEqual(list(Document.objects.filter(data__active__bool=True)),[self.first])
+        self.assertEqual(list(Document.objects.filter(data__active__bool=False)),[self.second])
+
+    def test_location_lookups(self):
+        """
+        Location coordinates can be compared numerically
+        """
+        document=Document.objects.create(location={'lat': 40.4, 'lon': -3.7})
+        self.assertEqual(list(Document.objects.filter(location__lat__num__gte=40)),[document])
+        self.assertEqual(list(Document.objects.filter(location__lon__num__gte=0)),[])
+
+class LocationDistanceTest(TestCase):
+    """
+    Bulk distance ordering of items with location fields
+    """
+    def setUp(self):
+        """
+        Create documents at increasing distances from Madrid and a document without location
+        """
+        self.madrid=Document.objects.create(location={'lat': 40.4168, 'lon': -3.7038})
+        self.toledo=Document.objects.create(location={'lat': 39.8628, 'lon': -4.0273})
+        self.paris=Document.objects.create(location={'lat': 48.8566, 'lon': 2.3522})
+        self.empty=Document.objects.create()
+
+    def test_order_by_distance(self):
+        """
+        Querysets and lists are ordered by distance skipping items without location
+        """
+        for items in (Document.objects.all(),list(Document.objects.all())):
+            result=order_by_distance(items,40.4,-3.7)
+            self.assertEqual(result,[self.madrid,self.toledo,self.paris])
+            self.assertTrue(result[0].distance < 5 < result[1].distance < 100 < result[2].distance)
+        self.assertEqual(order_by_distance(Document.objects.all(),48.8,2.3,k=1),[self.paris])
+
+    def test_location_queries(self):
+        """
+        Manager spatial queries use indexed location columns
+        """
+        self.assertEqual(list(Document.objects.within_bbox(39,-5,41,-3).order_by('pk')),[self.madrid,self.toledo])
+        self.assertEqual(Document.objects.with_distances(40.4,-3.7,k=2),[self.madrid,self.toledo])
+        self.assertEqual(Document.objects.nearest(40.4,-3.7,k=2),[self.madrid,self.toledo])
+        self.assertEqual(Document.objects.nearest(48.8,2.3,k=1),[self.paris])
+        self.assertEqual(Document.objects.nearest(0,0,k=5),[self.toledo,self.madrid,self.paris])
+
+    def test_sliced_queryset(self):
+        """
+        Sliced querysets are ordered by distance
+        """
+        items=Document.objects.order_by('-pk')[:3]
+        self.assertEqual(order_by_distance(items,40.4,-3.7),[self.toledo,self.paris])
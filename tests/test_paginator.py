@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango paginator tests
+===============================================
+
+.. module:: tests.test_paginator
+    :platform: Django
+    :synopsis: EVODjango keyset paginator tests
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Python imports
+import datetime
+
+# Django imports
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+# EVODjango imports
+from evodjango.paginator import KeysetPaginator
+from evodjango.tools import paginate_items_by_cursor
+
+# Test models
+from tests.testapp.models import Entry
+
+class KeysetPaginatorTest(TestCase):
+    """
+    Keyset pagination using signed cursors
+    """
+    def setUp(self):
+        """
+        Create seven entries, three of them sharing creation date
+        """
+        now=timezone.now()
+        for index in range(7):
+            entry=Entry.objects.create(title='Entry %d' % index)
+            created=now - datetime.timedelta(minutes=min(index,4))
+            Entry.objects.filter(pk=entry.pk).update(timestamped_created=created)
+        self.titles=list(Entry.objects.order_by('-timestamped_created','-pk').values_list('title',flat=True))
+
+    def get_titles(self,page):
+        """
+        Returns titles of page items
+        """
+        return [entry.title for entry in page]
+
+    def test_pages(self):
+        """
+        Pages are walked forward and backward without missing or repeating items
+        """
+        paginator=KeysetPaginator(Entry.objects.all(),per_page=3)
+        first=paginator.page()
+        self.assertEqual(self.get_titles(first),self.titles[:3])
+        self.assertFalse(first.has_previous())
+        second=paginator.page(first.next_cursor)
+        self.assertEqual(self.get_titles(second),self.titles[3:6])
+        third=paginator.page(second.next_cursor)
+        self.assertEqual(self.get_titles(third),self.titles[6:])
+        self.assertFalse(third.has_next())
+        self.assertEqual(self.get_titles(paginator.page(third.previous_cursor)),self.titles[3:6])
+        previous=paginator.page(second.previous_cursor)
+        self.assertEqual(self.get_titles(previous),self.titles[:3])
+        self.assertFalse(previous.has_previous())
+
+    def test_ascending_order(self):
+        """
+        Pages can be ordered by any field in ascending order
+        """
+        paginator=KeysetPaginator(Entry.objects.all(),per_page=4,order_by='timestamped_created')
+        first=paginator.page()
+        second=paginator.page(first.next_cursor)
+        self.assertEqual(self.get_titles(first) + self.get_titles(second),list(reversed(self.titles)))
+
+    def test_invalid_cursor(self):
+        """
+        Tampered cursors are rejected and first page is used by paginate_items_by_cursor
+        """
+        paginator=KeysetPaginator(Entry.objects.all(),per_page=3)
+        cursor=paginator.page().next_cursor
+        self.assertRaises(ValueError,paginator.page,cursor[:-1] + ('A' if cursor[-1]!='A' else 'B'))
+        self.assertRaises(ValueError,KeysetPaginator(Entry.objects.all(),salt='other').page,cursor)
+        self.assertEqual(self.get_titles(paginate_items_by_cursor(Entry.objects.all(),3,'invalid')),self.titles[:3])
+
+    def test_approximate_count(self):
+        """
+        Approximate count is read from database statistics
+        """
+        paginator=KeysetPaginator(Entry.objects.all())
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.assertEqual(paginator.approximate_count(),7)
+
+    def test_seek_query_plan(self):
+        """
+        Seek queries use an index range search on the ordering field instead of a scan
+        """
+        paginator=KeysetPaginator(Entry.objects.all(),per_page=3)
+        entry=Entry.objects.order_by('-timestamped_created','-pk')[2]
+        qs=paginator.seek(Entry.objects.order_by('-timestamped_created','-pk'),entry.timestamped_created,entry.pk,False)
+        sql,params=qs[:4].query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql,params)
+            plan=' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('SEARCH',plan)
+        self.assertIn('timestamped_created<',plan)
+        self.assertEqual([item.title for item in qs],self.titles[3:])
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+EVODjango test models
+===============================================
+
+.. module:: tests.testapp.models
+    :platform: Django
+    :synopsis: EVODjango test models
+.. moduleauthor:: (C) 2012 Oliver Gutiérrez
+"""
+
+# Django imports
+from django.db import models
+
+# EVODjango imports
+from evodjango.models import PublishableModel, TranslatableModel, UndeletableModel, TimestampedModel, GenericModel, \
+    GenericNullModel, GenericCharModel, JSONField, LocationField, GenderField, CountryField, CurrencyField
+from evodjango.models.managers import PublishableModelManager, LocationModelManager, I18NModelManager
+from evodjango.i18n.models import I18NCharField, I18NTextField
+
+class Article(PublishableModel):
+    """
+    Publishable model using sentinel dates
+    """
+    publishable_sentinel_dates=True
+
+    title=models.CharField(max_length=100)
+
+    objects=PublishableModelManager()
+
+class Page(TranslatableModel):
+    """
+    Translatable model
+    """
+    title=models.CharField(max_length=100)
+
+class Post(models.Model):
+    """
+    Model with I18N fields
+    """
+    title=I18NCharField(max_length=100,blank=True,indexed=True,index_length=20)
+    body=I18NTextField(blank=True)
+
+    objects=I18NModelManager()
+
+class Item(UndeletableModel):
+    """
+    Undeletable model
+    """
+    name=models.CharField(max_length=100)
+
+class Entry(TimestampedModel):
+    """
+    Timestamped model
+    """
+    title=models.CharField(max_length=100)
+
+class Tag(models.Model):
+    """
+    Generic relation target model
+    """
+    name=models.CharField(max_length=100)
+
+class Author(models.Model):
+    """
+    Generic relation target model
+    """
+    name=models.CharField(max_length=100)
+
+class Product(models.Model):
+    """
+    Filtered model
+    """
+    name=models.CharField(max_length=100)
+    color=models.CharField(max_length=20)
+    size=models.CharField(max_length=5)
+    price=models.DecimalField(max_digits=8,decimal_places=2,default=0)
+    available=models.DateField(blank=True,null=True)
+
+class Profile(models.Model):
+    """
+    Model with enumeration backed fields
+    """
+    gender=GenderField(blank=True)
+    country=CountryField()
+    currency=CurrencyField(default='EUR')
+
+class Note(GenericModel):
+    """
+    Generic relation model
+    """
+    text=models.CharField(max_length=100)
+
+class NullNote(GenericNullModel):
+    """
+    Generic relation model with optional related object
+    """
+    text=models.CharField(max_length=100)
+
+class CharNote(GenericCharModel):
+    """
+    Generic relation model using string object identifiers
+    """
+    text=models.CharField(max_length=100)
+
+class Document(models.Model):
+    """
+    Model with encoded fields
+    """
+    data=JSONField(blank=True)
+    compressed=JSONField(blank=True,compression='zlib',compress_threshold=16)
+    binary=JSONField(blank=True,compression='zlib',compress_threshold=16,storage='binary')
+    location=LocationField(blank=True,indexed=True)
+
+    objects=LocationModelManager()